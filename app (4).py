@@ -1,61 +1,7 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
 from io import BytesIO
 from fpdf import FPDF
-import math
-
-# --- Constantes ---
-BETA_CONFLIT = 10
-
-# --- Fonctions complètes ---
-def estimer_longueur_col_femoral(offset_mm, ccd_deg):
-    ccd_rad = np.radians(ccd_deg)
-    return offset_mm / np.sin(ccd_rad)
-
-def vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    theta = np.pi - np.radians(ccd_deg + gamma_deg)
-    delta = np.radians(delta_deg)
-    tf = np.radians(tf_deg)
-    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
-    ux = np.sin(theta) * long_col
-    uy = (-np.cos(delta) * np.cos(theta) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
-    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
-    return np.array([ux, uy, uz])
-
-def calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    u = vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-    ux, uz = u[0], u[2]
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_beta_corrige(beta_deg, av_deg):
-    return beta_deg + av_deg
-
-def calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
-    for delta_deg in np.arange(0, 90, 0.1):
-        beta = calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-        beta_corrige = calcul_beta_corrige(beta, av_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(delta_deg, 1)
-    return 89.9
-
-def calcul_reserve(delta_critique, delta_mesuree):
-    return delta_critique - delta_mesuree
-
-def interpretation_clinique(delta_critique, reserve, beta_corrige):
-    if delta_critique == 89.9:
-        return 'Pas de conflit — réserve infinie'
-    elif reserve < 0:
-        return 'Conflit — flexion critique dépassée'
-    elif beta_corrige >= BETA_CONFLIT:
-        return 'Conflit — flexion critique atteinte'
-    elif reserve < 5:
-        return 'Pas de conflit — réserve limitée'
-    else:
-        return 'Pas de conflit — réserve suffisante'
 
 # --- Langues ---
 langue = st.selectbox("🌐 Choisir la langue / Select language", ["Français", "English"])
@@ -0,0 +1,84 @@
+"""Coût d'une nouvelle analyse après modification d'une seule entrée.
+
+    python -m benchmarks.bench_graphe [--repetitions 2000] [--sortie graphe.json]
+
+Pour chaque entrée, GrapheAnalyse.analyser (sans puis avec balayage de γ)
+est chronométré quand seule cette entrée change (valeur tirée dans sa
+plage), et comparé à analyser_patient, caches des angles critiques vidés.
+On relève aussi les nœuds recalculés par modification.
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+from collections import Counter
+
+from reserve_flexion.cache import vider_cache
+from reserve_flexion.graphe import GrapheAnalyse
+from reserve_flexion.resultat import analyser_patient
+
+# Patient de départ et plages de tirage de chaque entrée
+PATIENT = {"tf": 20.0, "ccd": 130.0, "offset": 40.0, "anteversion": 20.0, "version_debout": 10.0,
+           "version_assis": 25.0, "alpha_mesure": 90.0, "gamma_final": 5.0}
+PLAGES = {"tf": (-10, 40), "ccd": (115, 145), "offset": (30, 50), "anteversion": (-10, 45),
+          "version_debout": (0, 30), "version_assis": (10, 60), "alpha_mesure": (60, 120), "gamma_final": (-45, 45)}
+
+
+def _mesurer_graphe(entree, valeurs, balayage):
+    """(µs par analyse, nœuds recalculés par analyse) d'un GrapheAnalyse."""
+    graphe = GrapheAnalyse(balayage=balayage)
+    patient = dict(PATIENT)
+    graphe.analyser(**patient)
+    graphe.evaluations = Counter()
+    iteration = iter(valeurs)
+
+    def modifier():
+        patient[entree] = next(iteration)
+        vider_cache()
+        return graphe.analyser(**patient)
+
+    duree = timeit.timeit(modifier, number=len(valeurs))
+    return 1e6 * duree / len(valeurs), sum(graphe.evaluations.values()) / len(valeurs)
+
+
+def mesurer(entree, repetitions, graine=0):
+    """µs par analyse (graphe, graphe avec balayage, analyser_patient sans cache) et nœuds recalculés."""
+    rng = random.Random(graine)
+    valeurs = [float(rng.randint(*PLAGES[entree])) for _ in range(repetitions)]
+    graphe_us, noeuds = _mesurer_graphe(entree, valeurs, balayage=False)
+    balayage_us, _ = _mesurer_graphe(entree, valeurs, balayage=True)
+    patient = dict(PATIENT)
+    iteration = iter(valeurs)
+
+    def complet():
+        patient[entree] = next(iteration)
+        vider_cache()
+        return analyser_patient(**patient)
+
+    duree_complet = timeit.timeit(complet, number=repetitions)
+    return {"graphe_us": graphe_us, "graphe_balayage_us": balayage_us,
+            "complet_us": 1e6 * duree_complet / repetitions, "noeuds": noeuds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=2000)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", help="fichier JSON des mesures")
+    args = parser.parse_args(argv)
+
+    resultats = {}
+    print(f"{'entrée modifiée':18s} {'graphe':>9s} {'+balayage':>9s} {'complet':>9s} {'nœuds':>7s}  (µs par analyse)")
+    for entree in PATIENT:
+        r = resultats[entree] = mesurer(entree, args.repetitions, args.graine)
+        print(f"{entree:18s} {r['graphe_us']:9.1f} {r['graphe_balayage_us']:9.1f} {r['complet_us']:9.1f} "
+              f"{r['noeuds']:7.1f}")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Temps d'import à froid du cœur de calcul, mesuré dans des interpréteurs neufs.
+
+    python -m benchmarks.bench_import [--repetitions 15] [--budget 0.3] [--sortie import.json]
+
+Chaque module de MODULES est importé dans un processus Python vierge ; on
+relève la médiane du temps d'import (NumPy compris) et les modules lourds
+chargés au passage. Le code de sortie vaut 1 si un module dépasse le
+budget ou charge l'un des modules de INTERDITS : pandas et fpdf ne doivent
+se charger qu'au moment d'un export CSV ou PDF.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    "numpy",
+    "reserve_flexion",
+    "reserve_flexion.resultat",
+    "reserve_flexion.export",
+    "reserve_flexion.rapport",
+)
+INTERDITS = ("pandas", "fpdf", "streamlit", "altair", "concurrent.futures.process")
+
+CODE = """
+import json, sys, time
+debut = time.perf_counter()
+import {module}
+duree = time.perf_counter() - debut
+print(json.dumps({{"duree": duree, "charges": [m for m in {interdits!r} if m in sys.modules]}}))
+"""
+
+
+def mesurer(module, repetitions):
+    """Temps d'import (s) de chaque répétition et modules interdits chargés."""
+    durees, charges = [], set()
+    env = dict(os.environ, PYTHONPATH=RACINE, PYTHONDONTWRITEBYTECODE="")
+    for _ in range(repetitions):
+        sortie = subprocess.run(
+            [sys.executable, "-c", CODE.format(module=module, interdits=INTERDITS)],
+            cwd=RACINE, env=env, capture_output=True, text=True, check=True,
+        )
+        mesure = json.loads(sortie.stdout)
+        durees.append(mesure["duree"])
+        charges.update(mesure["charges"])
+    return durees, sorted(charges)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repetitions", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=0.3, help="temps d'import maximal (s, médiane)")
+    parser.add_argument("--sortie", help="fichier JSON des mesures")
+    args = parser.parse_args(argv)
+
+    resultats, echecs = {}, []
+    print(f"{'module':28s} {'médiane':>9s} {'max':>9s}  (ms)")
+    for module in args.modules:
+        durees, charges = mesurer(module, args.repetitions)
+        mediane = statistics.median(durees)
+        resultats[module] = {"mediane_s": mediane, "durees_s": durees, "charges": charges}
+        print(f"{module:28s} {1e3 * mediane:9.1f} {1e3 * max(durees):9.1f}  {' '.join(charges)}")
+        if mediane > args.budget:
+            echecs.append(f"{module} : {1e3 * mediane:.0f} ms > budget {1e3 * args.budget:.0f} ms")
+        if charges:
+            echecs.append(f"{module} charge {', '.join(charges)}")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+    for echec in echecs:
+        print("ÉCHEC", echec)
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
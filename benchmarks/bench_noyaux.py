@@ -0,0 +1,108 @@
+"""Micro-benchmarks des fonctions de géométrie et des solveurs.
+
+    python -m benchmarks.bench_noyaux [--sortie resultats.json] [--reference benchmarks/reference_noyaux.json]
+
+Chaque mesure est le meilleur temps par appel (µs) sur plusieurs
+répétitions. Avec une référence, les mesures plus lentes que
+reference × tolerance sont signalées et le code de sortie vaut 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+import numpy as np
+
+from reserve_flexion import (
+    calcul_alpha_critique,
+    calcul_angle_beta,
+    calcul_angle_beta_alpha,
+    calcul_delta_critique,
+    interpretation_clinique,
+    vecteur_col_abduction,
+)
+
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference_noyaux.json")
+
+# (CCD, TF, γ, offset, AV) : conflit vers δ = 22.8° / α = 11.7°, ou aucun conflit
+# (89.9 / 129.9 : le balayage parcourt toute la grille)
+CAS = {
+    "representatif": {"delta": (130.0, 20.0, 0.0, 40.0, 5.0), "alpha": (20.0, 130.0, 40.0, -5.0, 0.0)},
+    "sans_conflit": {"delta": (130.0, 20.0, 0.0, 40.0, 25.0), "alpha": (20.0, 130.0, 40.0, 25.0, 0.0)},
+}
+METHODES = ("boucle", "grille", "analytique")
+
+
+def mesurer(fonction, repetitions=5):
+    """Meilleur temps par appel (µs)."""
+    minuteur = timeit.Timer(fonction)
+    nombre, _ = minuteur.autorange()
+    return min(minuteur.repeat(repetitions, nombre)) / nombre * 1e6
+
+
+def benchmarks():
+    yield "vecteur_col_abduction", lambda: vecteur_col_abduction(130.0, 20.0, 15.0, 0.0, 40.0)
+    yield "calcul_angle_beta", lambda: calcul_angle_beta(130.0, 20.0, 15.0, 0.0, 40.0)
+    yield "calcul_angle_beta_alpha", lambda: calcul_angle_beta_alpha(130.0, 20.0, 90.0, 40.0, 0.0)
+    for nom_cas, cas in CAS.items():
+        for methode in METHODES:
+            yield (f"calcul_delta_critique[{methode}, {nom_cas}]",
+                   lambda d=cas["delta"], m=methode: calcul_delta_critique(*d, methode=m))
+            yield (f"calcul_alpha_critique[{methode}, {nom_cas}]",
+                   lambda a=cas["alpha"], m=methode: calcul_alpha_critique(*a, methode=m))
+    yield "interpretation_clinique[sans_conflit]", lambda: interpretation_clinique(89.9, 69.9, 32.6)
+    yield "interpretation_clinique[conflit]", lambda: interpretation_clinique(22.8, -2.0, 12.0)
+
+
+def comparer(mesures, reference, tolerance):
+    """Noms des mesures plus lentes que reference × tolerance."""
+    return [
+        nom for nom, duree in mesures.items()
+        if nom in reference and duree > reference[nom] * tolerance
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sortie", help="fichier JSON des mesures")
+    parser.add_argument("--reference", default=REFERENCE, help="mesures de référence (JSON)")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="ralentissement toléré (rapport)")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="remplacer la référence par les mesures")
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    mesures = {}
+    for nom, fonction in benchmarks():
+        mesures[nom] = mesurer(fonction, args.repetitions)
+        print(f"{nom:55s} {mesures[nom]:12.2f} µs")
+
+    resultat = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "unite": "µs par appel",
+        "mesures": mesures,
+    }
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultat, f, indent=2, ensure_ascii=False)
+    if args.enregistrer_reference:
+        with open(args.reference, "w", encoding="utf-8") as f:
+            json.dump(resultat, f, indent=2, ensure_ascii=False)
+        return 0
+
+    if not os.path.exists(args.reference):
+        return 0
+    with open(args.reference, encoding="utf-8") as f:
+        reference = json.load(f)["mesures"]
+    regressions = comparer(mesures, reference, args.tolerance)
+    for nom in regressions:
+        print(f"RÉGRESSION {nom}: {mesures[nom]:.2f} µs (référence {reference[nom]:.2f} µs)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Temps de génération d'un rapport PDF par patient.
+
+    python -m benchmarks.bench_rapport [--patients 50] [--sortie rapport.json]
+
+Compare, sur les mêmes patients :
+  * « ttf à chaque rapport » : ce que faisait pdfff (5).py, add_font de
+    DejaVuSans.ttf (métriques relues depuis leur .pkl) puis mise en page
+    ligne à ligne et sous-ensemble de police recalculé à chaque rapport ;
+  * « ttf mémorisé » : rapport_pdf(..., police=POLICE_UNICODE), police lue
+    sous-ensemble et largeurs calculés une fois par processus ;
+  * « arial » : rapport_pdf sans police TrueType (izan.py).
+Le premier rapport de chaque variante (chargements initiaux) est exclu de
+la médiane et reporté à part.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import fpdf.fpdf
+
+from reserve_flexion.rapport import POLICE_UNICODE, rapport_pdf
+from reserve_flexion.resultat import analyser_patient
+
+from .bench_graphe import PLAGES
+
+LABELS = {
+    "title": " Analyse Clinique de la Réserve de Flexion",
+    "patient_name": "Nom du patient",
+    "mob": "Mobilité pelvienne (°)",
+    "crit": "Flexion maximale tolérée (°)",
+    "reserve": "Réserve de flexion (°)",
+    "beta": "Inclinaison col fémoral (°)",
+    "results_analysis": "Résultats d’analyse",
+    "results_flexion_leg": "Résultats flexion jambe",
+    "without_gamma": "Sans adduction/abduction (γ = 0°)",
+    "with_gamma": "Avec adduction/abduction (γ = {gamma:.1f}°)",
+    "alpha_measured": "Flexion de hanche mesurée",
+    "alpha_crit": "Flexion maximal théorique avant comflit",
+    "risk_none": "Pas de risque de luxation : Réserve infinie",
+    "risk_limited": "Risque de luxation : Réserve limitée",
+    "no_conflict": "Pas de conflit : réserve infinie",
+    "conflict_critical_exceeded": "Conflit : flexion critique dépassée",
+    "conflict_critical_reached": "Conflit : flexion critique atteinte",
+    "no_conflict_limited": "Pas de conflit : réserve limitée",
+    "no_conflict_sufficient": "Pas de conflit : réserve suffisante",
+}
+
+
+def rapport_ttf_a_chaque_fois(analyse, patient_name, labels, langue):
+    """Export PDF de pdfff (5).py (police normale seule : DejaVuSans-Bold.ttf n'est pas livrée)."""
+    pdf = fpdf.fpdf.FPDF()
+    pdf.add_page()
+    pdf.add_font("DejaVu", "", POLICE_UNICODE, uni=True)
+    pdf.set_font("DejaVu", "", 12)
+    pdf.ln(5)
+    pdf.cell(0, 10, f"{labels['patient_name']}: {patient_name}", ln=1)
+    pdf.ln(5)
+    pdf.set_font("DejaVu", "", 14)
+    pdf.cell(0, 10, labels["results_analysis"], ln=1)
+    pdf.ln(3)
+    pdf.set_font("DejaVu", "", 12)
+    pdf.cell(0, 10, "Flexion du tronc" if langue == "Français" else "Trunk flexion", ln=1)
+    for titre, suffixe in ((labels["without_gamma"], "ref"),
+                           (labels["with_gamma"].format(gamma=analyse.gamma_final), "gamma")):
+        pdf.ln(3)
+        pdf.cell(0, 10, f"{titre}:", ln=1)
+        pdf.multi_cell(0, 8, f"{labels['mob']}: {analyse.delta_mesure:.1f}°")
+        pdf.multi_cell(0, 8, f"{labels['crit']}: {analyse[f'delta_critique_{suffixe}']:.1f}°")
+        pdf.multi_cell(0, 8, f"{labels['reserve']}: {analyse[f'reserve_{suffixe}']:.1f}°")
+        pdf.multi_cell(0, 8, f"{labels['beta']}: {analyse[f'beta_corrige_{suffixe}']:.1f}°")
+        pdf.multi_cell(0, 8, labels[analyse[f"interpretation_{suffixe}"]])
+    pdf.ln(5)
+    pdf.cell(0, 10, labels["results_flexion_leg"], ln=1)
+    for titre, suffixe in ((labels["without_gamma"], "sans"),
+                           (labels["with_gamma"].format(gamma=analyse.gamma_final), "avec")):
+        pdf.ln(3)
+        pdf.cell(0, 10, f"{titre}:", ln=1)
+        pdf.multi_cell(0, 8, f"{labels['alpha_measured']}: {analyse.alpha_mesure:.1f}°")
+        pdf.multi_cell(0, 8, f"{labels['alpha_crit']}: {analyse[f'alpha_critique_{suffixe}_gamma']:.1f}°")
+        pdf.multi_cell(0, 8, f"{labels['reserve']}: {analyse[f'reserve_alpha_{suffixe}_gamma']:.1f}°")
+        pdf.multi_cell(0, 8, labels[analyse[f"interpretation_alpha_{suffixe}"]])
+    return pdf.output(dest="S").encode("latin-1", "replace")
+
+
+VARIANTES = {
+    "ttf à chaque rapport": rapport_ttf_a_chaque_fois,
+    "ttf mémorisé": lambda *args: rapport_pdf(*args, police=POLICE_UNICODE),
+    "arial": rapport_pdf,
+}
+
+
+def mesurer(fonction, analyses):
+    """Durée (s) de chaque rapport, dans l'ordre des patients."""
+    durees = []
+    for i, analyse in enumerate(analyses):
+        debut = time.perf_counter()
+        fonction(analyse, f"Patient {i}", LABELS, "Français")
+        durees.append(time.perf_counter() - debut)
+    return durees
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=50)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", help="fichier JSON des mesures")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.graine)
+    analyses = [analyser_patient(**{nom: float(rng.randint(*plage)) for nom, plage in PLAGES.items()})
+                for _ in range(args.patients)]
+
+    # .pkl des métriques de l'ancienne variante dans un dossier temporaire, pas à côté de la police
+    fpdf.fpdf.FPDF_CACHE_MODE, fpdf.fpdf.FPDF_CACHE_DIR = 2, tempfile.mkdtemp()
+    resultats = {}
+    print(f"{'variante':22s} {'premier':>9s} {'médiane':>9s}  (ms par rapport)")
+    for nom, fonction in VARIANTES.items():
+        durees = mesurer(fonction, analyses)
+        resultats[nom] = {"premier_s": durees[0], "mediane_s": statistics.median(durees[1:]), "durees_s": durees}
+        print(f"{nom:22s} {1e3 * durees[0]:9.2f} {1e3 * resultats[nom]['mediane_s']:9.2f}")
+    acceleration = resultats["ttf à chaque rapport"]["mediane_s"] / resultats["ttf mémorisé"]["mediane_s"]
+    print(f"ttf mémorisé : {acceleration:.1f}× plus rapide")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Latence d'une réexécution Streamlit complète, mesurée avec AppTest.
+
+    python -m benchmarks.bench_rerun [izan.py] [--reruns 100] [--sortie latences.json]
+
+Chaque réexécution change un widget (paramètres, validés par le bouton du
+formulaire de saisie s'il y en a un, γ, langue) ou clique sur le bouton
+PDF. Le temps total est ventilé en calcul des angles, construction du
+DataFrame, encodage CSV et génération PDF en chronométrant les fonctions
+correspondantes pendant la réexécution ; « autre » regroupe le reste
+(Streamlit, libellés, affichage). izan.py appelle analyser_patient, dont
+les angles critiques sont en cache pour tout le processus. Le CSV n'y est
+construit qu'au clic sur son bouton : DataFrame et CSV restent à zéro. Pour les scripts qui appellent directement les
+fonctions de calcul (finaaaaaaaal.py, ...), la physique est le temps passé
+dans les fonctions calcul_* du paquet et le DataFrame celui de
+pd.DataFrame(...).
+
+AppTest réexécute tout le script même pour un widget placé dans un
+st.fragment : pour le bouton PDF d'izan.py, la mesure est celle d'une
+réexécution complète, majorant de ce que fait le serveur Streamlit.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from streamlit.testing.v1 import AppTest
+
+import reserve_flexion
+import reserve_flexion.export
+import reserve_flexion.rapport
+import reserve_flexion.resultat
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Plages des st.number_input, dans l'ordre du script : version debout, version
+# assis, AV, alpha mesuré, TF, CCD, offset ; puis le curseur γ.
+PLAGES = ((0, 30), (10, 60), (-10, 45), (60, 120), (-10, 40), (115, 145), (30, 50))
+PLAGE_GAMMA = (-45, 45)
+
+# Fonctions de calcul importées du paquet par les scripts d'origine
+# (finaaaaaaaal.py, ...) : remplacées sur le paquet avant la réexécution,
+# elles sont chronométrées quand le script les importe.
+CALCULS = ("calcul_delta_critique", "calcul_alpha_critique", "calcul_alpha_critique_sans_gamma",
+           "calcul_angle_beta", "calcul_angle_beta_alpha", "calcul_angle_beta_bascule", "calcul_beta_corrige",
+           "calcul_reserve")
+
+# (objet, attribut, étape) chronométrés pendant chaque réexécution
+SONDES = (
+    (reserve_flexion.resultat, "analyser_patient", "physique"),
+    *((reserve_flexion, nom, "physique") for nom in CALCULS),
+    (reserve_flexion.export, "tableau_export", "dataframe"),
+    (pd.DataFrame, "__init__", "dataframe"),
+    (pd.DataFrame, "to_csv", "csv"),
+    (reserve_flexion.rapport, "rapport_pdf", "pdf"),
+    (FPDF, "output", "pdf"),
+)
+ETAPES = ("physique", "dataframe", "csv", "pdf", "autre")
+
+
+@contextmanager
+def sondes(durees):
+    """Remplace les fonctions de SONDES par des versions chronométrées."""
+    originales = []
+    en_cours = set()
+
+    def envelopper(fonction, etape):
+        def chronometree(*args, **kwargs):
+            if etape in en_cours:  # rapport_pdf appelle FPDF.output : ne compter qu'une fois
+                return fonction(*args, **kwargs)
+            en_cours.add(etape)
+            debut = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                durees[etape] += time.perf_counter() - debut
+                en_cours.discard(etape)
+        return chronometree
+
+    for objet, nom, etape in SONDES:
+        originales.append((objet, nom, getattr(objet, nom)))
+        setattr(objet, nom, envelopper(getattr(objet, nom), etape))
+    try:
+        yield
+    finally:
+        for objet, nom, fonction in originales:
+            setattr(objet, nom, fonction)
+
+
+def modifier_widget(app, rng):
+    """Change un widget au hasard ; renvoie une description de l'action."""
+    action = rng.random()
+    if action < 0.7:
+        i = rng.randrange(len(PLAGES))
+        app.number_input[i].set_value(float(rng.randint(*PLAGES[i])))
+        for bouton in app.button:  # saisie en formulaire : valider
+            if bouton.proto.is_form_submitter:
+                bouton.click()
+        return "parametre"
+    if action < 0.85:
+        app.slider[0].set_value(float(rng.randint(*PLAGE_GAMMA)))
+        return "gamma"
+    if action < 0.9:
+        app.selectbox[0].set_value(rng.choice(["Français", "English"]))
+        return "langue"
+    next(b for b in app.button if not b.proto.is_form_submitter).click()
+    return "pdf"
+
+
+def mesurer(script, reruns, graine=0):
+    rng = random.Random(graine)
+    app = AppTest.from_file(script, default_timeout=120)
+    app.run()
+    mesures = []
+    for _ in range(reruns):
+        action = modifier_widget(app, rng)
+        durees = defaultdict(float)
+        with sondes(durees):
+            debut = time.perf_counter()
+            app.run()
+            total = time.perf_counter() - debut
+        if app.exception:
+            raise RuntimeError(f"{script} : {app.exception[0].message}")
+        durees["autre"] = max(0.0, total - sum(durees.values()))
+        mesures.append({"action": action, "total": total, **{e: durees[e] for e in ETAPES}})
+    return mesures
+
+
+def resumer(mesures):
+    """Percentiles p50 / p95 / p99 (ms) du total et de chaque étape."""
+    resume = {}
+    for cle in ("total",) + ETAPES:
+        valeurs = np.array([m[cle] for m in mesures]) * 1e3
+        resume[cle] = {f"p{p}": float(np.percentile(valeurs, p)) for p in (50, 95, 99)}
+    return resume
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=["izan.py"], help="scripts Streamlit à mesurer")
+    parser.add_argument("--reruns", type=int, default=100)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", help="fichier JSON des mesures et percentiles")
+    args = parser.parse_args(argv)
+
+    resultats = {}
+    for script in args.scripts:
+        chemin = script if os.path.isabs(script) else os.path.join(RACINE, script)
+        mesures = mesurer(chemin, args.reruns, args.graine)
+        resume = resumer(mesures)
+        resultats[script] = {"resume_ms": resume, "reruns": mesures}
+        print(f"{script} ({args.reruns} réexécutions)")
+        print(f"  {'étape':10s} {'p50':>9s} {'p95':>9s} {'p99':>9s}  (ms)")
+        for cle, p in resume.items():
+            print(f"  {cle:10s} {p['p50']:9.2f} {p['p95']:9.2f} {p['p99']:9.2f}")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Appels aux solveurs pour la saisie d'un patient, formulaire contre calcul en direct.
+
+    python -m benchmarks.bench_saisie [izan.py ...] [--patients 20] [--sortie saisie.json]
+
+Pour chaque patient, les sept paramètres (version debout, version assis,
+AV, alpha mesuré, TF, CCD, offset) sont saisis un à un. En calcul en
+direct chaque saisie réexécute le script ; avec le formulaire, seul le
+bouton « Calculer » le fait. On compte les appels aux solveurs d'angles
+critiques (SOLVEURS) entre le premier champ et le dernier affichage, caches
+vidés avant chaque patient.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from collections import Counter
+from contextlib import contextmanager
+
+from streamlit.testing.v1 import AppTest
+
+import reserve_flexion
+import reserve_flexion.solveurs
+from reserve_flexion.cache import vider_cache
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = ("izan.py", "pdfff (5).py", "version finito .py", "version finito 1.py", "version finito 3.py",
+           "version finito 4.py")
+SOLVEURS = ("calcul_delta_critique", "calcul_alpha_critique", "resoudre_delta_critique_lot",
+            "resoudre_alpha_critique_lot")
+
+# Plages des sept st.number_input, dans l'ordre du script (voir bench_rerun.PLAGES)
+PLAGES = ((0, 30), (10, 60), (-10, 45), (60, 120), (-10, 40), (115, 145), (30, 50))
+
+
+@contextmanager
+def compteurs(appels):
+    """Remplace les solveurs, dans tous les modules qui les ont importés, par
+    des versions qui comptent leurs appels (un appel imbriqué ne compte pas)."""
+    originales = {nom: getattr(reserve_flexion.solveurs, nom) for nom in SOLVEURS}
+    en_cours = []
+
+    def envelopper(fonction, nom):
+        def comptee(*args, **kwargs):
+            if not en_cours:
+                appels[nom] += 1
+            en_cours.append(nom)
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                en_cours.pop()
+        return comptee
+
+    remplacees = []
+    for module in [m for nom, m in sys.modules.items() if nom.split(".")[0] == "reserve_flexion"]:
+        for nom, fonction in originales.items():
+            if getattr(module, nom, None) is fonction:
+                remplacees.append((module, nom, fonction))
+                setattr(module, nom, envelopper(fonction, nom))
+    try:
+        yield
+    finally:
+        for module, nom, fonction in remplacees:
+            setattr(module, nom, fonction)
+
+
+def saisir_patient(app, valeurs, direct):
+    """Saisit les sept paramètres ; renvoie le nombre de réexécutions."""
+    reexecutions = 0
+    for i, valeur in enumerate(valeurs):
+        app.number_input[i].set_value(valeur)
+        if direct:
+            app.run()
+            reexecutions += 1
+    if not direct:
+        next(b for b in app.button if b.proto.is_form_submitter).click()
+        app.run()
+        reexecutions += 1
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return reexecutions
+
+
+def mesurer(script, patients, direct, graine=0):
+    """Appels aux solveurs et réexécutions par patient saisi."""
+    rng = random.Random(graine)
+    app = AppTest.from_file(script, default_timeout=120)
+    app.run()
+    if direct:
+        app.checkbox[0].check()
+        app.run()
+    mesures = []
+    for _ in range(patients):
+        valeurs = [float(rng.randint(*plage)) for plage in PLAGES]
+        vider_cache()
+        appels = Counter()
+        with compteurs(appels):
+            reexecutions = saisir_patient(app, valeurs, direct)
+        mesures.append({"reexecutions": reexecutions, "appels": sum(appels.values()), "detail": dict(appels)})
+    return mesures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=list(SCRIPTS), help="scripts Streamlit à mesurer")
+    parser.add_argument("--patients", type=int, default=20)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", help="fichier JSON des mesures")
+    args = parser.parse_args(argv)
+
+    resultats = {}
+    print(f"{'script':22s} {'direct':>8s} {'formulaire':>11s} {'réduction':>10s}  (appels aux solveurs / patient)")
+    for script in args.scripts:
+        chemin = script if os.path.isabs(script) else os.path.join(RACINE, script)
+        resultats[script] = {
+            mode: mesurer(chemin, args.patients, mode == "direct", args.graine) for mode in ("direct", "formulaire")
+        }
+        moyennes = {mode: sum(m["appels"] for m in mesures) / len(mesures)
+                    for mode, mesures in resultats[script].items()}
+        reduction = moyennes["direct"] / moyennes["formulaire"] if moyennes["formulaire"] else float("inf")
+        print(f"{script:22s} {moyennes['direct']:8.1f} {moyennes['formulaire']:11.1f} {reduction:9.1f}×")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
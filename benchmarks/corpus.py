@@ -0,0 +1,195 @@
+"""Corpus de référence des angles critiques et comparaison des moteurs.
+
+    python -m benchmarks.corpus --generer [--taille 6000]
+    python -m benchmarks.corpus [analytique lot cache ...]
+
+Le corpus (corpus_reference.npz) contient des entrées (TF, CCD, offset, AV,
+γ, δ mesuré, α mesuré) et les sorties des balayages d'origine, figés dans
+benchmarks/reference.py : δ et α critiques, β corrigé à δ mesuré et les
+interprétations. Chaque moteur calcule aussi β corrigé. Un moteur est comparé en bloc : écart maximal par sortie,
+nombre de valeurs qui s'écartent de plus de TOLERANCES et d'interprétations
+qui changent. Le code de sortie est 1 si l'un de ces nombres n'est pas nul.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from reserve_flexion import (
+    calcul_alpha_critique,
+    calcul_angle_beta,
+    calcul_beta_corrige,
+    calcul_delta_critique,
+    interpretation_alpha_lot,
+    interpretation_clinique_lot,
+    resoudre_alpha_critique_lot,
+    resoudre_delta_critique_lot,
+)
+from reserve_flexion.cache import alpha_critique_cache, delta_critique_cache
+from reserve_flexion.cohorte import _beta_corrige_lot
+
+from . import reference
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_reference.npz")
+ENTREES = ("tf", "ccd", "offset", "av", "gamma", "delta", "alpha")
+# Écart toléré sur β corrigé (°) : les moteurs calculent β avec leurs propres
+# noyaux (math, NumPy vectorisé), qui peuvent différer de la référence de quelques ulp.
+# Les angles critiques, eux, doivent être identiques.
+TOLERANCES = {"delta_critique": 0.0, "alpha_critique": 0.0, "beta_corrige": 1e-9}
+# Codes des interprétations stockées dans le corpus
+CLES = ("no_conflict", "conflict_critical_exceeded", "conflict_critical_reached", "no_conflict_limited",
+        "no_conflict_sufficient", "risk_none", "risk_limited")
+
+
+def _coder(cles):
+    return np.array([CLES.index(c) for c in cles], dtype=np.int8)
+
+
+def _tirer_entrees(taille, graine):
+    """Entrées au pas de 1° de l'interface, valeurs réelles et cas rasant le seuil."""
+    rng = np.random.default_rng(graine)
+    n = taille // 3
+    entiers = {
+        "tf": rng.integers(-20, 51, n), "ccd": rng.integers(110, 151, n), "offset": rng.integers(20, 61, n),
+        "av": rng.integers(-20, 51, n), "gamma": rng.integers(-45, 46, n),
+        "delta": rng.integers(-10, 61, n), "alpha": rng.integers(40, 131, n),
+    }
+    reels = {
+        "tf": rng.uniform(-20, 50, n), "ccd": rng.uniform(110, 150, n), "offset": rng.uniform(20, 60, n),
+        "av": rng.uniform(-20, 50, n), "gamma": rng.uniform(-45, 45, n),
+        "delta": rng.uniform(-10, 60, n), "alpha": rng.uniform(40, 130, n),
+    }
+    m = taille - 2 * n
+    rasants = {nom: rng.uniform(*plage, m) for nom, plage in (
+        ("tf", (-20, 50)), ("ccd", (110, 150)), ("offset", (20, 60)), ("gamma", (-45, 45)), ("alpha", (40, 130)))}
+    # AV choisi pour que β corrigé vaille exactement le seuil en un point de la grille de δ
+    rasants["delta"] = np.round(rng.uniform(0, 89.9, m), 1)
+    rasants["av"] = np.array([
+        calcul_beta_corrige(-calcul_angle_beta(c, t, d, g, o), 10)
+        for c, t, d, g, o in zip(rasants["ccd"], rasants["tf"], rasants["delta"], rasants["gamma"], rasants["offset"])
+    ])
+    return {nom: np.concatenate([entiers[nom], reels[nom], rasants[nom]]).astype(float) for nom in ENTREES}
+
+
+def generer(chemin=CORPUS, taille=6000, graine=0):
+    """Calcule les sorties de référence avec les balayages d'origine figés et enregistre le corpus."""
+    e = _tirer_entrees(taille, graine)
+    sorties = _reference(*(e[nom] for nom in ENTREES))
+    delta_critique, alpha_critique, beta_corrige = (
+        sorties[nom] for nom in ("delta_critique", "alpha_critique", "beta_corrige"))
+    reserve = delta_critique - e["delta"]
+    np.savez_compressed(
+        chemin,
+        **e,
+        delta_critique=delta_critique,
+        alpha_critique=alpha_critique,
+        beta_corrige=beta_corrige,
+        interpretation=_coder(interpretation_clinique_lot(delta_critique, reserve, beta_corrige)),
+        interpretation_alpha=_coder(interpretation_alpha_lot(alpha_critique)),
+    )
+
+
+# --- Moteurs : entrées du corpus -> {"delta_critique", "alpha_critique", "beta_corrige"} ---
+def _beta_corrige_scalaire(tf, ccd, offset, av, gamma, delta):
+    """β corrigé à δ mesuré, une ligne à la fois (comme analyser_patient)."""
+    return np.array([calcul_beta_corrige(calcul_angle_beta(c, t, d, g, o), a)
+                     for t, c, o, a, g, d in zip(tf, ccd, offset, av, gamma, delta)])
+
+def _reference(tf, ccd, offset, av, gamma, delta, alpha):
+    lignes = list(zip(tf, ccd, offset, av, gamma, delta))
+    return {
+        "delta_critique": np.array([reference.calcul_delta_critique(c, t, g, o, a) for t, c, o, a, g, _ in lignes]),
+        "alpha_critique": np.array([reference.calcul_alpha_critique(t, c, o, a, g) for t, c, o, a, g, _ in lignes]),
+        "beta_corrige": np.array([reference.calcul_beta_corrige(reference.calcul_angle_beta(c, t, d, g, o), a)
+                                  for t, c, o, a, g, d in lignes]),
+    }
+
+def _scalaire(methode):
+    def moteur(tf, ccd, offset, av, gamma, delta, alpha):
+        lignes = list(zip(tf, ccd, offset, av, gamma))
+        return {
+            "delta_critique": np.array([calcul_delta_critique(c, t, g, o, a, methode=methode) for t, c, o, a, g in lignes]),
+            "alpha_critique": np.array([calcul_alpha_critique(t, c, o, a, g, methode=methode) for t, c, o, a, g in lignes]),
+            "beta_corrige": _beta_corrige_scalaire(tf, ccd, offset, av, gamma, delta),
+        }
+    return moteur
+
+def _lot(tf, ccd, offset, av, gamma, delta, alpha):
+    return {
+        "delta_critique": resoudre_delta_critique_lot(ccd, tf, gamma, offset, av).arrondi,
+        "alpha_critique": resoudre_alpha_critique_lot(tf, ccd, offset, av, gamma).arrondi,
+        "beta_corrige": _beta_corrige_lot(ccd, tf, delta, gamma, offset, av),
+    }
+
+def _cache(tf, ccd, offset, av, gamma, delta, alpha):
+    lignes = list(zip(tf, ccd, offset, av, gamma))
+    return {
+        "delta_critique": np.array([delta_critique_cache(c, t, g, o, a) for t, c, o, a, g in lignes]),
+        "alpha_critique": np.array([alpha_critique_cache(t, c, o, a, g) for t, c, o, a, g in lignes]),
+        "beta_corrige": _beta_corrige_scalaire(tf, ccd, offset, av, gamma, delta),
+    }
+
+MOTEURS = {
+    "reference": _reference,
+    "boucle": _scalaire("boucle"),
+    "grille": _scalaire("grille"),
+    "analytique": _scalaire("analytique"),
+    "lot": _lot,
+    "cache": _cache,
+}
+
+
+def comparer(moteur, chemin=CORPUS):
+    """Écarts d'un moteur au corpus de référence."""
+    with np.load(chemin) as corpus:
+        ref = dict(corpus)
+    debut = time.perf_counter()
+    sortie = moteur(*(ref[nom] for nom in ENTREES))
+    duree = time.perf_counter() - debut
+
+    reserve = sortie["delta_critique"] - ref["delta"]
+    interpretation = _coder(interpretation_clinique_lot(sortie["delta_critique"], reserve, sortie["beta_corrige"]))
+    interpretation_alpha = _coder(interpretation_alpha_lot(sortie["alpha_critique"]))
+
+    rapport = {"lignes": len(ref["tf"]), "duree_s": duree}
+    for nom in ("delta_critique", "alpha_critique", "beta_corrige"):
+        ecart = np.abs(np.asarray(sortie[nom]) - ref[nom])
+        rapport[nom] = {"ecart_max": float(np.max(ecart)), "differences": int(np.sum(ecart > TOLERANCES[nom]))}
+    rapport["interpretations_changees"] = int(np.sum(interpretation != ref["interpretation"]))
+    rapport["interpretations_alpha_changees"] = int(np.sum(interpretation_alpha != ref["interpretation_alpha"]))
+    return rapport
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("moteurs", nargs="*", default=["grille", "analytique", "lot"],
+                        help="moteurs à comparer parmi : " + ", ".join(MOTEURS))
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--generer", action="store_true", help="recalculer le corpus avec les balayages d'origine")
+    parser.add_argument("--taille", type=int, default=6000)
+    args = parser.parse_args(argv)
+    for nom in args.moteurs:
+        if nom not in MOTEURS:
+            parser.error(f"moteur inconnu : {nom}")
+
+    if args.generer:
+        generer(args.corpus, args.taille)
+        return 0
+    echec = False
+    for nom in args.moteurs:
+        r = comparer(MOTEURS[nom], args.corpus)
+        print(f"{nom} ({r['lignes']} lignes, {r['duree_s']:.3f} s)")
+        for sortie in ("delta_critique", "alpha_critique", "beta_corrige"):
+            print(f"  {sortie:16s} écart max {r[sortie]['ecart_max']:.3g}°, "
+                  f"{r[sortie]['differences']} différences (tolérance {TOLERANCES[sortie]:g}°)")
+        print(f"  interprétations changées : {r['interpretations_changees']} (tronc), "
+              f"{r['interpretations_alpha_changees']} (jambe)")
+        echec |= bool(r["interpretations_changees"] or r["interpretations_alpha_changees"]
+                      or any(r[sortie]["differences"] for sortie in TOLERANCES))
+    return 1 if echec else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Balayages d'origine, figés : copie des fonctions des scripts Streamlit (izan.py, version de départ).
+
+Sert uniquement à (re)générer le corpus de référence : reserve_flexion peut
+changer ses noyaux (math au lieu de NumPy, solveurs analytiques) sans que
+la référence à laquelle on les compare change avec eux. Ne pas modifier.
+"""
+import math
+
+import numpy as np
+
+
+def estimer_longueur_col_femoral(offset_mm, ccd_deg):
+    ccd_rad = np.radians(ccd_deg)
+    return offset_mm / np.sin(ccd_rad)
+
+def vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+    theta = np.pi - np.radians(ccd_deg + gamma_deg)
+    delta = np.radians(delta_deg)
+    tf = np.radians(tf_deg)
+    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
+    ux = np.sin(theta) * long_col
+    uy = (-np.cos(delta) * np.cos(theta) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
+    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
+    return np.array([ux, uy, uz])
+
+def calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+    u = vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
+    ux, uz = u[0], u[2]
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    cos_beta = ux / norme_proj
+    beta_rad = np.arccos(cos_beta)
+    return np.degrees(beta_rad)
+
+def calcul_beta_corrige(beta_deg, av_deg):
+    return beta_deg + av_deg
+
+def calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
+    for delta_deg in np.arange(0, 90, 0.1):
+        beta = calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
+        beta_corrige = calcul_beta_corrige(beta, av_deg)
+        if beta_corrige <= seuil_beta_corrige:
+            return round(delta_deg, 1)
+    return 89.9
+
+def calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
+    ccd_rad = np.radians(ccd_deg)
+    tf_rad = np.radians(tf_deg)
+    alpha_rad = np.radians(alpha_deg)
+    gamma_rad = np.radians(gamma_deg)
+    long_col = offset_mm / np.sin(ccd_rad)
+
+    ux = np.sin(math.pi - ccd_rad + gamma_rad) * long_col
+    uy = -np.cos(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col - np.sin(alpha_rad) * np.sin(tf_rad) * long_col
+    uz = -np.sin(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col + np.cos(alpha_rad) * np.sin(tf_rad) * long_col
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    cos_beta = ux / norme_proj
+    beta_rad = np.arccos(cos_beta)
+    return np.degrees(beta_rad)
+
+def calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10):
+    for alpha_deg in np.arange(0, 130, 0.1):
+        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg)
+        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
+        if beta_corrige <= seuil_beta_corrige:
+            return round(alpha_deg, 1)
+    return 129.9
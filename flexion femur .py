@@ -1,93 +1,18 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
 from io import BytesIO
 from fpdf import FPDF
-import math
-
-# --- Constantes ---
-BETA_CONFLIT = 10
-
-# --- Fonctions complètes ---
-def estimer_longueur_col_femoral(offset_mm, ccd_deg):
-    ccd_rad = np.radians(ccd_deg)
-    return offset_mm / np.sin(ccd_rad)
-
-def vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    theta = np.pi - np.radians(ccd_deg + gamma_deg)
-    delta = np.radians(delta_deg)
-    tf = np.radians(tf_deg)
-    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
-    ux = np.sin(theta) * long_col
-    uy = (-np.cos(delta) * np.cos(theta) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
-    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
-    return np.array([ux, uy, uz])
-
-def calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    u = vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-    ux, uz = u[0], u[2]
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_beta_corrige(beta_deg, av_deg):
-    return beta_deg + av_deg
-
-def calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
-    for delta_deg in np.arange(0, 90, 0.1):
-        beta = calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-        beta_corrige = calcul_beta_corrige(beta, av_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(delta_deg, 1)
-    return 89.9
-
-def calcul_reserve(delta_critique, delta_mesuree):
-    return delta_critique - delta_mesuree
-
-def interpretation_clinique(delta_critique, reserve, beta_corrige):
-    if delta_critique == 89.9:
-        return 'Pas de conflit : réserve infinie'
-    elif reserve < 0:
-        return 'Conflit : flexion critique dépassée'
-    elif beta_corrige >= BETA_CONFLIT:
-        return 'Conflit : flexion critique atteinte'
-    elif reserve < 5:
-        return 'Pas de conflit : réserve limitée'
-    else:
-        return 'Pas de conflit : réserve suffisante'
-# --- Nouvelles fonctions pour flexion jambe ---
-def calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
-    ccd_rad = np.radians(ccd_deg)
-    tf_rad = np.radians(tf_deg)
-    alpha_rad = np.radians(alpha_deg)
-    gamma_rad = np.radians(gamma_deg)
-    long_col = offset_mm / np.sin(ccd_rad)
-
-    ux = np.sin(math.pi - ccd_rad + gamma_rad) * long_col
-    uy = -np.cos(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col - np.sin(alpha_rad) * np.sin(tf_rad) * long_col
-    uz = -np.sin(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col + np.cos(alpha_rad) * np.sin(tf_rad) * long_col
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10):
-    for alpha_deg in np.arange(0, 130, 0.1):
-        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg)
-        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(alpha_deg, 1)
-    return 129.9
-
-
-def calcul_alpha_critique_sans_gamma(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, seuil_beta_corrige=10):
-    for alpha_deg in np.arange(0, 130, 0.1):
-        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0)
-        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(alpha_deg, 1)
-    return 129.9
+
+from reserve_flexion import (
+    LIBELLES,
+    calcul_alpha_critique,
+    calcul_alpha_critique_sans_gamma,
+    calcul_angle_beta,
+    calcul_beta_corrige,
+    calcul_delta_critique,
+    calcul_reserve,
+    interpretation_clinique,
+)
 
 # --- Langues ---
 langue = st.selectbox("🌐 Choisir la langue / Select language", ["Français", "English"])
@@ -167,13 +92,13 @@ delta_critique_ref = calcul_delta_critique(ccd, tf, 0.0, offset, anteversion)
 reserve_ref = calcul_reserve(delta_critique_ref, delta_mesure)
 beta_ref = calcul_angle_beta(ccd, tf, delta_mesure, 0.0, offset)
 beta_corrige_ref = calcul_beta_corrige(beta_ref, anteversion)
-interpretation_ref = interpretation_clinique(delta_critique_ref, reserve_ref, beta_corrige_ref)
+interpretation_ref = interpretation_clinique(delta_critique_ref, reserve_ref, beta_corrige_ref, LIBELLES["Français"])
 
 delta_critique_gamma = calcul_delta_critique(ccd, tf, gamma_final, offset, anteversion)
 reserve_gamma = calcul_reserve(delta_critique_gamma, delta_mesure)
 beta_gamma = calcul_angle_beta(ccd, tf, delta_mesure, gamma_final, offset)
 beta_corrige_gamma = calcul_beta_corrige(beta_gamma, anteversion)
-interpretation_gamma = interpretation_clinique(delta_critique_gamma, reserve_gamma, beta_corrige_gamma)
+interpretation_gamma = interpretation_clinique(delta_critique_gamma, reserve_gamma, beta_corrige_gamma, LIBELLES["Français"])
 
 # --- 💥 Nouveau calcul pour flexion jambe ---
 
@@ -194,7 +119,6 @@ else:
     interpretation_alpha_sans = "Risque de luxation : Réserve limitée"
 
 
-
 # --- Affichage joli en colonnes (à ajouter ici) ---
 with st.container():
     st.subheader("Résultats d’analyse")
@@ -1,94 +1,15 @@
-import streamlit as st
+from functools import partial
+
 import numpy as np
-import pandas as pd
-from io import BytesIO
-from fpdf import FPDF
-import math
-
-# --- Constantes ---
-BETA_CONFLIT = 10
-
-# --- Fonctions complètes ---
-def estimer_longueur_col_femoral(offset_mm, ccd_deg):
-    ccd_rad = np.radians(ccd_deg)
-    return offset_mm / np.sin(ccd_rad)
-
-def vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    theta = np.pi - np.radians(ccd_deg + gamma_deg)
-    delta = np.radians(delta_deg)
-    tf = np.radians(tf_deg)
-    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
-    ux = np.sin(theta) * long_col
-    uy = (-np.cos(delta) * np.cos(theta) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
-    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
-    return np.array([ux, uy, uz])
-
-def calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    u = vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-    ux, uz = u[0], u[2]
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_beta_corrige(beta_deg, av_deg):
-    return beta_deg + av_deg
-
-def calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
-    for delta_deg in np.arange(0, 90, 0.1):
-        beta = calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-        beta_corrige = calcul_beta_corrige(beta, av_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(delta_deg, 1)
-    return 89.9
-
-def calcul_reserve(delta_critique, delta_mesuree):
-    return delta_critique - delta_mesuree
-
-def interpretation_clinique(delta_critique, reserve, beta_corrige):
-    if delta_critique == 89.9:
-        return labels["no_conflict"]
-    elif reserve < 0:
-        return labels["conflict_critical_exceeded"]
-    elif beta_corrige >= BETA_CONFLIT:
-        return labels["conflict_critical_reached"]
-    elif reserve < 5:
-        return labels["no_conflict_limited"]
-    else:
-        return labels["no_conflict_sufficient"]
-
-# --- Nouvelles fonctions pour flexion jambe ---
-def calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
-    ccd_rad = np.radians(ccd_deg)
-    tf_rad = np.radians(tf_deg)
-    alpha_rad = np.radians(alpha_deg)
-    gamma_rad = np.radians(gamma_deg)
-    long_col = offset_mm / np.sin(ccd_rad)
-
-    ux = np.sin(math.pi - ccd_rad + gamma_rad) * long_col
-    uy = -np.cos(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col - np.sin(alpha_rad) * np.sin(tf_rad) * long_col
-    uz = -np.sin(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col + np.cos(alpha_rad) * np.sin(tf_rad) * long_col
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10):
-    for alpha_deg in np.arange(0, 130, 0.1):
-        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg)
-        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(alpha_deg, 1)
-    return 129.9
-
-
-def calcul_alpha_critique_sans_gamma(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, seuil_beta_corrige=10):
-    for alpha_deg in np.arange(0, 130, 0.1):
-        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0)
-        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(alpha_deg, 1)
-    return 129.9
+import streamlit as st
+
+from reserve_flexion.carte import carte_reserve
+from reserve_flexion.export import tableau_export
+from reserve_flexion.incertitude import propagation_incertitude
+from reserve_flexion.rapport import rapport_pdf
+from reserve_flexion.recommandation import recommander_anteversion
+from reserve_flexion.resultat import analyser_patient
+from reserve_flexion.sensibilite import analyse_sensibilite
 
 # --- Langues ---
 langue = st.selectbox("🌐 Choisir la langue / Select language", ["Français", "English"])
@@ -124,8 +45,7 @@ labels = {
         "conflict_critical_exceeded": "Conflit : flexion critique dépassée",
         "conflict_critical_reached": "Conflit : flexion critique atteinte",
         "no_conflict_limited": "Pas de conflit : réserve limitée",
-        "no_conflict_sufficient": "Pas de conflit : réserve suffisante
-
+        "no_conflict_sufficient": "Pas de conflit : réserve suffisante"
     },
     "English": {
         "title": " Clinical Analysis of Flexion Reserve",
@@ -144,7 +64,8 @@ labels = {
         "beta": "Femoral neck inclination (°)",
         "export": "📥 Download CSV",
         "export_pdf": "📄 Download PDF",
-        "attention": "⚠️ **Clinical warning**: If the maximum tolerated pelvic flexion (δ critical) is equal to 89.9°, this means that no conflict is ever detected. In this case, the flexion reserve is considered infinite, as pelvic flexion is completely free and there is no functional limitation.\n\nSimilarly, for leg flexion, if the maximum theoretical flexion before impingement returns 129.9°, it means there is no theoretical conflict risk and the reserve is also considered infinite."        "results_analysis": "Analysis results",
+        "attention": "⚠️ **Clinical warning**: If the maximum tolerated pelvic flexion (δ critical) is equal to 89.9°, this means that no conflict is ever detected. In this case, the flexion reserve is considered infinite, as pelvic flexion is completely free and there is no functional limitation.\n\nSimilarly, for leg flexion, if the maximum theoretical flexion before impingement returns 129.9°, it means there is no theoretical conflict risk and the reserve is also considered infinite.",
+        "results_analysis": "Analysis results",
         "results_flexion_leg": "Leg flexion results",
         "without_gamma": "Without adduction/abduction (0°)",
         "with_gamma": "With adduction/abduction ({gamma:.1f}°)",
@@ -165,22 +86,31 @@ st.title(labels["title"])
 patient_name = st.text_input(labels["patient_name"], value="Patient X")
 
 
-col1, col2 = st.columns(2)
+# --- Saisie : formulaire validé par un bouton (une analyse par patient) ou calcul en direct ---
+calcul_direct = st.checkbox("Calcul en direct / Live mode", value=False,
+                            help="Recalcule à chaque modification d'un paramètre / Recompute on every change")
+saisie = st.container() if calcul_direct else st.form("saisie_patient")
+
+with saisie:
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Paramètres pelviens / Pelvic parameters")
+        version_debout = st.number_input(labels["version_stand"], value=15.0, step=1.0, key="version_debout")
+        version_assis = st.number_input(labels["version_sit"], value=35.0, step=1.0, key="version_assis")
+        anteversion = st.number_input(labels["anteversion"], value=25.0, step=1.0, key="anteversion")
+        alpha_mesure = st.number_input("Alpha mesuré (°)", value=90.0, step=1.0, key="alpha_mesure")
+
+    with col2:
+        st.subheader("Paramètres fémoraux / Femoral parameters")
+        tf = st.number_input(labels["tf"], value=20.0, step=1.0, key="tf")
+        ccd = st.number_input(labels["ccd"], value=130.0, step=1.0, key="ccd")
+        offset = st.number_input(labels["offset"], value=40.0, step=1.0, key="offset")
 
-with col1:
-    
-    st.subheader("Paramètres pelviens / Pelvic parameters")
-    version_debout = st.number_input(labels["version_stand"], value=15.0, step=1.0)
-    version_assis = st.number_input(labels["version_sit"], value=35.0, step=1.0)
-    anteversion = st.number_input(labels["anteversion"], value=25.0, step=1.0)
-    alpha_mesure = st.number_input("Alpha mesuré (°)", value=90.0, step=1.0)
+    if not calcul_direct:
+        st.form_submit_button("Calculer / Compute")
 
-with col2:
-    st.subheader("Paramètres fémoraux / Femoral parameters")
-    tf = st.number_input(labels["tf"], value=20.0, step=1.0)
-    ccd = st.number_input(labels["ccd"], value=130.0, step=1.0)
-    offset = st.number_input(labels["offset"], value=40.0, step=1.0)
-    gamma_final = st.slider(
+gamma_final = st.slider(
     "Abduction (+) / Adduction (–) (γ °)", 
     min_value=-45.0, 
     max_value=45.0, 
@@ -189,209 +119,171 @@ with col2:
     help="Valeurs négatives : adduction, valeurs positives : abduction"
 )
 
-delta_mesure = version_assis - version_debout
-
-delta_critique_ref = calcul_delta_critique(ccd, tf, 0.0, offset, anteversion)
-reserve_ref = calcul_reserve(delta_critique_ref, delta_mesure)
-beta_ref = calcul_angle_beta(ccd, tf, delta_mesure, 0.0, offset)
-beta_corrige_ref = calcul_beta_corrige(beta_ref, anteversion)
-interpretation_ref = interpretation_clinique(delta_critique_ref, reserve_ref, beta_corrige_ref)
-
-delta_critique_gamma = calcul_delta_critique(ccd, tf, gamma_final, offset, anteversion)
-reserve_gamma = calcul_reserve(delta_critique_gamma, delta_mesure)
-beta_gamma = calcul_angle_beta(ccd, tf, delta_mesure, gamma_final, offset)
-beta_corrige_gamma = calcul_beta_corrige(beta_gamma, anteversion)
-interpretation_gamma = interpretation_clinique(delta_critique_gamma, reserve_gamma, beta_corrige_gamma)
-
-# --- 💥 Nouveau calcul pour flexion jambe ---
-
-alpha_critique_avec_gamma = calcul_alpha_critique(tf, ccd, offset, anteversion, gamma_final)
-reserve_alpha_avec_gamma = alpha_critique_avec_gamma - alpha_mesure
-
-if alpha_critique_avec_gamma == 129.9:
-    interpretation_alpha_avec = labels["risk_none"]
-else:
-    interpretation_alpha_avec = labels["risk_limited"]
-
-
-alpha_critique_sans_gamma = calcul_alpha_critique_sans_gamma(tf, ccd, offset, anteversion)
-reserve_alpha_sans_gamma = alpha_critique_sans_gamma - alpha_mesure
-
-if alpha_critique_sans_gamma == 129.9:
-    interpretation_alpha_sans = labels["risk_none"]
-else:
-    interpretation_alpha_sans = labels["risk_limited"]
-
-
-
-# --- Affichage joli en colonnes (corrigé) ---
-with st.container():
-    st.subheader("Résultats d’analyse" if langue == "Français" else "Analysis results")
-    st.subheader("Flexion du tronc" if langue == "Français" else "Trunk flexion")
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("**" + (f"Sans abduction/adduction (γ = {0.0:.1f}°)" if langue == "Français" else f"Without abduction/adduction (γ = {0.0:.1f}°)") + "**")
-    st.write(f"• {labels['mob']}: :green[{delta_mesure:.1f}°]")
-    st.write(f"• {labels['crit']}: :green[{delta_critique_ref:.1f}°]")
-    st.write(f"• {labels['reserve']}: :green[{reserve_ref:.1f}°]")
-    st.write(f"• {labels['beta']}: :green[{beta_corrige_ref:.1f}°]")
-    st.markdown(f"*{interpretation_ref}*")
-
-with col2:
-    st.markdown("**" + (f"Avec abduction/adduction (γ = {gamma_final:.1f}°)" if langue == "Français" else f"With abduction/adduction (γ = {gamma_final:.1f}°)") + "**")
-    st.write(f"• {labels['mob']}: :green[{delta_mesure:.1f}°]")
-    st.write(f"• {labels['crit']}: :green[{delta_critique_gamma:.1f}°]")
-    st.write(f"• {labels['reserve']}: :green[{reserve_gamma:.1f}°]")
-    st.write(f"• {labels['beta']}: :green[{beta_corrige_gamma:.1f}°]")
-    st.markdown(f"*{interpretation_gamma}*")
-
-# --- Résultats flexion jambe ---
-st.subheader("Résultats flexion jambe" if langue == "Français" else "Leg flexion results")
-
-col3, col4 = st.columns(2)
-
-# Labels
-alpha_mesure_label = 'Flexion de hanche mesurée' if langue == 'Français' else 'Measured hip flexion'
-alpha_critique_label = 'Flexion maximal théorique avant comflit' if langue == 'Français' else 'Maximum theoretical flexion before impingement'
-reserve_flexion_label = 'Réserve de flexion' if langue == 'Français' else 'Flexion reserve'
-
-with col3:
-    st.markdown("**" + ("Sans abduction/adduction (γ = 0°)" if langue == "Français" else "Without gamma (γ = 0°)") + "**")
-    st.write(f"• {alpha_mesure_label} : :green[{alpha_mesure:.1f}°]")
-    st.write(f"• {alpha_critique_label} : :green[{alpha_critique_sans_gamma:.1f}°]")
-    st.write(f"• {reserve_flexion_label} : :green[{reserve_alpha_sans_gamma:.1f}°]")
-    st.markdown(f"*{interpretation_alpha_sans}*")
-
-with col4:
-    st.markdown("**" + (f"Avec abduction/adduction (γ = {gamma_final:.1f}°)" if langue == "Français" else f"With gamma (γ = {gamma_final:.1f}°)") + "**")
-    st.write(f"• {alpha_mesure_label} : :green[{alpha_mesure:.1f}°]")
-    st.write(f"• {alpha_critique_label} : :green[{alpha_critique_avec_gamma:.1f}°]")
-    st.write(f"• {reserve_flexion_label} : :green[{reserve_alpha_avec_gamma:.1f}°]")
-    st.markdown(f"*{interpretation_alpha_avec}*")
-
-# --- Export CSV ---
-
-df = pd.DataFrame({
-    "Condition": [
-        "Sans abduction/adduction (tronc)", 
-        f"Avec abduction/adduction = {gamma_final:.1f}° (tronc)",
-        "Sans abduction/adduction (jambe)", 
-        f"Avec abduction/adduction = {gamma_final:.1f}° (jambe)"
-    ],
-    labels["mob"]: [delta_mesure, delta_mesure, "", ""],
-    labels["crit"]: [delta_critique_ref, delta_critique_gamma, alpha_critique_sans_gamma, alpha_critique_avec_gamma],
-    labels["reserve"]: [reserve_ref, reserve_gamma, reserve_alpha_sans_gamma, reserve_alpha_avec_gamma],
-    labels["beta"]: [beta_corrige_ref, beta_corrige_gamma, "", ""],
-    "Interprétation": [interpretation_ref, interpretation_gamma, interpretation_alpha_sans, interpretation_alpha_avec],
-    labels["patient_name"]: [patient_name, patient_name, patient_name, patient_name]
-})
-
-
-csv = df.to_csv(index=False).encode("utf-8")
-st.download_button(labels["export"], data=csv, file_name="resultats_flexion.csv", mime="text/csv")
-
-if st.button(labels["export_pdf"]):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    title_text = labels["title"]
-    pdf.cell(0, 10, title_text.encode("latin-1", "replace").decode("latin-1"), ln=1, align="C")
-
-    pdf.ln(5)
-    pdf.set_font("Arial", "", 12)
-    patient_line = f"{labels['patient_name']}: {patient_name}"
-    pdf.cell(0, 10, patient_line.encode("latin-1", "replace").decode("latin-1"), ln=1)
-
-    # Résultats analyse
-    pdf.ln(5)
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 10, labels["results_analysis"].encode("latin-1", "replace").decode("latin-1"), ln=1)
-
-    # Flexion du tronc
-    pdf.ln(4)
-    pdf.set_font("Arial", "B", 12)
-    subtitle = "Flexion du tronc" if langue == "Français" else "Trunk flexion"
-    pdf.cell(0, 10, subtitle.encode("latin-1", "replace").decode("latin-1"), ln=1)
-
-    # Sans abduction
-    pdf.ln(2)
-    pdf.set_font("Arial", "B", 11)
-    line = f"{labels['without_gamma']}:"
-    pdf.cell(0, 10, line.encode("latin-1", "replace").decode("latin-1"), ln=1)
-    pdf.set_font("Arial", "", 11)
-
-    lines = [
-        f"{labels['mob']}: {delta_mesure:.1f}°",
-        f"{labels['crit']}: {delta_critique_ref:.1f}°",
-        f"{labels['reserve']}: {reserve_ref:.1f}°",
-        f"{labels['beta']}: {beta_corrige_ref:.1f}°",
-        interpretation_ref
-    ]
-    for l in lines:
-        safe_line = l.encode("latin-1", "replace").decode("latin-1")
-        pdf.multi_cell(0, 8, safe_line)
-
-    # Avec abduction
-    pdf.ln(2)
-    pdf.set_font("Arial", "B", 11)
-    line = f"{labels['with_gamma'].format(gamma=gamma_final)}:"
-    pdf.cell(0, 10, line.encode("latin-1", "replace").decode("latin-1"), ln=1)
-    pdf.set_font("Arial", "", 11)
-
-    lines = [
-        f"{labels['mob']}: {delta_mesure:.1f}°",
-        f"{labels['crit']}: {delta_critique_gamma:.1f}°",
-        f"{labels['reserve']}: {reserve_gamma:.1f}°",
-        f"{labels['beta']}: {beta_corrige_gamma:.1f}°",
-        interpretation_gamma
-    ]
-    for l in lines:
-        safe_line = l.encode("latin-1", "replace").decode("latin-1")
-        pdf.multi_cell(0, 8, safe_line)
-
-    # Résultats flexion jambe
-    pdf.ln(6)
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 10, labels["results_flexion_leg"].encode("latin-1", "replace").decode("latin-1"), ln=1)
-
-    # Sans gamma
-    pdf.ln(2)
-    pdf.set_font("Arial", "B", 11)
-    line = f"{labels['without_gamma']}:"
-    pdf.cell(0, 10, line.encode("latin-1", "replace").decode("latin-1"), ln=1)
-    pdf.set_font("Arial", "", 11)
-
-    lines = [
-        f"{labels['alpha_measured']}: {alpha_mesure:.1f}°",
-        f"{labels['alpha_crit']}: {alpha_critique_sans_gamma:.1f}°",
-        f"{labels['reserve']}: {reserve_alpha_sans_gamma:.1f}°",
-        interpretation_alpha_sans
-    ]
-    for l in lines:
-        safe_line = l.encode("latin-1", "replace").decode("latin-1")
-        pdf.multi_cell(0, 8, safe_line)
-
-    # Avec gamma
-    pdf.ln(2)
-    pdf.set_font("Arial", "B", 11)
-    line = f"{labels['with_gamma'].format(gamma=gamma_final)}:"
-    pdf.cell(0, 10, line.encode("latin-1", "replace").decode("latin-1"), ln=1)
-    pdf.set_font("Arial", "", 11)
-
-    lines = [
-        f"{labels['alpha_measured']}: {alpha_mesure:.1f}°",
-        f"{labels['alpha_crit']}: {alpha_critique_avec_gamma:.1f}°",
-        f"{labels['reserve']}: {reserve_alpha_avec_gamma:.1f}°",
-        interpretation_alpha_avec
-    ]
-    for l in lines:
-        safe_line = l.encode("latin-1", "replace").decode("latin-1")
-        pdf.multi_cell(0, 8, safe_line)
-
-    # Génération finale propre
-    pdf_bytes = pdf.output(dest='S').encode('latin-1', 'replace')
-    st.download_button(labels["export_pdf"], data=pdf_bytes, file_name="resultats_flexion.pdf", mime="application/pdf")
-
-st.info(labels["attention"])
 
+# --- Calculs : analyse complète, angles critiques en cache (reserve_flexion.cache) ---
+# Avec les solveurs analytiques, une analyse complète coûte ~45 µs : tenir à
+# jour un GrapheAnalyse ou un balayage de γ coûte plus qu'il ne fait gagner
+# (python -m benchmarks.bench_graphe).
+entrees = (tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final)
+analyse = analyser_patient(*entrees)
+
+
+# --- Résultats, export et avertissement : fragments Streamlit ---
+# Un widget d'un fragment ne réexécute que ce fragment : le bouton PDF ne
+# repasse ni par la saisie, ni par les libellés, ni par les calculs.
+@st.fragment
+def afficher_resultats(analyse, labels, langue):
+    # --- Affichage joli en colonnes (corrigé) ---
+    with st.container():
+        st.subheader("Résultats d’analyse" if langue == "Français" else "Analysis results")
+        st.subheader("Flexion du tronc" if langue == "Français" else "Trunk flexion")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**" + (f"Sans abduction/adduction (γ = {0.0:.1f}°)" if langue == "Français" else f"Without abduction/adduction (γ = {0.0:.1f}°)") + "**")
+        st.write(f"• {labels['mob']}: :green[{analyse.delta_mesure:.1f}°]")
+        st.write(f"• {labels['crit']}: :green[{analyse.delta_critique_ref:.1f}°]")
+        st.write(f"• {labels['reserve']}: :green[{analyse.reserve_ref:.1f}°]")
+        st.write(f"• {labels['beta']}: :green[{analyse.beta_corrige_ref:.1f}°]")
+        st.markdown(f"*{labels[analyse.interpretation_ref]}*")
+
+    with col2:
+        st.markdown("**" + (f"Avec abduction/adduction (γ = {analyse.gamma_final:.1f}°)" if langue == "Français" else f"With abduction/adduction (γ = {analyse.gamma_final:.1f}°)") + "**")
+        st.write(f"• {labels['mob']}: :green[{analyse.delta_mesure:.1f}°]")
+        st.write(f"• {labels['crit']}: :green[{analyse.delta_critique_gamma:.1f}°]")
+        st.write(f"• {labels['reserve']}: :green[{analyse.reserve_gamma:.1f}°]")
+        st.write(f"• {labels['beta']}: :green[{analyse.beta_corrige_gamma:.1f}°]")
+        st.markdown(f"*{labels[analyse.interpretation_gamma]}*")
+
+    # --- Résultats flexion jambe ---
+    st.subheader("Résultats flexion jambe" if langue == "Français" else "Leg flexion results")
+
+    col3, col4 = st.columns(2)
+
+    # Labels
+    alpha_mesure_label = 'Flexion de hanche mesurée' if langue == 'Français' else 'Measured hip flexion'
+    alpha_critique_label = 'Flexion maximal théorique avant comflit' if langue == 'Français' else 'Maximum theoretical flexion before impingement'
+    reserve_flexion_label = 'Réserve de flexion' if langue == 'Français' else 'Flexion reserve'
+
+    with col3:
+        st.markdown("**" + ("Sans abduction/adduction (γ = 0°)" if langue == "Français" else "Without gamma (γ = 0°)") + "**")
+        st.write(f"• {alpha_mesure_label} : :green[{analyse.alpha_mesure:.1f}°]")
+        st.write(f"• {alpha_critique_label} : :green[{analyse.alpha_critique_sans_gamma:.1f}°]")
+        st.write(f"• {reserve_flexion_label} : :green[{analyse.reserve_alpha_sans_gamma:.1f}°]")
+        st.markdown(f"*{labels[analyse.interpretation_alpha_sans]}*")
+
+    with col4:
+        st.markdown("**" + (f"Avec abduction/adduction (γ = {analyse.gamma_final:.1f}°)" if langue == "Français" else f"With gamma (γ = {analyse.gamma_final:.1f}°)") + "**")
+        st.write(f"• {alpha_mesure_label} : :green[{analyse.alpha_mesure:.1f}°]")
+        st.write(f"• {alpha_critique_label} : :green[{analyse.alpha_critique_avec_gamma:.1f}°]")
+        st.write(f"• {reserve_flexion_label} : :green[{analyse.reserve_alpha_avec_gamma:.1f}°]")
+        st.markdown(f"*{labels[analyse.interpretation_alpha_avec]}*")
+
+
+@st.fragment
+def panneau_export(analyse, patient_name, labels, langue):
+    # Le CSV (et pandas) n'est produit qu'au clic sur le bouton de téléchargement
+    st.download_button(labels["export"], data=partial(csv_patient, analyse, patient_name, langue),
+                       file_name="resultats_flexion.csv", mime="text/csv")
+
+    if st.button(labels["export_pdf"]):
+        pdf_bytes = rapport_pdf(analyse, patient_name, labels, langue)
+        st.download_button(labels["export_pdf"], data=pdf_bytes, file_name="resultats_flexion.pdf",
+                           mime="application/pdf")
+
+
+@st.fragment
+def avertissement(labels):
+    st.info(labels["attention"])
+
+
+def csv_patient(analyse, patient_name, langue):
+    df = tableau_export(analyse, [patient_name], analyse.gamma_final, langue)
+    return df.to_csv(index=False).encode("utf-8")
+
+
+afficher_resultats(analyse, labels, langue)
+
+# --- Sensibilité (tornade) ---
+if st.checkbox("Analyse de sensibilité" if langue == "Français" else "Sensitivity analysis"):
+    sensibilite = analyse_sensibilite(*entrees)
+    col5, col6 = st.columns(2)
+    for col, cle, titre in (
+        (col5, "reserve_tronc", "Réserve tronc (γ)" if langue == "Français" else "Trunk reserve (γ)"),
+        (col6, "reserve_jambe", "Réserve jambe (γ)" if langue == "Français" else "Leg reserve (γ)"),
+    ):
+        s = sensibilite[cle]
+        with col:
+            st.markdown(f"**{titre} : {s['base']:.1f}°**")
+            st.dataframe({
+                "Paramètre" if langue == "Français" else "Parameter": [t[0] for t in s["tornade"]],
+                "−": [t[1] for t in s["tornade"]],
+                "+": [t[2] for t in s["tornade"]],
+                "∂R": [round(s["derivees"][t[0]], 2) for t in s["tornade"]],
+            }, hide_index=True)
+
+# --- Incertitude de mesure (Monte Carlo) ---
+if st.checkbox("Incertitude de mesure (Monte Carlo)" if langue == "Français" else "Measurement uncertainty (Monte Carlo)"):
+    if st.session_state.get("entrees_incertitude") != entrees:
+        st.session_state["entrees_incertitude"] = entrees
+        st.session_state["incertitude"] = propagation_incertitude(*entrees, graine=0)
+    incertitude = st.session_state["incertitude"]
+    col7, col8 = st.columns(2)
+    for col, reserve, interpretation, titre in (
+        (col7, "reserve_gamma", "interpretation_gamma", "Réserve tronc (γ)" if langue == "Français" else "Trunk reserve (γ)"),
+        (col8, "reserve_alpha_avec_gamma", "interpretation_alpha_avec", "Réserve jambe (γ)" if langue == "Français" else "Leg reserve (γ)"),
+    ):
+        d = incertitude["reserves"][reserve]
+        with col:
+            st.markdown(f"**{titre}**")
+            st.write(f"• IC 95 % : [{d['q2.5']:.1f}° ; {d['q97.5']:.1f}°], médiane {d['q50']:.1f}°")
+            for cle, p in sorted(incertitude["probabilites"][interpretation].items(), key=lambda t: -t[1]):
+                st.write(f"• {labels[cle]} : {100 * p:.1f} %")
+
+# --- Carte des réserves AV × γ ---
+if st.checkbox("Carte des réserves AV × γ" if langue == "Français" else "Reserve map AV × γ"):
+    import altair as alt  # chargés seulement quand la carte est affichée
+    import pandas as pd
+
+    carte = carte_reserve(tf, ccd, offset, analyse.delta_mesure, alpha_mesure)
+    col9, col10 = st.columns(2)
+    for col, cle, titre in (
+        (col9, "reserve_tronc", "Réserve tronc (°)" if langue == "Français" else "Trunk reserve (°)"),
+        (col10, "reserve_jambe", "Réserve jambe (°)" if langue == "Français" else "Leg reserve (°)"),
+    ):
+        points = pd.DataFrame({
+            "AV": np.repeat(carte["anteversion"], len(carte["gamma"])),
+            "γ": np.tile(carte["gamma"], len(carte["anteversion"])),
+            "reserve": carte[cle].ravel(),
+        })
+        graphique = alt.Chart(points, title=titre).mark_rect().encode(
+            x=alt.X("γ:O", axis=alt.Axis(values=list(range(-45, 46, 15)))),
+            y=alt.Y("AV:O", sort="descending", axis=alt.Axis(values=list(range(-10, 51, 10)))),
+            color=alt.Color("reserve:Q", scale=alt.Scale(scheme="redblue", domainMid=0), title="°"),
+            tooltip=["AV:Q", "γ:Q", "reserve:Q"],
+        )
+        with col:
+            st.altair_chart(graphique, width="stretch")
+
+# --- Antéversion recommandée ---
+if st.checkbox("Antéversion recommandée" if langue == "Français" else "Recommended anteversion"):
+    reserve_cible = st.number_input("Réserve cible (°)" if langue == "Français" else "Target reserve (°)", value=10.0, step=1.0)
+    recommandation = recommander_anteversion(tf, ccd, offset, analyse.delta_mesure, alpha_mesure, gamma_final, reserve_cible)
+    for cle, titre in (
+        ("tronc", "Tronc" if langue == "Français" else "Trunk"),
+        ("jambe", "Jambe" if langue == "Français" else "Leg"),
+        ("anteversion_min", "Tronc et jambe" if langue == "Français" else "Trunk and leg"),
+    ):
+        av_min = recommandation[cle]
+        if av_min == float("inf"):
+            texte = "cible inatteignable" if langue == "Français" else "target unreachable"
+        elif av_min == float("-inf"):
+            texte = "toute AV" if langue == "Français" else "any AV"
+        else:
+            texte = f"AV > {av_min:.1f}°"
+        st.write(f"• {titre} (γ = 0° / {gamma_final:.1f}°) : :green[{texte}]")
+
+# --- Export CSV / PDF ---
+panneau_export(analyse, patient_name, labels, langue)
+
+avertissement(labels)
@@ -1,98 +1,9 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
 from io import BytesIO
-from fpdf import FPDF
-import math
-from fpdf import FPDF, HTMLMixin
 
-class PDF(FPDF, HTMLMixin):
-    pass
-
-# --- Constantes ---
-BETA_CONFLIT = 10
-
-# --- Fonctions complètes ---
-def estimer_longueur_col_femoral(offset_mm, ccd_deg):
-    ccd_rad = np.radians(ccd_deg)
-    return offset_mm / np.sin(ccd_rad)
-
-def vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    theta = np.pi - np.radians(ccd_deg + gamma_deg)
-    delta = np.radians(delta_deg)
-    tf = np.radians(tf_deg)
-    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
-    ux = np.sin(theta) * long_col
-    uy = (-np.cos(delta) * np.cos(theta) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
-    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
-    return np.array([ux, uy, uz])
-
-def calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
-    u = vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-    ux, uz = u[0], u[2]
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_beta_corrige(beta_deg, av_deg):
-    return beta_deg + av_deg
-
-def calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
-    for delta_deg in np.arange(0, 90, 0.1):
-        beta = calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
-        beta_corrige = calcul_beta_corrige(beta, av_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(delta_deg, 1)
-    return 89.9
-
-def calcul_reserve(delta_critique, delta_mesuree):
-    return delta_critique - delta_mesuree
-
-def interpretation_clinique(delta_critique, reserve, beta_corrige):
-    if delta_critique == 89.9:
-        return labels["no_conflict"]
-    elif reserve < 0:
-        return labels["conflict_critical_exceeded"]
-    elif beta_corrige >= BETA_CONFLIT:
-        return labels["conflict_critical_reached"]
-    elif reserve < 5:
-        return labels["no_conflict_limited"]
-    else:
-        return labels["no_conflict_sufficient"]
-
-# --- Nouvelles fonctions pour flexion jambe ---
-def calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
-    ccd_rad = np.radians(ccd_deg)
-    tf_rad = np.radians(tf_deg)
-    alpha_rad = np.radians(alpha_deg)
-    gamma_rad = np.radians(gamma_deg)
-    long_col = offset_mm / np.sin(ccd_rad)
-
-    ux = np.sin(math.pi - ccd_rad + gamma_rad) * long_col
-    uy = -np.cos(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col - np.sin(alpha_rad) * np.sin(tf_rad) * long_col
-    uz = -np.sin(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col + np.cos(alpha_rad) * np.sin(tf_rad) * long_col
-    norme_proj = np.sqrt(ux**2 + uz**2)
-    cos_beta = ux / norme_proj
-    beta_rad = np.arccos(cos_beta)
-    return np.degrees(beta_rad)
-
-def calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10):
-    for alpha_deg in np.arange(0, 130, 0.1):
-        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg)
-        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(alpha_deg, 1)
-    return 129.9
-
-
-def calcul_alpha_critique_sans_gamma(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, seuil_beta_corrige=10):
-    for alpha_deg in np.arange(0, 130, 0.1):
-        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0)
-        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
-        if beta_corrige <= seuil_beta_corrige:
-            return round(alpha_deg, 1)
-    return 129.9
+from reserve_flexion.resultat import analyser_patient
+from reserve_flexion.rapport import POLICE_UNICODE, rapport_pdf
 
 # --- Langues ---
 langue = st.selectbox("🌐 Choisir la langue / Select language", ["Français", "English"])
@@ -169,22 +80,31 @@ st.title(labels["title"])
 patient_name = st.text_input(labels["patient_name"], value="Patient X")
 
 
-col1, col2 = st.columns(2)
+# --- Saisie : formulaire validé par un bouton (une analyse par patient) ou calcul en direct ---
+calcul_direct = st.checkbox("Calcul en direct / Live mode", value=False,
+                            help="Recalcule à chaque modification d'un paramètre / Recompute on every change")
+saisie = st.container() if calcul_direct else st.form("saisie_patient")
 
-with col1:
-    
-    st.subheader("Paramètres pelviens / Pelvic parameters")
-    version_debout = st.number_input(labels["version_stand"], value=15.0, step=1.0)
-    version_assis = st.number_input(labels["version_sit"], value=35.0, step=1.0)
-    anteversion = st.number_input(labels["anteversion"], value=25.0, step=1.0)
-    alpha_mesure = st.number_input("Alpha mesuré (°)", value=90.0, step=1.0)
+with saisie:
+    col1, col2 = st.columns(2)
 
-with col2:
-    st.subheader("Paramètres fémoraux / Femoral parameters")
-    tf = st.number_input(labels["tf"], value=20.0, step=1.0)
-    ccd = st.number_input(labels["ccd"], value=130.0, step=1.0)
-    offset = st.number_input(labels["offset"], value=40.0, step=1.0)
-    gamma_final = st.slider(
+    with col1:
+        st.subheader("Paramètres pelviens / Pelvic parameters")
+        version_debout = st.number_input(labels["version_stand"], value=15.0, step=1.0, key="version_debout")
+        version_assis = st.number_input(labels["version_sit"], value=35.0, step=1.0, key="version_assis")
+        anteversion = st.number_input(labels["anteversion"], value=25.0, step=1.0, key="anteversion")
+        alpha_mesure = st.number_input("Alpha mesuré (°)", value=90.0, step=1.0, key="alpha_mesure")
+
+    with col2:
+        st.subheader("Paramètres fémoraux / Femoral parameters")
+        tf = st.number_input(labels["tf"], value=20.0, step=1.0, key="tf")
+        ccd = st.number_input(labels["ccd"], value=130.0, step=1.0, key="ccd")
+        offset = st.number_input(labels["offset"], value=40.0, step=1.0, key="offset")
+
+    if not calcul_direct:
+        st.form_submit_button("Calculer / Compute")
+
+gamma_final = st.slider(
     "Abduction (+) / Adduction (–) (γ °)", 
     min_value=-45.0, 
     max_value=45.0, 
@@ -193,40 +113,12 @@ with col2:
     help="Valeurs négatives : adduction, valeurs positives : abduction"
 )
 
-delta_mesure = version_assis - version_debout
-
-delta_critique_ref = calcul_delta_critique(ccd, tf, 0.0, offset, anteversion)
-reserve_ref = calcul_reserve(delta_critique_ref, delta_mesure)
-beta_ref = calcul_angle_beta(ccd, tf, delta_mesure, 0.0, offset)
-beta_corrige_ref = calcul_beta_corrige(beta_ref, anteversion)
-interpretation_ref = interpretation_clinique(delta_critique_ref, reserve_ref, beta_corrige_ref)
-
-delta_critique_gamma = calcul_delta_critique(ccd, tf, gamma_final, offset, anteversion)
-reserve_gamma = calcul_reserve(delta_critique_gamma, delta_mesure)
-beta_gamma = calcul_angle_beta(ccd, tf, delta_mesure, gamma_final, offset)
-beta_corrige_gamma = calcul_beta_corrige(beta_gamma, anteversion)
-interpretation_gamma = interpretation_clinique(delta_critique_gamma, reserve_gamma, beta_corrige_gamma)
-
-# --- 💥 Nouveau calcul pour flexion jambe ---
-
-alpha_critique_avec_gamma = calcul_alpha_critique(tf, ccd, offset, anteversion, gamma_final)
-reserve_alpha_avec_gamma = alpha_critique_avec_gamma - alpha_mesure
-
-if alpha_critique_avec_gamma == 129.9:
-    interpretation_alpha_avec = labels["risk_none"]
-else:
-    interpretation_alpha_avec = labels["risk_limited"]
-
-
-alpha_critique_sans_gamma = calcul_alpha_critique_sans_gamma(tf, ccd, offset, anteversion)
-reserve_alpha_sans_gamma = alpha_critique_sans_gamma - alpha_mesure
-
-if alpha_critique_sans_gamma == 129.9:
-    interpretation_alpha_sans = labels["risk_none"]
-else:
-    interpretation_alpha_sans = labels["risk_limited"]
-
-
+# --- Analyse : calculée une fois par jeu d'entrées et gardée entre les reruns (affichage, CSV, PDF) ---
+entrees = (tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final)
+if st.session_state.get("entrees_analyse") != entrees:
+    st.session_state["entrees_analyse"] = entrees
+    st.session_state["analyse"] = analyser_patient(*entrees)
+analyse = st.session_state["analyse"]
 
 # --- Affichage joli en colonnes (corrigé) ---
 with st.container():
@@ -236,19 +128,19 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown("**" + (f"Sans abduction/adduction (γ = {0.0:.1f}°)" if langue == "Français" else f"Without abduction/adduction (γ = {0.0:.1f}°)") + "**")
-    st.write(f"• {labels['mob']}: :green[{delta_mesure:.1f}°]")
-    st.write(f"• {labels['crit']}: :green[{delta_critique_ref:.1f}°]")
-    st.write(f"• {labels['reserve']}: :green[{reserve_ref:.1f}°]")
-    st.write(f"• {labels['beta']}: :green[{beta_corrige_ref:.1f}°]")
-    st.markdown(f"*{interpretation_ref}*")
+    st.write(f"• {labels['mob']}: :green[{analyse.delta_mesure:.1f}°]")
+    st.write(f"• {labels['crit']}: :green[{analyse.delta_critique_ref:.1f}°]")
+    st.write(f"• {labels['reserve']}: :green[{analyse.reserve_ref:.1f}°]")
+    st.write(f"• {labels['beta']}: :green[{analyse.beta_corrige_ref:.1f}°]")
+    st.markdown(f"*{labels[analyse.interpretation_ref]}*")
 
 with col2:
-    st.markdown("**" + (f"Avec abduction/adduction (γ = {gamma_final:.1f}°)" if langue == "Français" else f"With abduction/adduction (γ = {gamma_final:.1f}°)") + "**")
-    st.write(f"• {labels['mob']}: :green[{delta_mesure:.1f}°]")
-    st.write(f"• {labels['crit']}: :green[{delta_critique_gamma:.1f}°]")
-    st.write(f"• {labels['reserve']}: :green[{reserve_gamma:.1f}°]")
-    st.write(f"• {labels['beta']}: :green[{beta_corrige_gamma:.1f}°]")
-    st.markdown(f"*{interpretation_gamma}*")
+    st.markdown("**" + (f"Avec abduction/adduction (γ = {analyse.gamma_final:.1f}°)" if langue == "Français" else f"With abduction/adduction (γ = {analyse.gamma_final:.1f}°)") + "**")
+    st.write(f"• {labels['mob']}: :green[{analyse.delta_mesure:.1f}°]")
+    st.write(f"• {labels['crit']}: :green[{analyse.delta_critique_gamma:.1f}°]")
+    st.write(f"• {labels['reserve']}: :green[{analyse.reserve_gamma:.1f}°]")
+    st.write(f"• {labels['beta']}: :green[{analyse.beta_corrige_gamma:.1f}°]")
+    st.markdown(f"*{labels[analyse.interpretation_gamma]}*")
 
 # --- Résultats flexion jambe ---
 st.subheader("Résultats flexion jambe" if langue == "Français" else "Leg flexion results")
@@ -262,29 +154,29 @@ reserve_flexion_label = 'Réserve de flexion' if langue == 'Français' else 'Fle
 
 with col3:
     st.markdown("**" + ("Sans abduction/adduction (γ = 0°)" if langue == "Français" else "Without gamma (γ = 0°)") + "**")
-    st.write(f"• {alpha_mesure_label} : :green[{alpha_mesure:.1f}°]")
-    st.write(f"• {alpha_critique_label} : :green[{alpha_critique_sans_gamma:.1f}°]")
-    st.write(f"• {reserve_flexion_label} : :green[{reserve_alpha_sans_gamma:.1f}°]")
-    st.markdown(f"*{interpretation_alpha_sans}*")
+    st.write(f"• {alpha_mesure_label} : :green[{analyse.alpha_mesure:.1f}°]")
+    st.write(f"• {alpha_critique_label} : :green[{analyse.alpha_critique_sans_gamma:.1f}°]")
+    st.write(f"• {reserve_flexion_label} : :green[{analyse.reserve_alpha_sans_gamma:.1f}°]")
+    st.markdown(f"*{labels[analyse.interpretation_alpha_sans]}*")
 
 with col4:
-    st.markdown("**" + (f"Avec abduction/adduction (γ = {gamma_final:.1f}°)" if langue == "Français" else f"With gamma (γ = {gamma_final:.1f}°)") + "**")
-    st.write(f"• {alpha_mesure_label} : :green[{alpha_mesure:.1f}°]")
-    st.write(f"• {alpha_critique_label} : :green[{alpha_critique_avec_gamma:.1f}°]")
-    st.write(f"• {reserve_flexion_label} : :green[{reserve_alpha_avec_gamma:.1f}°]")
-    st.markdown(f"*{interpretation_alpha_avec}*")
+    st.markdown("**" + (f"Avec abduction/adduction (γ = {analyse.gamma_final:.1f}°)" if langue == "Français" else f"With gamma (γ = {analyse.gamma_final:.1f}°)") + "**")
+    st.write(f"• {alpha_mesure_label} : :green[{analyse.alpha_mesure:.1f}°]")
+    st.write(f"• {alpha_critique_label} : :green[{analyse.alpha_critique_avec_gamma:.1f}°]")
+    st.write(f"• {reserve_flexion_label} : :green[{analyse.reserve_alpha_avec_gamma:.1f}°]")
+    st.markdown(f"*{labels[analyse.interpretation_alpha_avec]}*")
 
 # --- Export CSV ---
 
 # --- Export CSV ---
 
 df = pd.DataFrame({
-    "Condition": ["Sans abduction/adduction", f"Avec abduction/adduction = {gamma_final:.1f}°"],
-    labels["mob"]: [delta_mesure, delta_mesure],
-    labels["crit"]: [delta_critique_ref, delta_critique_gamma],
-    labels["reserve"]: [reserve_ref, reserve_gamma],
-    labels["beta"]: [beta_corrige_ref, beta_corrige_gamma],
-    "Interprétation": [interpretation_ref, interpretation_gamma],
+    "Condition": ["Sans abduction/adduction", f"Avec abduction/adduction = {analyse.gamma_final:.1f}°"],
+    labels["mob"]: [analyse.delta_mesure, analyse.delta_mesure],
+    labels["crit"]: [analyse.delta_critique_ref, analyse.delta_critique_gamma],
+    labels["reserve"]: [analyse.reserve_ref, analyse.reserve_gamma],
+    labels["beta"]: [analyse.beta_corrige_ref, analyse.beta_corrige_gamma],
+    "Interprétation": [labels[analyse.interpretation_ref], labels[analyse.interpretation_gamma]],
     labels["patient_name"]: [patient_name, patient_name]
 })
 
@@ -292,70 +184,8 @@ csv = df.to_csv(index=False).encode("utf-8")
 st.download_button(labels["export"], data=csv, file_name="resultats_flexion.csv", mime="text/csv")
 
 if st.button(labels["export_pdf"]):
-    pdf = PDF()
-    pdf.add_page()
-
-    pdf.add_font('DejaVu', '', 'DejaVuSans.ttf', uni=True)
-    pdf.add_font('DejaVu', 'B', 'DejaVuSans-Bold.ttf', uni=True)  # si tu veux le style gras
-    pdf.set_font('DejaVu', '', 12)
-
-    pdf.ln(5)
-    pdf.cell(0, 10, f"{labels['patient_name']}: {patient_name}", ln=1)
-
-    # Grand titre
-    pdf.ln(5)
-    pdf.set_font("DejaVu", "B", 14)
-    pdf.cell(0, 10, labels["results_analysis"], ln=1)
-
-    # Flexion tronc
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.cell(0, 10, ("Flexion du tronc" if langue == "Français" else "Trunk flexion"), ln=1)
-
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.cell(0, 10, f"Sans abduction/adduction (γ = 0°):", ln=1)
-    pdf.set_font("DejaVu", "", 12)
-    pdf.multi_cell(0, 8, f"{labels['mob']}: {delta_mesure:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['crit']}: {delta_critique_ref:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['reserve']}: {reserve_ref:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['beta']}: {beta_corrige_ref:.1f}°")
-    pdf.multi_cell(0, 8, interpretation_ref)
-
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.cell(0, 10, f"Avec abduction/adduction (γ = {gamma_final:.1f}°):", ln=1)
-    pdf.set_font("DejaVu", "", 12)
-    pdf.multi_cell(0, 8, f"{labels['mob']}: {delta_mesure:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['crit']}: {delta_critique_gamma:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['reserve']}: {reserve_gamma:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['beta']}: {beta_corrige_gamma:.1f}°")
-    pdf.multi_cell(0, 8, interpretation_gamma)
-
-    # Flexion jambe
-    pdf.ln(5)
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.cell(0, 10, labels["results_flexion_leg"], ln=1)
-
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.cell(0, 10, f"{labels['without_gamma']}:", ln=1)
-    pdf.set_font("DejaVu", "", 12)
-    pdf.multi_cell(0, 8, f"{labels['alpha_measured']}: {alpha_mesure:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['alpha_crit']}: {alpha_critique_sans_gamma:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['reserve']}: {reserve_alpha_sans_gamma:.1f}°")
-    pdf.multi_cell(0, 8, interpretation_alpha_sans)
-
-    pdf.ln(3)
-    pdf.set_font("DejaVu", "B", 12)
-    pdf.cell(0, 10, f"{labels['with_gamma'].format(gamma=gamma_final)}:", ln=1)
-    pdf.set_font("DejaVu", "", 12)
-    pdf.multi_cell(0, 8, f"{labels['alpha_measured']}: {alpha_mesure:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['alpha_crit']}: {alpha_critique_avec_gamma:.1f}°")
-    pdf.multi_cell(0, 8, f"{labels['reserve']}: {reserve_alpha_avec_gamma:.1f}°")
-    pdf.multi_cell(0, 8, interpretation_alpha_avec)
-
-    pdf_bytes = pdf.output(dest='S').encode('latin-1', 'replace')
+    # Analyse gardée dans st.session_state : le clic ne relance aucun calcul d'angle critique
+    pdf_bytes = rapport_pdf(analyse, patient_name, labels, langue, police=POLICE_UNICODE)
 
     st.download_button(labels["export_pdf"], data=pdf_bytes, file_name="resultats_flexion.pdf", mime="application/pdf")
 
@@ -0,0 +1,47 @@
+"""Calculs de la réserve de flexion, sans dépendance à Streamlit."""
+
+from .geometrie import (
+    BETA_CONFLIT,
+    beta_alpha_vectorise,
+    beta_direction,
+    beta_vectorise,
+    calcul_angle_beta,
+    calcul_angle_beta_alpha,
+    calcul_angle_beta_bascule,
+    calcul_beta_corrige,
+    calcul_reserve,
+    estimer_longueur_col_femoral,
+    signe_col,
+    vecteur_col_abduction,
+    vecteur_col_bascule,
+)
+from .balayage import balayage_gamma, critiques_gamma
+from .carte import carte_reserve
+from .cohorte import COLONNES_ENTREE, COLONNES_SORTIE, ajouter_resultats, analyser_cohorte, analyser_lot
+from .incertitude import ECARTS_TYPES, propagation_incertitude
+from .interpretation import (
+    ENTREE_INVALIDE,
+    LIBELLES,
+    LIBELLES_TIRET,
+    interpretation_alpha,
+    interpretation_alpha_lot,
+    interpretation_clinique,
+    interpretation_clinique_lot,
+)
+from .parallele import analyser_cohorte_parallele, analyser_lot_parallele
+from .sensibilite import PARAMETRES, PERTURBATIONS, analyse_sensibilite
+from .recommandation import av_minimale_jambe, av_minimale_tronc, recommander_anteversion
+from .solveurs import (
+    ALPHA_SANS_CONFLIT,
+    DELTA_SANS_CONFLIT,
+    GRILLE_ALPHA,
+    GRILLE_DELTA,
+    SolutionCritique,
+    calcul_alpha_critique,
+    calcul_alpha_critique_sans_gamma,
+    calcul_delta_critique,
+    resoudre_alpha_critique,
+    resoudre_alpha_critique_lot,
+    resoudre_delta_critique,
+    resoudre_delta_critique_lot,
+)
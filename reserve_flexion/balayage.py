@@ -0,0 +1,42 @@
+"""Angles critiques pour toute la plage du curseur γ.
+
+Pour un jeu de paramètres fémoraux et cotyloïdiens, les 91 valeurs du
+curseur (γ de −45 à 45°, pas de 1°) sont résolues en un appel de chaque
+solveur par lots ; déplacer le curseur revient ensuite à lire une case des
+tableaux. Les solveurs par lots reçoivent l'offset saisi, comme les clés
+de cache.py : une valeur lue dans le balayage est celle que donneraient
+delta_critique_cache et alpha_critique_cache (et les solveurs scalaires).
+"""
+import numpy as np
+
+from .cache import _cle
+from .carte import GRILLE_GAMMA, _axe
+from .solveurs import resoudre_alpha_critique_lot, resoudre_delta_critique_lot
+
+
+def balayage_gamma(tf, ccd, offset, anteversion, seuil_beta_corrige=10, grille_gamma=GRILLE_GAMMA):
+    """δ critique (tronc) et α critique (jambe) pour chaque γ de la grille.
+
+    `grille_gamma` est un triplet (début, fin, pas). Renvoie un dict de
+    tableaux en lecture seule : "gamma", "delta_critique", "alpha_critique".
+    """
+    tf, ccd, offset, anteversion, seuil_beta_corrige = (
+        _cle(x) for x in (tf, ccd, offset, anteversion, seuil_beta_corrige))
+    gamma = _axe(*grille_gamma)
+    balayage = {
+        "gamma": gamma,
+        "delta_critique": resoudre_delta_critique_lot(ccd, tf, gamma, offset, anteversion, seuil_beta_corrige).arrondi,
+        "alpha_critique": resoudre_alpha_critique_lot(tf, ccd, offset, anteversion, gamma, seuil_beta_corrige).arrondi,
+    }
+    for tableau in balayage.values():
+        tableau.flags.writeable = False
+    return balayage
+
+
+def critiques_gamma(balayage, gamma):
+    """(δ critique, α critique) lus dans le balayage, ou None si γ n'est pas sur la grille."""
+    grille = balayage["gamma"]
+    i = int(np.searchsorted(grille, _cle(gamma)))
+    if i == len(grille) or grille[i] != _cle(gamma):
+        return None
+    return float(balayage["delta_critique"][i]), float(balayage["alpha_critique"][i])
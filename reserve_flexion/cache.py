@@ -0,0 +1,57 @@
+"""Cache des angles critiques, commun à tout le processus.
+
+Streamlit réexécute le script à chaque interaction mais n'importe les
+modules qu'une fois par processus : ces caches sont donc partagés entre
+toutes les sessions. Les clés sont les valeurs saisies elles-mêmes
+(converties en float, sans arrondi) : un résultat mémorisé est toujours
+celui de calcul_delta_critique / calcul_alpha_critique pour ces valeurs.
+
+L'offset reste dans la clé : β n'en dépend pas mathématiquement (voir
+signe_col), mais dans les cas d'égalité β corrigé = seuil sur un point
+de grille, c'est l'arrondi du calcul avec l'offset réel qui tranche, et un
+arrondi des autres paramètres suffit à déplacer le conflit.
+"""
+from functools import lru_cache
+
+from .solveurs import calcul_alpha_critique, calcul_delta_critique
+
+TAILLE_CACHE = 4096
+
+
+def _cle(valeur):
+    # 20, np.float64(20.0) et 20.0 : une seule clé
+    return float(valeur)
+
+
+@lru_cache(maxsize=TAILLE_CACHE)
+def _delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige):
+    return calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige, methode="analytique")
+
+@lru_cache(maxsize=TAILLE_CACHE)
+def _alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige):
+    return calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige,
+                                 methode="analytique")
+
+
+def delta_critique_cache(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
+    """calcul_delta_critique mémorisé sur (CCD, TF, γ, offset, AV, seuil)."""
+    return _delta_critique(_cle(ccd_deg), _cle(tf_deg), _cle(gamma_deg), _cle(offset_mm), _cle(av_deg),
+                           _cle(seuil_beta_corrige))
+
+def alpha_critique_cache(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10):
+    """calcul_alpha_critique mémorisé sur (TF, CCD, offset, AV, γ, seuil)."""
+    return _alpha_critique(_cle(tf_deg), _cle(ccd_deg), _cle(offset_mm), _cle(av_cotyle_deg), _cle(gamma_deg),
+                           _cle(seuil_beta_corrige))
+
+
+def statistiques_cache():
+    """Succès, échecs et taille de chaque cache."""
+    return {
+        nom: {"succes": info.hits, "echecs": info.misses, "taille": info.currsize, "taille_max": info.maxsize}
+        for nom, info in (("delta_critique", _delta_critique.cache_info()),
+                          ("alpha_critique", _alpha_critique.cache_info()))
+    }
+
+def vider_cache():
+    _delta_critique.cache_clear()
+    _alpha_critique.cache_clear()
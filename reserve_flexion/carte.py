@@ -0,0 +1,57 @@
+"""Cartes des réserves de flexion sur une grille AV × γ.
+
+Toute la grille est résolue en un appel de chaque solveur par lots
+(diffusion NumPy AV[:, None] × γ[None, :]) ; les angles critiques sont
+gardés en cache pour que l'affichage reste interactif.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .solveurs import resoudre_alpha_critique_lot, resoudre_delta_critique_lot
+
+# Grille par défaut : AV de −10 à 50° (61 valeurs), γ de −45 à 45° (91 valeurs, celles du curseur)
+GRILLE_AV = (-10.0, 50.0, 1.0)
+GRILLE_GAMMA = (-45.0, 45.0, 1.0)
+
+
+def _axe(debut, fin, pas):
+    """Valeurs de debut à fin incluse, au pas donné."""
+    return np.round(np.linspace(debut, fin, int(round((fin - debut) / pas)) + 1), 6)
+
+
+@lru_cache(maxsize=32)
+def _critiques_grille(tf, ccd, offset, grille_av, grille_gamma, seuil_beta_corrige):
+    """Axes et angles critiques (δ, α) de la grille AV × γ, en lecture seule."""
+    av = _axe(*grille_av)
+    gamma = _axe(*grille_gamma)
+    delta_critique = resoudre_delta_critique_lot(ccd, tf, gamma[None, :], offset, av[:, None],
+                                                 seuil_beta_corrige).arrondi
+    alpha_critique = resoudre_alpha_critique_lot(tf, ccd, offset, av[:, None], gamma[None, :],
+                                                 seuil_beta_corrige).arrondi
+    for tableau in (av, gamma, delta_critique, alpha_critique):
+        tableau.flags.writeable = False
+    return av, gamma, delta_critique, alpha_critique
+
+
+def carte_reserve(tf, ccd, offset, delta_mesure, alpha_mesure, grille_av=GRILLE_AV, grille_gamma=GRILLE_GAMMA,
+                  seuil_beta_corrige=10):
+    """Réserves du tronc et de la jambe sur la grille AV × γ.
+
+    `grille_av` et `grille_gamma` sont des triplets (début, fin, pas).
+    Renvoie un dict de tableaux en lecture seule : "anteversion", "gamma"
+    (axes) et "delta_critique", "reserve_tronc", "alpha_critique",
+    "reserve_jambe" de forme (len(anteversion), len(gamma)). Seuls les
+    angles critiques sont en cache : changer δ ou α mesuré ne coûte
+    qu'une soustraction.
+    """
+    av, gamma, delta_critique, alpha_critique = _critiques_grille(
+        tf, ccd, offset, tuple(grille_av), tuple(grille_gamma), seuil_beta_corrige)
+    reserve_tronc = delta_critique - delta_mesure
+    reserve_jambe = alpha_critique - alpha_mesure
+    reserve_tronc.flags.writeable = reserve_jambe.flags.writeable = False
+    return {
+        "anteversion": av, "gamma": gamma,
+        "delta_critique": delta_critique, "reserve_tronc": reserve_tronc,
+        "alpha_critique": alpha_critique, "reserve_jambe": reserve_jambe,
+    }
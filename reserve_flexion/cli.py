@@ -0,0 +1,129 @@
+"""Traitement par lots d'un fichier CSV de patients, sans Streamlit.
+
+    python -m reserve_flexion patients.csv resultats.csv [--langue English]
+"""
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import pandas as pd
+
+from .cohorte import COLONNES_ENTREE, analyser_lot
+from .export import tableau_export
+from .parallele import recoller, soumettre_blocs
+from .solveurs import _lignes_invalides
+
+# Blocs lus en cours de calcul en parallèle, en plus de celui qui est écrit
+LOTS_EN_VOL = 2
+
+# Lignes invalides citées par bloc dans le journal
+LIGNES_CITEES = 10
+
+
+def _entrees_bloc(bloc, colonnes):
+    """Entrées d'un bloc lu et masque de ses lignes invalides (entrée manquante, non numérique ou non finie)."""
+    manquantes = [colonnes[nom] for nom in COLONNES_ENTREE if colonnes[nom] not in bloc]
+    if manquantes:
+        raise ValueError(f"colonnes absentes du fichier : {', '.join(manquantes)}")
+    entrees = [pd.to_numeric(bloc[colonnes[nom]], errors="coerce").to_numpy(dtype=float) for nom in COLONNES_ENTREE]
+    return entrees, _lignes_invalides(*entrees)
+
+
+def traiter_csv(entree, sortie, langue="Français", seuil_beta_corrige=10, taille_lot=100_000,
+                colonnes=None, colonne_nom="patient_name", journal=sys.stderr, processus=1, taille_bloc=None):
+    """Lit `entree` par blocs de `taille_lot` lignes et écrit le tableau d'export dans `sortie`.
+
+    Avec `processus` > 1, chaque bloc lu est recoupé en sous-blocs de
+    `taille_bloc` patients (par défaut taille_lot / processus, pour occuper
+    tous les processus) calculés en parallèle. Jusqu'à LOTS_EN_VOL blocs
+    lus sont en calcul pendant que le processus principal lit le suivant
+    et écrit les résultats, dans l'ordre du fichier.
+
+    Les lignes dont une entrée est manquante, non numérique ou non finie
+    sont écrites avec l'interprétation « entrée invalide », comptées et
+    citées dans `journal`. Renvoie le nombre de patients traités.
+    """
+    for nom, valeur in (("processus", processus), ("taille_lot", taille_lot), ("taille_bloc", taille_bloc)):
+        if valeur is not None and valeur < 1:
+            raise ValueError(f"{nom} doit être au moins 1 (reçu {valeur})")
+    colonnes = {nom: nom for nom in COLONNES_ENTREE} | dict(colonnes or {})
+    taille_bloc = taille_bloc or max(1, -(-taille_lot // processus))
+    total = invalides = 0
+    debut = time.perf_counter()
+    pool = ProcessPoolExecutor(processus) if processus > 1 else nullcontext()
+    en_vol = deque()
+
+    def ecrire(bloc, r):
+        nonlocal total
+        noms = bloc[colonne_nom] if colonne_nom in bloc else bloc.index
+        tableau = tableau_export(r, noms, pd.to_numeric(bloc[colonnes["gamma_final"]], errors="coerce"), langue)
+        tableau.to_csv(f, index=False, header=total == 0)
+        total += len(bloc)
+        duree = time.perf_counter() - debut
+        if journal is not None:
+            print(f"{total} patients ({invalides} entrées invalides), {total / duree:.0f} patients/s", file=journal)
+
+    def signaler(bloc, invalide):
+        nonlocal invalides
+        if not invalide.any():
+            return
+        invalides += int(invalide.sum())
+        if journal is not None:
+            lignes = [str(i + 2) for i in bloc.index[invalide][:LIGNES_CITEES]]  # + en-tête, numérotées depuis 1
+            suite = ", …" if invalide.sum() > LIGNES_CITEES else ""
+            print(f"entrée manquante ou non finie, ligne(s) {', '.join(lignes)}{suite}", file=journal)
+
+    with pool, open(sortie, "w", encoding="utf-8", newline="") as f:
+        for bloc in pd.read_csv(entree, chunksize=taille_lot):
+            entrees, invalide = _entrees_bloc(bloc, colonnes)
+            signaler(bloc, invalide)
+            if processus > 1:
+                en_vol.append((bloc, soumettre_blocs(pool, entrees, seuil_beta_corrige, taille_bloc)))
+                if len(en_vol) > LOTS_EN_VOL:
+                    bloc, futures = en_vol.popleft()
+                    ecrire(bloc, recoller(futures))
+            else:
+                ecrire(bloc, analyser_lot(*entrees, seuil_beta_corrige=seuil_beta_corrige))
+        while en_vol:
+            bloc, futures = en_vol.popleft()
+            ecrire(bloc, recoller(futures))
+    return total
+
+
+def _entier_positif(valeur):
+    n = int(valeur)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"attendu un entier ≥ 1 (reçu {valeur})")
+    return n
+
+
+def _colonne(valeur):
+    nom, _, colonne_csv = valeur.partition("=")
+    if nom not in COLONNES_ENTREE or not colonne_csv:
+        raise argparse.ArgumentTypeError(f"attendu NOM=COLONNE avec NOM parmi {', '.join(COLONNES_ENTREE)}")
+    return nom, colonne_csv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reserve_flexion", description=__doc__.splitlines()[0])
+    parser.add_argument("entree", help="CSV des patients (colonnes : " + ", ".join(COLONNES_ENTREE) + ")")
+    parser.add_argument("sortie", help="CSV des résultats, même présentation que l'export de l'application")
+    parser.add_argument("--langue", choices=("Français", "English"), default="Français")
+    parser.add_argument("--seuil", type=float, default=10, help="seuil de β corrigé (°)")
+    parser.add_argument("--taille-lot", type=_entier_positif, default=100_000, help="patients lus par bloc")
+    parser.add_argument("--processus", type=_entier_positif, default=1, help="processus de calcul (défaut : 1)")
+    parser.add_argument("--taille-bloc", type=_entier_positif,
+                        help="patients par tâche en parallèle (défaut : taille-lot / processus)")
+    parser.add_argument("--colonne", type=_colonne, action="append", default=[], metavar="NOM=COLONNE",
+                        help="nom de colonne du fichier pour une entrée (répétable)")
+    parser.add_argument("--colonne-nom", default="patient_name", help="colonne du nom du patient")
+    args = parser.parse_args(argv)
+    traiter_csv(args.entree, args.sortie, args.langue, args.seuil, args.taille_lot,
+                dict(args.colonne), args.colonne_nom, processus=args.processus, taille_bloc=args.taille_bloc)
+
+
+if __name__ == "__main__":
+    main()
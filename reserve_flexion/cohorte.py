@@ -0,0 +1,93 @@
+import numpy as np
+
+from .geometrie import BETA_CONFLIT, beta_vectorise, calcul_angle_beta, calcul_beta_corrige, calcul_reserve
+from .interpretation import ENTREE_INVALIDE, LIBELLES, interpretation_alpha_lot, interpretation_clinique_lot
+from .solveurs import (
+    _TOLERANCE_REEVALUATION,
+    _lignes_invalides,
+    resoudre_alpha_critique_lot,
+    resoudre_delta_critique_lot,
+)
+
+# Colonnes d'entrée attendues (noms des variables des scripts Streamlit)
+COLONNES_ENTREE = (
+    "tf", "ccd", "offset", "anteversion", "version_debout", "version_assis", "alpha_mesure", "gamma_final",
+)
+
+# Colonnes ajoutées, dans l'ordre de l'affichage de l'application
+COLONNES_SORTIE = (
+    "delta_mesure",
+    "delta_critique_ref", "reserve_ref", "beta_corrige_ref", "interpretation_ref",
+    "delta_critique_gamma", "reserve_gamma", "beta_corrige_gamma", "interpretation_gamma",
+    "alpha_critique_sans_gamma", "reserve_alpha_sans_gamma", "interpretation_alpha_sans",
+    "alpha_critique_avec_gamma", "reserve_alpha_avec_gamma", "interpretation_alpha_avec",
+)
+
+
+def _beta_corrige_lot(ccd, tf, delta, gamma, offset, av):
+    """β corrigé à δ mesuré ; les valeurs au ras de BETA_CONFLIT sont reprises
+    avec calcul_angle_beta pour que l'interprétation soit celle des scripts."""
+    beta_corrige = calcul_beta_corrige(beta_vectorise(ccd, tf, delta, gamma, offset), av)
+    for i in np.flatnonzero(np.abs(beta_corrige - BETA_CONFLIT) <= _TOLERANCE_REEVALUATION):
+        beta_corrige[i] = calcul_beta_corrige(calcul_angle_beta(ccd[i], tf[i], delta[i], gamma[i], offset[i]), av[i])
+    return beta_corrige
+
+
+def analyser_lot(tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final,
+                 seuil_beta_corrige=10):
+    """Tous les résultats de l'application pour des tableaux de patients (dict de tableaux).
+
+    Une ligne dont une entrée est manquante ou non finie donne des angles,
+    réserves et β NaN et l'interprétation ENTREE_INVALIDE.
+    """
+    tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final = (
+        np.array(x, dtype=float) for x in np.broadcast_arrays(
+            tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final))
+    zero = np.zeros_like(tf)
+    r = {"delta_mesure": version_assis - version_debout}
+
+    for suffixe, gamma in (("ref", zero), ("gamma", gamma_final)):
+        delta_critique = resoudre_delta_critique_lot(ccd, tf, gamma, offset, anteversion, seuil_beta_corrige).arrondi
+        reserve = calcul_reserve(delta_critique, r["delta_mesure"])
+        beta_corrige = _beta_corrige_lot(ccd, tf, r["delta_mesure"], gamma, offset, anteversion)
+        r[f"delta_critique_{suffixe}"] = delta_critique
+        r[f"reserve_{suffixe}"] = reserve
+        r[f"beta_corrige_{suffixe}"] = beta_corrige
+        r[f"interpretation_{suffixe}"] = interpretation_clinique_lot(delta_critique, reserve, beta_corrige)
+
+    for suffixe, gamma in (("sans", zero), ("avec", gamma_final)):
+        alpha_critique = resoudre_alpha_critique_lot(tf, ccd, offset, anteversion, gamma, seuil_beta_corrige).arrondi
+        r[f"alpha_critique_{suffixe}_gamma"] = alpha_critique
+        r[f"reserve_alpha_{suffixe}_gamma"] = alpha_critique - alpha_mesure
+        r[f"interpretation_alpha_{suffixe}"] = interpretation_alpha_lot(alpha_critique)
+
+    # Une entrée manquante ou non finie invalide toute la ligne
+    invalide = _lignes_invalides(tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure,
+                                 gamma_final)
+    if invalide.any():
+        for nom in COLONNES_SORTIE[1:]:
+            r[nom][invalide] = ENTREE_INVALIDE if nom.startswith("interpretation") else np.nan
+    return r
+
+
+def analyser_cohorte(df, seuil_beta_corrige=10, langue=None, colonnes=None):
+    """Copie de `df` complétée des colonnes COLONNES_SORTIE.
+
+    `colonnes` associe éventuellement les noms de COLONNES_ENTREE à ceux du
+    fichier ; `langue` ("Français" / "English") remplace les clés
+    d'interprétation par leurs libellés.
+    """
+    colonnes = {nom: nom for nom in COLONNES_ENTREE} | dict(colonnes or {})
+    r = analyser_lot(*(df[colonnes[nom]].to_numpy(dtype=float) for nom in COLONNES_ENTREE),
+                     seuil_beta_corrige=seuil_beta_corrige)
+    return ajouter_resultats(df, r, langue)
+
+
+def ajouter_resultats(df, r, langue=None):
+    """Copie de `df` avec les résultats `r` de analyser_lot en colonnes."""
+    resultat = df.copy()
+    for nom in COLONNES_SORTIE:
+        resultat[nom] = r[nom]
+        if langue is not None and nom.startswith("interpretation"):
+            resultat[nom] = resultat[nom].map(LIBELLES[langue])
+    return resultat
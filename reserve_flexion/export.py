@@ -0,0 +1,44 @@
+"""Tableau d'export CSV de l'application ; pandas n'est importé qu'à l'appel."""
+import numpy as np
+
+from .interpretation import LIBELLES
+
+CONDITIONS = (
+    "Sans abduction/adduction (tronc)",
+    "Avec abduction/adduction = {gamma:.1f}° (tronc)",
+    "Sans abduction/adduction (jambe)",
+    "Avec abduction/adduction = {gamma:.1f}° (jambe)",
+)
+
+
+def _entrelacer(*colonnes, dtype=None):
+    """Quatre colonnes par patient -> une colonne de 4 lignes par patient."""
+    return np.column_stack([np.asarray(c, dtype=dtype) for c in colonnes]).ravel()
+
+
+def tableau_export(r, noms_patients, gamma_final, langue="Français"):
+    """Tableau CSV de l'application (4 lignes par patient) à partir des résultats de analyser_lot."""
+    import pandas as pd
+
+    labels = LIBELLES[langue]
+    gamma = pd.Series(np.asarray(gamma_final, dtype=float))
+    vide = np.full(len(gamma), "", dtype=object)
+    interpretations = [pd.Series(r[nom]).map(labels).to_numpy(dtype=object) for nom in (
+        "interpretation_ref", "interpretation_gamma", "interpretation_alpha_sans", "interpretation_alpha_avec")]
+    return pd.DataFrame({
+        "Condition": _entrelacer(
+            np.full(len(gamma), CONDITIONS[0], dtype=object),
+            gamma.map(lambda g: CONDITIONS[1].format(gamma=g)),
+            np.full(len(gamma), CONDITIONS[2], dtype=object),
+            gamma.map(lambda g: CONDITIONS[3].format(gamma=g)),
+            dtype=object,
+        ),
+        labels["mob"]: _entrelacer(r["delta_mesure"], r["delta_mesure"], vide, vide, dtype=object),
+        labels["crit"]: _entrelacer(r["delta_critique_ref"], r["delta_critique_gamma"],
+                                    r["alpha_critique_sans_gamma"], r["alpha_critique_avec_gamma"]),
+        labels["reserve"]: _entrelacer(r["reserve_ref"], r["reserve_gamma"],
+                                       r["reserve_alpha_sans_gamma"], r["reserve_alpha_avec_gamma"]),
+        labels["beta"]: _entrelacer(r["beta_corrige_ref"], r["beta_corrige_gamma"], vide, vide, dtype=object),
+        "Interprétation": _entrelacer(*interpretations, dtype=object),
+        labels["patient_name"]: np.repeat(np.asarray(noms_patients, dtype=object), 4),
+    })
@@ -0,0 +1,182 @@
+import math
+
+import numpy as np
+
+# --- Constantes ---
+BETA_CONFLIT = 10  # seuil de conflit (°)
+
+
+# --- Fonctions de référence (une valeur à la fois, identiques aux scripts) ---
+def estimer_longueur_col_femoral(offset_mm, ccd_deg):
+    ccd_rad = np.radians(ccd_deg)
+    return offset_mm / np.sin(ccd_rad)
+
+def vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+    theta = np.pi - np.radians(ccd_deg + gamma_deg)
+    delta = np.radians(delta_deg)
+    tf = np.radians(tf_deg)
+    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
+    ux = np.sin(theta) * long_col
+    uy = (-np.cos(delta) * np.cos(theta) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
+    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
+    return np.array([ux, uy, uz])
+
+def calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+    if _scalaires(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+        try:
+            return _beta_scalaire(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
+        except (ZeroDivisionError, ValueError):
+            pass  # CCD ou offset dégénéré, valeur infinie : NumPy renvoie nan/inf sans exception
+    u = vecteur_col_abduction(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
+    ux, uz = u[0], u[2]
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    cos_beta = ux / norme_proj
+    beta_rad = np.arccos(cos_beta)
+    return np.degrees(beta_rad)
+
+def calcul_beta_corrige(beta_deg, av_deg):
+    return beta_deg + av_deg
+
+def calcul_reserve(delta_critique, delta_mesuree):
+    return delta_critique - delta_mesuree
+
+def calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
+    if _scalaires(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg):
+        try:
+            return _beta_alpha_scalaire(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg)
+        except (ZeroDivisionError, ValueError):
+            pass
+    ccd_rad = np.radians(ccd_deg)
+    tf_rad = np.radians(tf_deg)
+    alpha_rad = np.radians(alpha_deg)
+    gamma_rad = np.radians(gamma_deg)
+    long_col = offset_mm / np.sin(ccd_rad)
+
+    ux = np.sin(math.pi - ccd_rad + gamma_rad) * long_col
+    uy = -np.cos(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col - np.sin(alpha_rad) * np.sin(tf_rad) * long_col
+    uz = -np.sin(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col + np.cos(alpha_rad) * np.sin(tf_rad) * long_col
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    cos_beta = ux / norme_proj
+    beta_rad = np.arccos(cos_beta)
+    return np.degrees(beta_rad)
+
+
+# --- Noyau scalaire (module math, sans tableau temporaire) ---
+# Choisi automatiquement par calcul_angle_beta / calcul_angle_beta_alpha
+# quand tous les arguments sont des nombres Python : mêmes opérations dans
+# le même ordre, sin, cos, sqrt et radians de math donnant les mêmes
+# flottants que NumPy. Seul arccos reste celui de NumPy (math.acos diffère
+# d'un ulp dans environ 10 % des cas) : le résultat est identique bit à bit.
+_SCALAIRES = (int, float)
+_arccos = np.arccos
+
+def _scalaires(*valeurs):
+    for valeur in valeurs:
+        if not isinstance(valeur, _SCALAIRES):
+            return False
+    return True
+
+def _beta_scalaire(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+    theta = math.pi - math.radians(ccd_deg + gamma_deg)
+    delta = math.radians(delta_deg)
+    tf = math.radians(tf_deg)
+    long_col = offset_mm / math.sin(math.radians(ccd_deg))
+    ux = math.sin(theta) * long_col
+    uz = (-math.sin(delta) * math.cos(theta) * long_col) + (math.cos(delta) * math.sin(tf) * long_col)
+    norme_proj = math.sqrt(ux**2 + uz**2)
+    return math.degrees(_arccos(ux / norme_proj))
+
+def _beta_alpha_scalaire(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
+    ccd_rad = math.radians(ccd_deg)
+    tf_rad = math.radians(tf_deg)
+    alpha_rad = math.radians(alpha_deg)
+    gamma_rad = math.radians(gamma_deg)
+    long_col = offset_mm / math.sin(ccd_rad)
+    angle_col = math.pi - ccd_rad + gamma_rad
+    ux = math.sin(angle_col) * long_col
+    uz = -math.sin(alpha_rad) * math.cos(angle_col) * long_col + math.cos(alpha_rad) * math.sin(tf_rad) * long_col
+    norme_proj = math.sqrt(ux**2 + uz**2)
+    return math.degrees(_arccos(ux / norme_proj))
+
+
+# --- Variante « bascule » (app.py) ---
+# Sans γ, et avec +cos(δ) dans uy au lieu de −cos(δ) : uy n'entrant pas dans
+# β, calcul_angle_beta_bascule(ccd, tf, δ, offset) est exactement
+# calcul_angle_beta(ccd, tf, δ, 0, offset), et δ critique s'obtient avec
+# calcul_delta_critique(..., gamma_deg=0, ...). Seul le vecteur diffère ;
+# les scripts choisissent la variante par la fonction qu'ils importent.
+def vecteur_col_bascule(ccd_deg, tf_deg, delta_deg, long_col):
+    CCD = np.radians(ccd_deg)
+    tf = np.radians(tf_deg)
+    delta = np.radians(delta_deg)
+    ux = np.sin(math.pi - CCD) * long_col
+    uy = (np.cos(delta) * np.cos(math.pi - CCD) * long_col) - (np.sin(delta) * np.sin(tf) * long_col)
+    uz = (-np.sin(delta) * np.cos(math.pi - CCD) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
+    return np.array([ux, uy, uz])
+
+def calcul_angle_beta_bascule(ccd_deg, tf_deg, delta_deg, offset_mm):
+    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
+    u = vecteur_col_bascule(ccd_deg, tf_deg, delta_deg, long_col)
+    ux, uz = u[0], u[2]
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    cos_beta = ux / norme_proj
+    beta_rad = np.arccos(cos_beta)
+    return np.degrees(beta_rad)
+
+
+# --- Versions vectorisées (tableaux NumPy, diffusion entre tous les arguments) ---
+# Mêmes formules et même ordre d'opérations que ci-dessus ; seule la composante
+# uy, qui n'intervient pas dans β, n'est pas calculée.
+def beta_vectorise(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm):
+    """β (°) pour des tableaux de paramètres, équivalent de calcul_angle_beta."""
+    theta = np.pi - np.radians(np.add(ccd_deg, gamma_deg))
+    delta = np.radians(delta_deg)
+    tf = np.radians(tf_deg)
+    long_col = estimer_longueur_col_femoral(offset_mm, ccd_deg)
+    ux = np.sin(theta) * long_col
+    uz = (-np.sin(delta) * np.cos(theta) * long_col) + (np.cos(delta) * np.sin(tf) * long_col)
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    return np.degrees(np.arccos(ux / norme_proj))
+
+def beta_alpha_vectorise(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg=0):
+    """β (°) pour des tableaux de paramètres, équivalent de calcul_angle_beta_alpha."""
+    ccd_rad = np.radians(ccd_deg)
+    tf_rad = np.radians(tf_deg)
+    alpha_rad = np.radians(alpha_deg)
+    gamma_rad = np.radians(gamma_deg)
+    long_col = offset_mm / np.sin(ccd_rad)
+
+    ux = np.sin(math.pi - ccd_rad + gamma_rad) * long_col
+    uz = -np.sin(alpha_rad) * np.cos(math.pi - ccd_rad + gamma_rad) * long_col + np.cos(alpha_rad) * np.sin(tf_rad) * long_col
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    return np.degrees(np.arccos(ux / norme_proj))
+
+
+# --- Invariance par l'offset ---
+# long_col multiplie les trois composantes du vecteur du col : β ne dépend
+# de l'offset que par le signe de long_col (positif pour tout offset > 0 et
+# 0° < CCD < 180°). Les calculs d'angles peuvent donc se faire sur la
+# direction unitaire du col (beta_direction).
+def signe_col(offset_mm, ccd_deg):
+    """Signe de la longueur du col : 1.0 ou -1.0 (0.0 / nan si β n'est pas défini)."""
+    if _scalaires(offset_mm, ccd_deg):
+        try:
+            long_col = offset_mm / math.sin(math.radians(ccd_deg))
+            return 1.0 if long_col > 0 else -1.0 if long_col < 0 else 0.0 if long_col == 0 else math.nan
+        except (ZeroDivisionError, ValueError):
+            pass
+    return np.sign(estimer_longueur_col_femoral(offset_mm, ccd_deg))
+
+def beta_direction(angle_col_deg, tf_deg, angle_deg, signe=1.0):
+    """β (°) calculé sur la direction unitaire du col, sans offset ni longueur du col.
+
+    angle_col_deg vaut CCD + γ en flexion du tronc (angle_deg = δ) et CCD − γ
+    en flexion de la jambe (angle_deg = α) ; `signe` est signe_col(offset, CCD).
+    """
+    theta = np.pi - np.radians(angle_col_deg)
+    x = np.radians(angle_deg)
+    tf = np.radians(tf_deg)
+    ux = np.sin(theta) * signe
+    uz = ((-np.sin(x) * np.cos(theta)) + (np.cos(x) * np.sin(tf))) * signe
+    norme_proj = np.sqrt(ux**2 + uz**2)
+    return np.degrees(np.arccos(ux / norme_proj))
@@ -0,0 +1,127 @@
+"""Graphe de calcul des résultats d'une analyse, recalculé par morceaux.
+
+Chaque grandeur de SORTIES est un nœud qui dépend explicitement des
+entrées (ENTREES) ou d'autres nœuds ; sa valeur est mémorisée jusqu'à ce
+qu'une de ses dépendances change. Modifier une entrée n'invalide que les
+nœuds en aval : l'alpha mesuré ne touche que reserve_alpha_*, les versions
+debout / assis que delta_mesure, les réserves du tronc et β corrigé.
+
+Les angles critiques du tronc et de la jambe à γ donné forment un seul
+nœud (critiques_ref à γ = 0, critiques_gamma à γ final), de sorte que
+alpha_critique_sans_gamma et le α critique à γ = 0 sont un même calcul ; à
+γ final nul, critiques_gamma reprend critiques_ref sans appeler de solveur.
+"""
+from collections import Counter
+
+from .balayage import balayage_gamma
+from .geometrie import calcul_angle_beta, calcul_beta_corrige, calcul_reserve
+from .interpretation import interpretation_alpha, interpretation_clinique
+from .resultat import ENTREES, SORTIES, AnalyseFlexion, _critiques
+
+_FEMUR_COTYLE = ("tf", "ccd", "offset", "anteversion", "seuil_beta_corrige")
+
+
+def _critiques_gamma(tf, ccd, offset, anteversion, seuil_beta_corrige, balayage, gamma_final, critiques_ref):
+    if gamma_final == 0:
+        return critiques_ref
+    return _critiques(tf, ccd, offset, anteversion, gamma_final, seuil_beta_corrige, balayage)
+
+
+def _beta_corrige(ccd, tf, delta_mesure, gamma, offset, anteversion):
+    return calcul_beta_corrige(calcul_angle_beta(ccd, tf, delta_mesure, gamma, offset), anteversion)
+
+
+# nom : (dépendances, fonction des valeurs des dépendances dans l'ordre)
+NOEUDS = {
+    "balayage": (_FEMUR_COTYLE, lambda *parametres: None),
+    "critiques_ref": (_FEMUR_COTYLE + ("balayage",),
+                      lambda tf, ccd, offset, av, seuil, balayage: _critiques(tf, ccd, offset, av, 0.0, seuil, balayage)),
+    "critiques_gamma": (_FEMUR_COTYLE + ("balayage", "gamma_final", "critiques_ref"), _critiques_gamma),
+
+    "delta_mesure": (("version_debout", "version_assis"), lambda debout, assis: assis - debout),
+
+    "delta_critique_ref": (("critiques_ref",), lambda critiques: critiques[0]),
+    "reserve_ref": (("delta_critique_ref", "delta_mesure"), calcul_reserve),
+    "beta_corrige_ref": (("ccd", "tf", "delta_mesure", "offset", "anteversion"),
+                         lambda ccd, tf, delta, offset, av: _beta_corrige(ccd, tf, delta, 0.0, offset, av)),
+    "interpretation_ref": (("delta_critique_ref", "reserve_ref", "beta_corrige_ref"), interpretation_clinique),
+
+    "delta_critique_gamma": (("critiques_gamma",), lambda critiques: critiques[0]),
+    "reserve_gamma": (("delta_critique_gamma", "delta_mesure"), calcul_reserve),
+    "beta_corrige_gamma": (("ccd", "tf", "delta_mesure", "gamma_final", "offset", "anteversion"), _beta_corrige),
+    "interpretation_gamma": (("delta_critique_gamma", "reserve_gamma", "beta_corrige_gamma"), interpretation_clinique),
+
+    "alpha_critique_sans_gamma": (("critiques_ref",), lambda critiques: critiques[1]),
+    "reserve_alpha_sans_gamma": (("alpha_critique_sans_gamma", "alpha_mesure"), lambda critique, mesure: critique - mesure),
+    "interpretation_alpha_sans": (("alpha_critique_sans_gamma",), interpretation_alpha),
+
+    "alpha_critique_avec_gamma": (("critiques_gamma",), lambda critiques: critiques[1]),
+    "reserve_alpha_avec_gamma": (("alpha_critique_avec_gamma", "alpha_mesure"), lambda critique, mesure: critique - mesure),
+    "interpretation_alpha_avec": (("alpha_critique_avec_gamma",), interpretation_alpha),
+}
+
+
+class GrapheAnalyse:
+    """Analyse d'un patient recalculée nœud par nœud.
+
+    Avec balayage=True, les angles critiques sont lus dans balayage_gamma
+    (toute la plage du curseur γ, recalculée seulement si TF, CCD, offset,
+    AV ou seuil changent). `evaluations` compte les calculs de chaque nœud.
+    """
+
+    def __init__(self, balayage=False):
+        self._noeuds = dict(NOEUDS)
+        if balayage:
+            self._noeuds["balayage"] = (_FEMUR_COTYLE, balayage_gamma)
+        self._aval = {nom: [] for nom in ENTREES + tuple(self._noeuds)}
+        for nom, (dependances, _) in self._noeuds.items():
+            for dependance in dependances:
+                self._aval[dependance].append(nom)
+        self._valeurs = {"seuil_beta_corrige": 10}
+        self._analyse = None
+        self.evaluations = Counter()
+
+    def modifier(self, **entrees):
+        """Change des entrées ; seuls les nœuds en aval d'une valeur différente sont invalidés."""
+        for nom, valeur in entrees.items():
+            if nom not in ENTREES:
+                raise KeyError(f"entrée inconnue : {nom!r} (attendu : {', '.join(ENTREES)})")
+            if nom in self._valeurs and self._valeurs[nom] == valeur:
+                continue
+            self._invalider(nom)
+            self._valeurs[nom] = valeur
+
+    def _invalider(self, nom):
+        # Un nœud calculé a toutes ses dépendances calculées : on s'arrête au
+        # premier nœud aval déjà invalide.
+        self._analyse = None
+        for aval in self._aval[nom]:
+            if aval in self._valeurs:
+                del self._valeurs[aval]
+                self._invalider(aval)
+
+    def valeur(self, nom):
+        """Valeur d'un nœud, calculée (avec ses dépendances) si elle n'est pas à jour."""
+        valeurs = self._valeurs
+        if nom in valeurs:
+            return valeurs[nom]
+        if nom in ENTREES:
+            raise KeyError(f"entrée non renseignée : {nom!r}")
+        dependances, fonction = self._noeuds[nom]
+        valeur = valeurs[nom] = fonction(*[valeurs[d] if d in valeurs else self.valeur(d) for d in dependances])
+        self.evaluations[nom] += 1
+        return valeur
+
+    def analyse(self):
+        """AnalyseFlexion des entrées courantes (même objet tant qu'aucune entrée ne change)."""
+        if self._analyse is None:
+            self._analyse = AnalyseFlexion(**{nom: self.valeur(nom) for nom in ENTREES + SORTIES})
+        return self._analyse
+
+    def analyser(self, tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final,
+                 seuil_beta_corrige=10):
+        """Comme analyser_patient, en ne recalculant que ce qui dépend des entrées modifiées."""
+        self.modifier(tf=tf, ccd=ccd, offset=offset, anteversion=anteversion, version_debout=version_debout,
+                      version_assis=version_assis, alpha_mesure=alpha_mesure, gamma_final=gamma_final,
+                      seuil_beta_corrige=seuil_beta_corrige)
+        return self.analyse()
@@ -0,0 +1,48 @@
+"""Propagation par Monte Carlo des erreurs de mesure radiographique.
+
+Les perturbations de TF, CCD et AV (erreur gaussienne, écart type en °)
+sont tirées en une fois et passées dans analyser_lot : 100 000 tirages
+tiennent sous la seconde sur un cœur.
+"""
+import numpy as np
+
+from .cohorte import COLONNES_ENTREE, analyser_lot
+
+# Écarts types par défaut des mesures radiographiques (°)
+ECARTS_TYPES = {"tf": 5.0, "ccd": 3.0, "anteversion": 5.0}
+
+RESERVES = ("reserve_ref", "reserve_gamma", "reserve_alpha_sans_gamma", "reserve_alpha_avec_gamma")
+INTERPRETATIONS = ("interpretation_ref", "interpretation_gamma", "interpretation_alpha_sans", "interpretation_alpha_avec")
+QUANTILES = (0.025, 0.25, 0.5, 0.75, 0.975)
+
+
+def propagation_incertitude(tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final,
+                            ecarts_types=None, n=100_000, graine=None, seuil_beta_corrige=10):
+    """Distribution des réserves et probabilité de chaque interprétation.
+
+    `ecarts_types` complète ou remplace ECARTS_TYPES (toute colonne de
+    COLONNES_ENTREE peut être perturbée). Renvoie un dict :
+    "reserves" (moyenne, écart type et quantiles par réserve),
+    "probabilites" (clé d'interprétation -> fréquence, par colonne) et
+    "echantillons" (résultats bruts de analyser_lot).
+    """
+    valeurs = dict(zip(COLONNES_ENTREE, (tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure,
+                                         gamma_final)))
+    rng = np.random.default_rng(graine)
+    for nom, ecart in (ECARTS_TYPES | dict(ecarts_types or {})).items():
+        if ecart:
+            valeurs[nom] = valeurs[nom] + rng.normal(0.0, ecart, n)
+    r = analyser_lot(*(np.broadcast_to(valeurs[nom], n) for nom in COLONNES_ENTREE),
+                     seuil_beta_corrige=seuil_beta_corrige)
+
+    reserves = {}
+    for nom in RESERVES:
+        quantiles = np.quantile(r[nom], QUANTILES)
+        reserves[nom] = {"moyenne": float(r[nom].mean()), "ecart_type": float(r[nom].std())}
+        reserves[nom] |= {f"q{100 * q:g}": float(v) for q, v in zip(QUANTILES, quantiles)}
+
+    probabilites = {}
+    for nom in INTERPRETATIONS:
+        cles, effectifs = np.unique(r[nom].astype(str), return_counts=True)
+        probabilites[nom] = {str(cle): float(e) / n for cle, e in zip(cles, effectifs)}
+    return {"reserves": reserves, "probabilites": probabilites, "echantillons": r}
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+
+from .geometrie import BETA_CONFLIT
+from .solveurs import ALPHA_SANS_CONFLIT, DELTA_SANS_CONFLIT
+
+# Clé d'interprétation d'un calcul dont une entrée est manquante ou non finie
+ENTREE_INVALIDE = "invalid_input"
+
+# --- Libellés (mêmes clés que les dictionnaires `labels` des scripts) ---
+LIBELLES = {
+    "Français": {
+        "patient_name": "Nom du patient",
+        "mob": "Mobilité pelvienne (°)",
+        "crit": "Flexion maximale tolérée (°)",
+        "reserve": "Réserve de flexion (°)",
+        "beta": "Inclinaison col fémoral (°)",
+        "risk_none": "Pas de risque de luxation : Réserve infinie",
+        "risk_limited": "Risque de luxation : Réserve limitée",
+        "no_conflict": "Pas de conflit : réserve infinie",
+        "conflict_critical_exceeded": "Conflit : flexion critique dépassée",
+        "conflict_critical_reached": "Conflit : flexion critique atteinte",
+        "no_conflict_limited": "Pas de conflit : réserve limitée",
+        "no_conflict_sufficient": "Pas de conflit : réserve suffisante",
+        "invalid_input": "Entrée invalide : valeur manquante ou non finie",
+    },
+    "English": {
+        "patient_name": "Patient name",
+        "mob": "Pelvic mobility (°)",
+        "crit": "Max tolerated pelvic flexion (°)",
+        "reserve": "Flexion reserve (°)",
+        "beta": "Femoral neck inclination (°)",
+        "risk_none": "No dislocation risk: Infinite reserve",
+        "risk_limited": "Dislocation risk: Limited reserve",
+        "no_conflict": "No conflict: Infinite reserve",
+        "conflict_critical_exceeded": "Conflict: Critical flexion exceeded",
+        "conflict_critical_reached": "Conflict: Critical flexion reached",
+        "no_conflict_limited": "No conflict: Limited reserve",
+        "no_conflict_sufficient": "No conflict: Sufficient reserve",
+        "invalid_input": "Invalid input: missing or non-finite value",
+    },
+}
+
+# Libellés à tiret des premiers scripts (app.py, abduction.py, version_final…)
+LIBELLES_TIRET = {
+    "no_conflict": "Pas de conflit — réserve infinie",
+    "conflict_critical_exceeded": "Conflit — flexion critique dépassée",
+    "conflict_critical_reached": "Conflit — flexion critique atteinte",
+    "no_conflict_limited": "Pas de conflit — réserve limitée",
+    "no_conflict_sufficient": "Pas de conflit — réserve suffisante",
+    "invalid_input": "Entrée invalide — valeur manquante ou non finie",
+}
+
+
+# --- Une valeur à la fois : renvoient la clé du libellé, ou le libellé de `libelles` ---
+def interpretation_clinique(delta_critique, reserve, beta_corrige, libelles=None):
+    if math.isnan(delta_critique) or math.isnan(reserve) or math.isnan(beta_corrige):
+        cle = ENTREE_INVALIDE
+    elif delta_critique == DELTA_SANS_CONFLIT:
+        cle = "no_conflict"
+    elif reserve < 0:
+        cle = "conflict_critical_exceeded"
+    elif beta_corrige >= BETA_CONFLIT:
+        cle = "conflict_critical_reached"
+    elif reserve < 5:
+        cle = "no_conflict_limited"
+    else:
+        cle = "no_conflict_sufficient"
+    return cle if libelles is None else libelles[cle]
+
+def interpretation_alpha(alpha_critique):
+    if math.isnan(alpha_critique):
+        return ENTREE_INVALIDE
+    if alpha_critique == ALPHA_SANS_CONFLIT:
+        return "risk_none"
+    return "risk_limited"
+
+
+# --- Par lots ---
+def interpretation_clinique_lot(delta_critique, reserve, beta_corrige):
+    delta_critique, reserve, beta_corrige = np.broadcast_arrays(delta_critique, reserve, beta_corrige)
+    invalide = np.isnan(delta_critique) | np.isnan(reserve) | np.isnan(beta_corrige)
+    return np.select(
+        [invalide, delta_critique == DELTA_SANS_CONFLIT, reserve < 0, beta_corrige >= BETA_CONFLIT, reserve < 5],
+        [ENTREE_INVALIDE, "no_conflict", "conflict_critical_exceeded", "conflict_critical_reached",
+         "no_conflict_limited"],
+        "no_conflict_sufficient",
+    ).astype(object)
+
+def interpretation_alpha_lot(alpha_critique):
+    alpha_critique = np.asarray(alpha_critique)
+    return np.select([np.isnan(alpha_critique), alpha_critique == ALPHA_SANS_CONFLIT],
+                     [ENTREE_INVALIDE, "risk_none"], "risk_limited").astype(object)
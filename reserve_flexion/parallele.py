@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+
+from .cohorte import COLONNES_ENTREE, ajouter_resultats, analyser_lot
+
+
+def _analyser_bloc(args):
+    entrees, seuil_beta_corrige = args
+    return analyser_lot(*entrees, seuil_beta_corrige=seuil_beta_corrige)
+
+
+def analyser_lot_parallele(tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final,
+                           seuil_beta_corrige=10, processus=None, taille_bloc=50_000, executeur=None):
+    """analyser_lot réparti par blocs de `taille_bloc` patients sur plusieurs processus.
+
+    Les blocs sont recollés dans l'ordre d'entrée : le résultat est identique
+    à celui de analyser_lot. `executeur` permet de réutiliser un pool existant
+    (sinon un ProcessPoolExecutor de `processus` processus est créé pour l'appel).
+    """
+    entrees = [np.array(x, dtype=float) for x in np.broadcast_arrays(
+        tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final)]
+    n = len(entrees[0])
+    processus = processus or os.cpu_count() or 1
+    if n <= taille_bloc or (executeur is None and processus == 1):
+        return analyser_lot(*entrees, seuil_beta_corrige=seuil_beta_corrige)
+
+    if executeur is None:
+        from concurrent.futures import ProcessPoolExecutor  # coûteux à importer : seulement si un pool est créé
+
+        with ProcessPoolExecutor(processus) as executeur:
+            return recoller(soumettre_blocs(executeur, entrees, seuil_beta_corrige, taille_bloc))
+    return recoller(soumettre_blocs(executeur, entrees, seuil_beta_corrige, taille_bloc))
+
+
+def soumettre_blocs(executeur, entrees, seuil_beta_corrige=10, taille_bloc=50_000):
+    """Soumet analyser_lot par blocs de `taille_bloc` patients ; renvoie les futures, dans l'ordre."""
+    n = len(entrees[0])
+    return [executeur.submit(_analyser_bloc, (tuple(x[i:i + taille_bloc] for x in entrees), seuil_beta_corrige))
+            for i in range(0, n, taille_bloc)]
+
+
+def recoller(futures):
+    """Résultats des blocs de soumettre_blocs, recollés dans l'ordre d'entrée."""
+    parties = [f.result() for f in futures]
+    return {nom: np.concatenate([p[nom] for p in parties]) for nom in parties[0]}
+
+
+def analyser_cohorte_parallele(df, seuil_beta_corrige=10, langue=None, colonnes=None, **options):
+    """analyser_cohorte avec analyser_lot_parallele ; `options` : processus, taille_bloc, executeur."""
+    colonnes = {nom: nom for nom in COLONNES_ENTREE} | dict(colonnes or {})
+    r = analyser_lot_parallele(*(df[colonnes[nom]].to_numpy(dtype=float) for nom in COLONNES_ENTREE),
+                               seuil_beta_corrige=seuil_beta_corrige, **options)
+    return ajouter_resultats(df, r, langue)
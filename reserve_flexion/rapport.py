@@ -0,0 +1,200 @@
+"""Rapport PDF de l'application ; fpdf n'est importé qu'à la génération.
+
+La mise en page (titres, intitulés, libellés) est construite une fois par
+jeu de libellés : pour chaque patient il ne reste qu'à y placer les
+nombres. Avec une police TrueType (police=POLICE_UNICODE), les métriques
+sont lues une fois par processus, le sous-ensemble de glyphes embarqué et
+son tableau de largeurs sont mémorisés. Les caractères de la mise en page,
+des interprétations, des nombres et l'alphabet latin y figurent d'avance :
+les patients d'une même langue partagent un sous-ensemble, sauf si leur
+nom contient d'autres caractères. Au plus TAILLE_SOUS_ENSEMBLES
+sous-ensembles sont gardés.
+"""
+import os
+from functools import lru_cache
+from types import FunctionType
+
+from .interpretation import LIBELLES
+
+# Police Unicode livrée avec l'application (γ, α, β, °)
+POLICE_UNICODE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DejaVuSans.ttf")
+
+# Toujours dans le sous-ensemble : caractères des valeurs formatées (nan et inf compris)
+# et lettres des noms de patient en alphabet latin (Latin-1, Latin étendu A)
+_CARACTERES_NOMBRES = "0123456789.-+nainf"
+_CARACTERES_NOMS = "".join(map(chr, [*range(0x20, 0x7F), *range(0xA0, 0x180)]))
+
+# Sous-ensembles et tableaux de largeurs gardés par processus : un par langue,
+# plus ceux des noms contenant d'autres caractères
+TAILLE_SOUS_ENSEMBLES = 8
+
+
+def _latin1(texte):
+    return texte.encode("latin-1", "replace").decode("latin-1")
+
+
+def _echapper(texte):
+    return texte.replace("{", "{{").replace("}", "}}")
+
+
+# --- Mise en page ---
+@lru_cache(maxsize=16)
+def _gabarit(libelles, langue):
+    """Opérations de mise en page ; les nombres sont des champs de str.format."""
+    labels = dict(libelles)
+    avec_gamma = _echapper(labels["with_gamma"]).replace("{{gamma:.1f}}", "{gamma_final:.1f}")
+    sans_gamma = _echapper(labels["without_gamma"])
+    mob, crit, reserve, beta = (_echapper(labels[cle]) for cle in ("mob", "crit", "reserve", "beta"))
+    mesure, critique = _echapper(labels["alpha_measured"]), _echapper(labels["alpha_crit"])
+
+    operations = [
+        ("police", "B", 16), ("cell", _echapper(labels["title"]), "C"),
+        ("ln", 5), ("police", "", 12), ("cell", _echapper(labels["patient_name"]) + ": {patient_name}", ""),
+        # Résultats analyse
+        ("ln", 5), ("police", "B", 14), ("cell", _echapper(labels["results_analysis"]), ""),
+        # Flexion du tronc
+        ("ln", 4), ("police", "B", 12), ("cell", "Flexion du tronc" if langue == "Français" else "Trunk flexion", ""),
+    ]
+    for titre, suffixe in ((sans_gamma, "ref"), (avec_gamma, "gamma")):
+        operations += _section(titre, [
+            f"{mob}: {{delta_mesure:.1f}}°",
+            f"{crit}: {{delta_critique_{suffixe}:.1f}}°",
+            f"{reserve}: {{reserve_{suffixe}:.1f}}°",
+            f"{beta}: {{beta_corrige_{suffixe}:.1f}}°",
+            f"{{interpretation_{suffixe}}}",
+        ])
+    # Résultats flexion jambe
+    operations += [("ln", 6), ("police", "B", 14), ("cell", _echapper(labels["results_flexion_leg"]), "")]
+    for titre, suffixe in ((sans_gamma, "sans"), (avec_gamma, "avec")):
+        operations += _section(titre, [
+            f"{mesure}: {{alpha_mesure:.1f}}°",
+            f"{critique}: {{alpha_critique_{suffixe}_gamma:.1f}}°",
+            f"{reserve}: {{reserve_alpha_{suffixe}_gamma:.1f}}°",
+            f"{{interpretation_alpha_{suffixe}}}",
+        ])
+    return tuple(operations)
+
+
+def _section(titre, lignes):
+    return [("ln", 2), ("police", "B", 11), ("cell", f"{titre}:", ""), ("police", "", 11)] + [
+        ("multi", ligne) for ligne in lignes]
+
+
+def _caracteres(gabarit, labels):
+    """Caractères de la mise en page, des interprétations, des nombres et de l'alphabet latin."""
+    textes = [op[1] for op in gabarit if op[0] in ("cell", "multi")]
+    textes += [labels[cle] for cle in LIBELLES["Français"] if cle in labels]
+    return "".join(sorted(set("".join(textes) + _CARACTERES_NOMBRES + _CARACTERES_NOMS)))
+
+
+# --- Polices ---
+def _avec_globales(fonction, **globales):
+    """Copie d'une fonction de fpdf.fpdf dont certains noms globaux sont remplacés.
+
+    Le module fpdf.fpdf n'est pas modifié : les autres documents, dans
+    d'autres fils, gardent TTFontFile et FPDF_CACHE_MODE d'origine.
+    """
+    copie = FunctionType(fonction.__code__, {**fonction.__globals__, **globales}, fonction.__name__,
+                         fonction.__defaults__, fonction.__closure__)
+    copie.__kwdefaults__ = fonction.__kwdefaults__
+    return copie
+
+
+@lru_cache(maxsize=TAILLE_SOUS_ENSEMBLES)
+def _sous_ensemble(fichier, codes):
+    """(flux, codeToGlyph, maxUni) de TTFontFile.makeSubset pour un ensemble de codes."""
+    from fpdf.ttfonts import TTFontFile
+
+    ttf = TTFontFile()
+    flux = ttf.makeSubset(fichier, sorted(codes))
+    return flux, ttf.codeToGlyph, ttf.maxUni
+
+
+@lru_cache(maxsize=TAILLE_SOUS_ENSEMBLES)
+def _largeurs(fichier, codes, max_uni):
+    """Lignes /W écrites par FPDF._putTTfontwidths (parcours de tous les codes jusqu'à max_uni)."""
+    import fpdf.fpdf
+
+    lignes = []
+    pdf = fpdf.fpdf.FPDF()
+    pdf._out = lignes.append  # document jetable : sa sortie est capturée
+    pdf._putTTfontwidths(dict(_police(fichier)[0], subset=sorted(codes)), max_uni)
+    return tuple(lignes)
+
+
+@lru_cache(maxsize=None)
+def _fpdf():
+    """Classe FPDF dont les sous-ensembles de police TrueType sont mémorisés."""
+    import fpdf.fpdf
+    from fpdf.ttfonts import TTFontFile
+
+    class TTFontFileMemorise(TTFontFile):
+        def makeSubset(self, file, subset):
+            flux, self.codeToGlyph, self.maxUni = _sous_ensemble(file, frozenset(subset))
+            return flux
+
+    class FPDFMemorise(fpdf.fpdf.FPDF):
+        # fpdf instancie TTFontFile depuis les globales de son module : la méthode
+        # de la sous-classe lit les siennes, avec la version mémorisée
+        _putfonts = _avec_globales(fpdf.fpdf.FPDF._putfonts, TTFontFile=TTFontFileMemorise)
+        # métriques gardées en mémoire : pas de .pkl écrit à côté de la police
+        add_font = _avec_globales(fpdf.fpdf.FPDF.add_font, FPDF_CACHE_MODE=1)
+
+        def _putTTfontwidths(self, font, maxUni):
+            for ligne in _largeurs(font["ttffile"], frozenset(font["subset"]), maxUni):
+                self._out(ligne)
+
+    return FPDFMemorise
+
+
+@lru_cache(maxsize=None)
+def _police(fichier):
+    """Entrées `fonts` et `font_files` de fpdf pour une police TrueType, lues une fois par processus."""
+    pdf = _fpdf()()
+    pdf.add_font("unicode", "", fichier, uni=True)
+    return pdf.fonts["unicode"], pdf.font_files
+
+
+def _ajouter_police(pdf, fichier, caracteres):
+    """Police `fichier` déjà chargée, sous-ensemble initialisé avec `caracteres`."""
+    police, fichiers = _police(fichier)
+    # fpdf complète le sous-ensemble et numérote les objets : copies propres au document
+    pdf.fonts["unicode"] = dict(police, i=len(pdf.fonts) + 1, subset=list(range(32)) + [ord(c) for c in caracteres])
+    pdf.font_files.update((nom, dict(entree)) for nom, entree in fichiers.items())
+
+
+# --- Rapport ---
+def rapport_pdf(analyse, patient_name, labels, langue, police=None):
+    """Rapport PDF (octets) d'une AnalyseFlexion, avec les libellés `labels` de l'application.
+
+    Sans `police`, le rapport utilise Arial et les caractères hors Latin-1
+    (γ, …) sont remplacés par « ? » ; avec un fichier TrueType
+    (POLICE_UNICODE), le texte est rendu tel quel. Les intitulés en gras
+    restent dans la même police TrueType.
+    """
+    gabarit = _gabarit(tuple(labels.items()), langue)
+    pdf = _fpdf()()
+    if police is None:
+        famille, texte = "Arial", _latin1
+    else:
+        _ajouter_police(pdf, police, _caracteres(gabarit, labels))
+        famille, texte = "unicode", str
+    pdf.add_page()
+
+    valeurs = {nom: getattr(analyse, nom) for nom in analyse.__slots__}
+    for nom in valeurs:
+        if nom.startswith("interpretation"):
+            valeurs[nom] = labels[valeurs[nom]]
+    valeurs["patient_name"] = patient_name
+
+    for operation in gabarit:
+        if operation[0] == "police":
+            pdf.set_font(famille, operation[1] if police is None else "", operation[2])
+        elif operation[0] == "ln":
+            pdf.ln(operation[1])
+        elif operation[0] == "cell":
+            pdf.cell(0, 10, texte(operation[1].format_map(valeurs)), ln=1, align=operation[2])
+        else:
+            pdf.multi_cell(0, 8, texte(operation[1].format_map(valeurs)))
+
+    return pdf.output(dest="S").encode("latin-1", "replace")
@@ -0,0 +1,85 @@
+"""Antéversion cotyloïdienne minimale pour une réserve de flexion cible.
+
+β corrigé = β + AV : augmenter AV ne fait que retirer des conflits. Une
+réserve >= cible équivaut à l'absence de conflit aux points de la grille
+de 0.1° situés avant mesure + cible, c'est-à-dire AV > seuil − min β sur
+ces points. Le minimum de β se calcule directement (β ne dépend de la
+flexion que par |cos(x + φ)|, voir solveurs), sans balayage ni sur la
+flexion ni sur AV ; toutes les entrées acceptent des tableaux, par exemple
+un balayage de γ.
+"""
+import numpy as np
+
+from .geometrie import signe_col
+from .solveurs import ALPHA_SANS_CONFLIT, DELTA_SANS_CONFLIT
+
+# Pas des grilles de δ et α critiques
+_PAS = 0.1
+
+
+def _beta_minimal_lot(theta, tf_rad, long_col, x_max_deg):
+    """Minimum (°) de β aux points de grille de la flexion x ∈ [0, x_max] (inf si x_max < 0 : rien à vérifier)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.sin(theta) * long_col
+        b = np.cos(theta) * long_col
+        c = np.sin(tf_rad) * long_col
+        r = np.hypot(b, c)
+        phi = np.arctan2(b, c)
+        # β croît avec |cos(x + φ)| si a > 0 (minimum où |cos| = 0), décroît si
+        # a < 0 (minimum où |cos| = 1) : premier de ces points pour x >= 0
+        decalage = np.where(a > 0, np.pi / 2, 0.0)
+        extremum = np.degrees(np.ceil((phi - decalage) / np.pi) * np.pi + decalage - phi)
+        # β est monotone de part et d'autre : le minimum sur la grille est en
+        # une borne ou en l'un des deux points de grille qui encadrent l'extremum
+        k = np.floor(np.round(extremum / _PAS, 9))
+        candidats = np.stack(np.broadcast_arrays(0.0, x_max_deg, k * _PAS, (k + 1) * _PAS))
+        x = np.radians(np.clip(candidats, 0.0, x_max_deg))
+        beta = np.degrees(np.arccos(a / np.hypot(a, r * np.abs(np.cos(x + phi))))).min(axis=0)
+    return np.where(x_max_deg < 0, np.inf, beta)
+
+
+def _av_minimale(theta, tf_deg, ccd_deg, offset_mm, mesure, reserve_cible, seuil_beta_corrige, sentinelle):
+    mesure, reserve_cible = np.broadcast_arrays(np.asarray(mesure, dtype=float), np.asarray(reserve_cible, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        signe = signe_col(np.asarray(offset_mm, dtype=float), np.asarray(ccd_deg, dtype=float))
+    # δ (ou α) critique est le premier point de grille en conflit : la réserve
+    # atteint la cible si aucun point de grille avant mesure + cible n'est en
+    # conflit, le dernier étant x_max. Sans conflit, la réserve affichée vaut
+    # sentinelle − mesure.
+    x_max = (np.ceil(np.round((mesure + reserve_cible) / _PAS, 9)) - 1) * _PAS
+    av = seuil_beta_corrige - _beta_minimal_lot(theta, np.radians(tf_deg), signe, x_max)
+    av = np.where(mesure + reserve_cible > sentinelle, np.inf, av)
+    return av if av.ndim else float(av)
+
+
+def av_minimale_tronc(ccd_deg, tf_deg, gamma_deg, offset_mm, delta_mesure, reserve_cible=0, seuil_beta_corrige=10):
+    """AV (°) au-delà de laquelle reserve = δ critique − δ mesuré reste >= cible.
+
+    Toute AV strictement supérieure convient, et elle seule (aux cas
+    d'égalité près sur un point de grille). inf si la cible dépasse
+    89.9 − δ mesuré, −inf si toute AV convient.
+    """
+    theta = np.pi - np.radians(np.add(ccd_deg, gamma_deg))
+    return _av_minimale(theta, tf_deg, ccd_deg, offset_mm, delta_mesure, reserve_cible, seuil_beta_corrige,
+                        DELTA_SANS_CONFLIT)
+
+
+def av_minimale_jambe(tf_deg, ccd_deg, offset_mm, alpha_mesure, gamma_deg=0, reserve_cible=0, seuil_beta_corrige=10):
+    """AV (°) au-delà de laquelle α critique − α mesuré reste >= cible (voir av_minimale_tronc)."""
+    theta = np.pi - np.radians(ccd_deg) + np.radians(gamma_deg)
+    return _av_minimale(theta, tf_deg, ccd_deg, offset_mm, alpha_mesure, reserve_cible, seuil_beta_corrige,
+                        ALPHA_SANS_CONFLIT)
+
+
+def recommander_anteversion(tf, ccd, offset, delta_mesure, alpha_mesure, gamma_final=0, reserve_cible=0,
+                            seuil_beta_corrige=10):
+    """AV minimales garantissant les deux réserves >= cible, sans γ et avec γ.
+
+    Renvoie un dict : "tronc" et "jambe" (max sur γ = 0 et γ final), et
+    "anteversion_min", la borne à dépasser pour satisfaire les deux.
+    """
+    tronc = np.maximum(av_minimale_tronc(ccd, tf, 0, offset, delta_mesure, reserve_cible, seuil_beta_corrige),
+                       av_minimale_tronc(ccd, tf, gamma_final, offset, delta_mesure, reserve_cible, seuil_beta_corrige))
+    jambe = np.maximum(av_minimale_jambe(tf, ccd, offset, alpha_mesure, 0, reserve_cible, seuil_beta_corrige),
+                       av_minimale_jambe(tf, ccd, offset, alpha_mesure, gamma_final, reserve_cible, seuil_beta_corrige))
+    return {"tronc": float(tronc), "jambe": float(jambe), "anteversion_min": float(max(tronc, jambe))}
@@ -0,0 +1,81 @@
+from .balayage import critiques_gamma
+from .cache import alpha_critique_cache, delta_critique_cache
+from .geometrie import calcul_angle_beta, calcul_beta_corrige, calcul_reserve
+from .interpretation import interpretation_alpha, interpretation_clinique
+
+ENTREES = ("tf", "ccd", "offset", "anteversion", "version_debout", "version_assis", "alpha_mesure", "gamma_final",
+           "seuil_beta_corrige")
+SORTIES = (
+    "delta_mesure",
+    "delta_critique_ref", "reserve_ref", "beta_corrige_ref", "interpretation_ref",
+    "delta_critique_gamma", "reserve_gamma", "beta_corrige_gamma", "interpretation_gamma",
+    "alpha_critique_sans_gamma", "reserve_alpha_sans_gamma", "interpretation_alpha_sans",
+    "alpha_critique_avec_gamma", "reserve_alpha_avec_gamma", "interpretation_alpha_avec",
+)
+
+
+class AnalyseFlexion:
+    """Résultats d'une analyse, calculés une fois et partagés par l'affichage et les exports.
+
+    Les interprétations sont des clés des dictionnaires de libellés.
+    L'objet est immuable : une nouvelle saisie donne un nouvel objet.
+    """
+    __slots__ = ENTREES + SORTIES
+
+    def __init__(self, **valeurs):
+        for nom in self.__slots__:
+            object.__setattr__(self, nom, valeurs[nom])
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __delattr__(self, nom):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{nom}={getattr(self, nom)!r}' for nom in ENTREES)})"
+
+    @property
+    def entrees(self):
+        return tuple(getattr(self, nom) for nom in ENTREES)
+
+    def __getitem__(self, nom):
+        return getattr(self, nom)
+
+
+def _critiques(tf, ccd, offset, anteversion, gamma, seuil_beta_corrige, balayage):
+    """(δ critique, α critique) lus dans le balayage si γ y figure, sinon résolus (avec cache)."""
+    critiques = None if balayage is None else critiques_gamma(balayage, gamma)
+    if critiques is None:
+        critiques = (delta_critique_cache(ccd, tf, gamma, offset, anteversion, seuil_beta_corrige),
+                     alpha_critique_cache(tf, ccd, offset, anteversion, gamma, seuil_beta_corrige))
+    return critiques
+
+
+def analyser_patient(tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final,
+                     seuil_beta_corrige=10, balayage=None):
+    """Toute la physique de l'application pour un patient.
+
+    `balayage` (voir balayage_gamma, calculé pour les mêmes TF, CCD, offset,
+    AV et seuil) fournit les angles critiques sans appel aux solveurs.
+    """
+    r = {"delta_mesure": version_assis - version_debout}
+    critiques = {gamma: _critiques(tf, ccd, offset, anteversion, gamma, seuil_beta_corrige, balayage)
+                 for gamma in (0.0, gamma_final)}
+    for suffixe, gamma in (("ref", 0.0), ("gamma", gamma_final)):
+        delta_critique = critiques[gamma][0]
+        reserve = calcul_reserve(delta_critique, r["delta_mesure"])
+        beta_corrige = calcul_beta_corrige(calcul_angle_beta(ccd, tf, r["delta_mesure"], gamma, offset), anteversion)
+        r[f"delta_critique_{suffixe}"] = delta_critique
+        r[f"reserve_{suffixe}"] = reserve
+        r[f"beta_corrige_{suffixe}"] = beta_corrige
+        r[f"interpretation_{suffixe}"] = interpretation_clinique(delta_critique, reserve, beta_corrige)
+    for suffixe, gamma in (("sans", 0.0), ("avec", gamma_final)):
+        alpha_critique = critiques[gamma][1]
+        r[f"alpha_critique_{suffixe}_gamma"] = alpha_critique
+        r[f"reserve_alpha_{suffixe}_gamma"] = alpha_critique - alpha_mesure
+        r[f"interpretation_alpha_{suffixe}"] = interpretation_alpha(alpha_critique)
+    return AnalyseFlexion(
+        tf=tf, ccd=ccd, offset=offset, anteversion=anteversion, version_debout=version_debout,
+        version_assis=version_assis, alpha_mesure=alpha_mesure, gamma_final=gamma_final,
+        seuil_beta_corrige=seuil_beta_corrige, **r)
@@ -0,0 +1,84 @@
+"""Sensibilité des réserves de flexion aux paramètres mesurés.
+
+Toutes les perturbations sont évaluées en un seul appel des solveurs par
+lots : dérivées partielles par différences finies centrées sur les angles
+critiques exacts, et diagramme en tornade des réserves (valeurs affichées
+par l'application) pour des écarts cliniques de chaque paramètre.
+"""
+import numpy as np
+
+from .solveurs import ALPHA_SANS_CONFLIT, DELTA_SANS_CONFLIT, resoudre_alpha_critique_lot, resoudre_delta_critique_lot
+
+PARAMETRES = ("tf", "ccd", "offset", "anteversion", "version_debout", "version_assis", "alpha_mesure", "gamma_final")
+
+# Les mesures n'entrent dans les réserves que par soustraction : dérivées exactes
+DERIVEES_MESURES = {
+    "reserve_tronc": {"version_debout": 1.0, "version_assis": -1.0, "alpha_mesure": 0.0},
+    "reserve_jambe": {"version_debout": 0.0, "version_assis": 0.0, "alpha_mesure": -1.0},
+}
+
+# Écarts cliniques par défaut pour la tornade (° ou mm)
+PERTURBATIONS = {
+    "tf": 5.0, "ccd": 3.0, "offset": 5.0, "anteversion": 5.0,
+    "version_debout": 3.0, "version_assis": 3.0, "alpha_mesure": 5.0, "gamma_final": 5.0,
+}
+
+
+def _reserves(p, seuil_beta_corrige):
+    """Réserves de flexion du tronc et de la jambe (exactes et arrondies) pour des tableaux de paramètres."""
+    delta = resoudre_delta_critique_lot(
+        p["ccd"], p["tf"], p["gamma_final"], p["offset"], p["anteversion"], seuil_beta_corrige)
+    alpha = resoudre_alpha_critique_lot(
+        p["tf"], p["ccd"], p["offset"], p["anteversion"], p["gamma_final"], seuil_beta_corrige)
+    delta_mesure = p["version_assis"] - p["version_debout"]
+    # Sans conflit, l'angle critique affiché est la valeur sentinelle : même convention pour l'angle exact
+    delta_exact = np.where(np.isfinite(delta.exact), delta.exact, DELTA_SANS_CONFLIT)
+    alpha_exact = np.where(np.isfinite(alpha.exact), alpha.exact, ALPHA_SANS_CONFLIT)
+    return {
+        "reserve_tronc": (delta_exact - delta_mesure, delta.arrondi - delta_mesure),
+        "reserve_jambe": (alpha_exact - p["alpha_mesure"], alpha.arrondi - p["alpha_mesure"]),
+    }
+
+
+def analyse_sensibilite(tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure, gamma_final,
+                        perturbations=None, seuil_beta_corrige=10, pas_derivee=1e-3):
+    """Dérivées partielles et tornade des réserves (tronc avec γ, jambe avec γ).
+
+    Renvoie pour "reserve_tronc" et "reserve_jambe" un dict avec la valeur
+    de base, les dérivées (°/° ou °/mm) et la tornade : liste (paramètre,
+    réserve à −écart, réserve à +écart) triée par amplitude décroissante.
+    Les dérivées par rapport aux mesures (versions, α mesuré) sont exactes
+    (±1 ou 0), les autres sont des différences finies sur les angles
+    critiques exacts. Sans conflit, la réserve est celle affichée
+    (sentinelle − mesure) : les dérivées des autres paramètres sont nulles.
+    """
+    base = dict(zip(PARAMETRES, (tf, ccd, offset, anteversion, version_debout, version_assis, alpha_mesure,
+                                 gamma_final)))
+    ecarts = PERTURBATIONS | dict(perturbations or {})
+
+    # Lignes : base, puis pour chaque paramètre −h, +h, −écart, +écart
+    decalages = [np.zeros(len(PARAMETRES))]
+    for i, nom in enumerate(PARAMETRES):
+        for d in (-pas_derivee, pas_derivee, -ecarts[nom], ecarts[nom]):
+            ligne = np.zeros(len(PARAMETRES))
+            ligne[i] = d
+            decalages.append(ligne)
+    decalages = np.array(decalages)
+    lot = {nom: float(base[nom]) + decalages[:, i] for i, nom in enumerate(PARAMETRES)}
+
+    resultats = {}
+    with np.errstate(invalid="ignore"):
+        for reserve, (exact, arrondi) in _reserves(lot, seuil_beta_corrige).items():
+            exact_p = exact[1:].reshape(len(PARAMETRES), 4)
+            arrondi_p = arrondi[1:].reshape(len(PARAMETRES), 4)
+            derivees = (exact_p[:, 1] - exact_p[:, 0]) / (2 * pas_derivee)
+            tornade = sorted(
+                ((nom, round(float(arrondi_p[i, 2]), 1), round(float(arrondi_p[i, 3]), 1)) for i, nom in enumerate(PARAMETRES)),
+                key=lambda t: abs(t[2] - t[1]), reverse=True,
+            )
+            resultats[reserve] = {
+                "base": round(float(arrondi[0]), 1),
+                "derivees": {nom: float(d) for nom, d in zip(PARAMETRES, derivees)} | DERIVEES_MESURES[reserve],
+                "tornade": tornade,
+            }
+    return resultats
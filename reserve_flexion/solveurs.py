@@ -0,0 +1,376 @@
+import math
+from decimal import Decimal
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from .geometrie import (
+    beta_alpha_vectorise,
+    beta_direction,
+    beta_vectorise,
+    calcul_angle_beta,
+    calcul_angle_beta_alpha,
+    calcul_beta_corrige,
+    signe_col,
+)
+
+# --- Grilles et valeurs sentinelles des scripts ---
+GRILLE_DELTA = np.arange(0, 90, 0.1)
+DELTA_SANS_CONFLIT = 89.9
+GRILLE_ALPHA = np.arange(0, 130, 0.1)
+ALPHA_SANS_CONFLIT = 129.9
+
+# Écart maximal entre β vectorisé et β de référence (quelques ulp) : en deçà,
+# la comparaison au seuil est refaite avec la fonction de référence.
+_TOLERANCE_REEVALUATION = 1e-9
+
+METHODES = ("boucle", "grille", "analytique")
+
+
+class SolutionCritique(NamedTuple):
+    exact: float    # angle critique continu (°), math.inf si aucun conflit
+    arrondi: float  # premier point de la grille en conflit, comme le balayage
+
+
+def _premier_conflit(beta_corrige, seuil_beta_corrige, beta_corrige_exact):
+    """Indice du premier point où β corrigé <= seuil, ou None."""
+    ecart = beta_corrige - seuil_beta_corrige
+    conflit = ecart <= 0
+    for i in np.flatnonzero(np.abs(ecart) <= _TOLERANCE_REEVALUATION):
+        conflit[i] = beta_corrige_exact(i) <= seuil_beta_corrige
+    if not conflit.any():
+        return None
+    return int(np.argmax(conflit))
+
+
+@lru_cache(maxsize=None)
+def _grille(borne, pas):
+    return np.arange(0, borne, pas)
+
+def _decimales(pas):
+    return max(1, -Decimal(str(pas)).as_tuple().exponent)
+
+
+# --- Résolution analytique ---
+# Avec a = L·sin θ et uz = L·(sin tf·cos x − cos θ·sin x) = R·cos(x + φ),
+# cos β = a / sqrt(a² + R²·cos²(x + φ)) : β ne dépend de x que par
+# t = |cos(x + φ)|, de façon monotone. La condition β <= s devient donc
+# t <= T (a > 0) ou t >= T (a < 0), c'est-à-dire x + φ à une distance d'au
+# plus w d'un centre c (modulo π). Les intervalles de conflit se répètent
+# tous les 180° et se calculent directement.
+def _intervalles_conflit(theta, tf_rad, long_col, s_deg):
+    """(φ, c, w) décrivant les x en conflit, ou None s'il n'y en a aucun.
+
+    Seul le signe de long_col compte (voir signe_col).
+    """
+    a = math.sin(theta) * long_col
+    b = math.cos(theta) * long_col
+    c = math.sin(tf_rad) * long_col
+    r = math.hypot(b, c)
+    phi = math.atan2(b, c)
+    toujours = (phi, 0.0, math.pi / 2)
+    if math.isnan(a) or math.isnan(r) or math.isnan(s_deg):
+        return None
+    if r == 0:
+        if a == 0:
+            return None
+        return toujours if (0.0 if a > 0 else 180.0) <= s_deg else None
+    if a > 0:
+        if s_deg < 0:
+            return None
+        if s_deg >= 90:
+            return toujours
+        seuil_t = a * math.tan(math.radians(s_deg)) / r
+        return phi, math.pi / 2, math.asin(min(seuil_t, 1.0))
+    if a < 0:
+        if s_deg <= 90:
+            return None
+        if s_deg >= 180:
+            return toujours
+        seuil_t = -a * math.tan(math.pi - math.radians(s_deg)) / r
+        if seuil_t > 1:
+            return None
+        return phi, 0.0, math.acos(seuil_t)
+    return toujours if s_deg >= 90 else None
+
+def _premiers_intervalles(theta, tf_rad, long_col, s_deg, borne_deg):
+    """Intervalles [début, fin] (°) de conflit qui commencent dans [0, borne)."""
+    conflit = _intervalles_conflit(theta, tf_rad, long_col, s_deg)
+    if conflit is None:
+        return []
+    phi, centre, w = conflit
+    if w >= math.pi / 2:
+        return [(0.0, math.inf)]
+    d = (phi - centre + math.pi / 2) % math.pi - math.pi / 2
+    if -w <= d <= w:
+        debut, fin = 0.0, w - d
+    elif d < -w:
+        debut, fin = -w - d, w - d
+    else:
+        debut, fin = math.pi - w - d, math.pi + w - d
+    intervalles = []
+    while math.degrees(debut) < borne_deg:
+        intervalles.append((max(0.0, math.degrees(debut)), math.degrees(fin)))
+        debut, fin = debut + math.pi, fin + math.pi
+    return intervalles
+
+def _arrondi_grille(intervalles, grille, conflit):
+    """Premier indice de la grille en conflit, recalé sur la fonction de référence."""
+    for debut, fin in intervalles:
+        k = int(np.searchsorted(grille, debut - _TOLERANCE_REEVALUATION))
+        while k > 0 and conflit(k - 1):
+            k -= 1
+        while k < len(grille) and grille[k] <= fin + _TOLERANCE_REEVALUATION:
+            if conflit(k):
+                return k
+            k += 1
+    return None
+
+
+# --- Flexion du tronc ---
+def _delta_critique_boucle(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige):
+    for delta_deg in GRILLE_DELTA:
+        beta = calcul_angle_beta(ccd_deg, tf_deg, delta_deg, gamma_deg, offset_mm)
+        beta_corrige = calcul_beta_corrige(beta, av_deg)
+        if beta_corrige <= seuil_beta_corrige:
+            return round(delta_deg, 1)
+    return DELTA_SANS_CONFLIT
+
+def _delta_critique_grille(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige):
+    signe = signe_col(offset_mm, ccd_deg)
+    if signe:
+        beta = beta_direction(ccd_deg + gamma_deg, tf_deg, GRILLE_DELTA, signe)
+    else:
+        beta = beta_vectorise(ccd_deg, tf_deg, GRILLE_DELTA, gamma_deg, offset_mm)
+    i = _premier_conflit(
+        calcul_beta_corrige(beta, av_deg),
+        seuil_beta_corrige,
+        lambda j: calcul_beta_corrige(
+            calcul_angle_beta(ccd_deg, tf_deg, GRILLE_DELTA[j], gamma_deg, offset_mm), av_deg),
+    )
+    if i is None:
+        return DELTA_SANS_CONFLIT
+    return round(GRILLE_DELTA[i], 1)
+
+def resoudre_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10, pas=0.1):
+    """δ critique exact et sa valeur sur la grille de pas `pas` (0.1° : balayage d'origine)."""
+    intervalles = _premiers_intervalles(
+        math.pi - math.radians(ccd_deg + gamma_deg),
+        math.radians(tf_deg),
+        signe_col(offset_mm, ccd_deg),
+        seuil_beta_corrige - av_deg,
+        90,
+    )
+    if not intervalles:
+        return SolutionCritique(math.inf, DELTA_SANS_CONFLIT)
+    grille = _grille(90, pas)
+    k = _arrondi_grille(
+        intervalles,
+        grille,
+        lambda j: calcul_beta_corrige(
+            calcul_angle_beta(ccd_deg, tf_deg, grille[j], gamma_deg, offset_mm), av_deg) <= seuil_beta_corrige,
+    )
+    arrondi = DELTA_SANS_CONFLIT if k is None else round(grille[k], _decimales(pas))
+    return SolutionCritique(intervalles[0][0], arrondi)
+
+def calcul_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10,
+                          methode="analytique"):
+    """δ critique (°) : première flexion pelvienne où β corrigé <= seuil.
+
+    methode="boucle" est le balayage d'origine des scripts ; methode="grille"
+    évalue toute la grille en une passe NumPy ; methode="analytique" (par
+    défaut, la plus rapide) résout β(δ) + AV = seuil directement (voir
+    resoudre_delta_critique). Les trois renvoient la même valeur.
+    """
+    if methode == "boucle":
+        return _delta_critique_boucle(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige)
+    if methode == "grille":
+        return _delta_critique_grille(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige)
+    if methode == "analytique":
+        return resoudre_delta_critique(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige).arrondi
+    raise ValueError(f"méthode inconnue : {methode!r} (attendu : {', '.join(METHODES)})")
+
+
+# --- Flexion de la jambe ---
+def _alpha_critique_boucle(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige):
+    for alpha_deg in GRILLE_ALPHA:
+        beta = calcul_angle_beta_alpha(ccd_deg, tf_deg, alpha_deg, offset_mm, gamma_deg)
+        beta_corrige = calcul_beta_corrige(beta, av_cotyle_deg)
+        if beta_corrige <= seuil_beta_corrige:
+            return round(alpha_deg, 1)
+    return ALPHA_SANS_CONFLIT
+
+def _alpha_critique_grille(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige):
+    signe = signe_col(offset_mm, ccd_deg)
+    if signe:
+        beta = beta_direction(ccd_deg - gamma_deg, tf_deg, GRILLE_ALPHA, signe)
+    else:
+        beta = beta_alpha_vectorise(ccd_deg, tf_deg, GRILLE_ALPHA, offset_mm, gamma_deg)
+    i = _premier_conflit(
+        calcul_beta_corrige(beta, av_cotyle_deg),
+        seuil_beta_corrige,
+        lambda j: calcul_beta_corrige(
+            calcul_angle_beta_alpha(ccd_deg, tf_deg, GRILLE_ALPHA[j], offset_mm, gamma_deg), av_cotyle_deg),
+    )
+    if i is None:
+        return ALPHA_SANS_CONFLIT
+    return round(GRILLE_ALPHA[i], 1)
+
+def resoudre_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10, pas=0.1):
+    """α critique exact et sa valeur sur la grille de pas `pas` (0.1° : balayage d'origine).
+
+    Le cas sans conflit est détecté avant toute évaluation de β : il ne coûte
+    qu'une poignée d'opérations trigonométriques.
+    """
+    ccd_rad = math.radians(ccd_deg)
+    intervalles = _premiers_intervalles(
+        math.pi - ccd_rad + math.radians(gamma_deg),
+        math.radians(tf_deg),
+        signe_col(offset_mm, ccd_deg),
+        seuil_beta_corrige - av_cotyle_deg,
+        130,
+    )
+    if not intervalles:
+        return SolutionCritique(math.inf, ALPHA_SANS_CONFLIT)
+    grille = _grille(130, pas)
+    k = _arrondi_grille(
+        intervalles,
+        grille,
+        lambda j: calcul_beta_corrige(
+            calcul_angle_beta_alpha(ccd_deg, tf_deg, grille[j], offset_mm, gamma_deg), av_cotyle_deg) <= seuil_beta_corrige,
+    )
+    arrondi = ALPHA_SANS_CONFLIT if k is None else round(grille[k], _decimales(pas))
+    return SolutionCritique(intervalles[0][0], arrondi)
+
+def calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10,
+                          methode="analytique"):
+    """α critique (°) : première flexion de hanche où β corrigé <= seuil.
+
+    Mêmes méthodes que calcul_delta_critique ; toutes renvoient la valeur du
+    balayage d'origine, 129.9 s'il n'y a pas de conflit.
+    """
+    if methode == "boucle":
+        return _alpha_critique_boucle(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige)
+    if methode == "grille":
+        return _alpha_critique_grille(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige)
+    if methode == "analytique":
+        return resoudre_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige).arrondi
+    raise ValueError(f"méthode inconnue : {methode!r} (attendu : {', '.join(METHODES)})")
+
+def calcul_alpha_critique_sans_gamma(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, seuil_beta_corrige=10,
+                                     methode="analytique"):
+    return calcul_alpha_critique(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, 0, seuil_beta_corrige, methode)
+
+
+# --- Résolution analytique par lots (tableaux de patients) ---
+# Même calcul que _premiers_intervalles, sans boucle sur les patients. Les
+# rares lignes dont une borne d'intervalle tombe à moins de _MARGE_GRILLE
+# d'un point de grille sont confiées au solveur scalaire, qui tranche avec
+# la fonction de référence : le résultat reste celui du balayage.
+# Exact et en O(1) par ligne, ce calcul rend inutile une table d'angles
+# critiques précalculée : l'interpolation (huit coins lus par ligne, repli
+# sur ce solveur près des discontinuités) était plus lente, et approchée.
+_MARGE_GRILLE = 1e-6
+
+def _intervalles_lot(theta, tf_rad, long_col, s_deg):
+    """Début et fin (°) du premier intervalle de conflit, éventuellement entamé
+    avant 0 (début -inf : conflit partout ; début inf : aucun conflit)."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a = np.sin(theta) * long_col
+        b = np.cos(theta) * long_col
+        c = np.sin(tf_rad) * long_col
+        r = np.hypot(b, c)
+        phi = np.arctan2(b, c)
+        s_rad = np.radians(s_deg)
+        r_nul = r == 0
+        seuil_t = np.where(a > 0, a * np.tan(s_rad), -a * np.tan(np.pi - s_rad)) / r
+
+        toujours = np.where(
+            r_nul,
+            ((a > 0) & (s_deg >= 0)) | ((a < 0) & (s_deg >= 180)),
+            ((a > 0) & (s_deg >= 90)) | ((a < 0) & (s_deg >= 180)) | ((a == 0) & (s_deg >= 90)),
+        )
+        partiel_pos = ~r_nul & (a > 0) & (s_deg >= 0) & (s_deg < 90)
+        partiel_neg = ~r_nul & (a < 0) & (s_deg > 90) & (s_deg < 180) & (seuil_t <= 1)
+        centre = np.where(partiel_pos, np.pi / 2, 0.0)
+        w = np.where(partiel_pos, np.arcsin(np.minimum(seuil_t, 1.0)), np.arccos(np.minimum(seuil_t, 1.0)))
+        w = np.where(toujours, np.pi / 2, np.where(partiel_pos | partiel_neg, w, np.nan))
+
+        d = np.mod(phi - centre + np.pi / 2, np.pi) - np.pi / 2
+        debut_brut = np.where(d > w, np.pi - w - d, -w - d)
+        fin = debut_brut + 2 * w
+        debut_brut = np.where(toujours, -np.inf, debut_brut)
+        fin = np.where(toujours, np.inf, fin)
+        aucun = np.isnan(w)
+        debut_brut = np.where(aucun, np.inf, np.degrees(debut_brut))
+        fin = np.where(aucun, np.inf, np.degrees(fin))
+    return debut_brut, fin
+
+def _arrondi_lot(debut_brut, fin, grille, borne_deg, sentinelle):
+    """Angle exact, valeur de grille du premier conflit et masque des lignes à trancher."""
+    arrondis = np.round(grille, 1)
+    valeur = np.full(debut_brut.shape, sentinelle)
+    ambigu = np.zeros(debut_brut.shape, dtype=bool)
+    trouve = np.zeros(debut_brut.shape, dtype=bool)
+    for decalage in (0.0, 180.0):
+        d0 = debut_brut + decalage
+        f0 = fin + decalage
+        k = np.searchsorted(grille, np.maximum(d0, 0.0) - _TOLERANCE_REEVALUATION)
+        k_borne = np.minimum(k, len(grille) - 1)
+        point = grille[k_borne]
+        precedent = grille[np.maximum(k - 1, 0)]
+        ambigu |= ~trouve & (
+            (np.abs(point - d0) < _MARGE_GRILLE)
+            | ((k > 0) & (np.abs(d0 - precedent) < _MARGE_GRILLE))
+            | (np.abs(point - f0) < _MARGE_GRILLE)
+        )
+        nouveau = ~trouve & (k < len(grille)) & (point <= f0)
+        valeur = np.where(nouveau, arrondis[k_borne], valeur)
+        trouve |= nouveau
+    debut = np.maximum(debut_brut, 0.0)
+    return np.where(debut < borne_deg, debut, np.inf), valeur, ambigu
+
+def _lignes_invalides(*tableaux):
+    """Lignes dont une entrée est manquante ou non finie (NaN, ±inf)."""
+    return ~np.all(np.isfinite(np.stack(tableaux)), axis=0)
+
+def _invalider_lignes(exact, valeur, ambigu, invalide):
+    # Pas de valeur par défaut rassurante (sentinelle « sans conflit ») pour une entrée invalide
+    exact[invalide] = np.nan
+    valeur[invalide] = np.nan
+    ambigu &= ~invalide
+
+def resoudre_delta_critique_lot(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige=10):
+    """resoudre_delta_critique sur des tableaux (pas de 0.1°) ; NaN pour une ligne d'entrées non finies."""
+    ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        signe = signe_col(offset_mm, ccd_deg)
+    debut_brut, fin = _intervalles_lot(
+        np.pi - np.radians(ccd_deg + gamma_deg), np.radians(tf_deg), signe, seuil_beta_corrige - av_deg)
+    exact, valeur, ambigu = _arrondi_lot(debut_brut, fin, GRILLE_DELTA, 90, DELTA_SANS_CONFLIT)
+    _invalider_lignes(exact, valeur, ambigu,
+                      _lignes_invalides(ccd_deg, tf_deg, gamma_deg, offset_mm, av_deg, seuil_beta_corrige))
+    for i in map(tuple, np.argwhere(ambigu)):
+        solution = resoudre_delta_critique(
+            ccd_deg[i], tf_deg[i], gamma_deg[i], offset_mm[i], av_deg[i], seuil_beta_corrige[i])
+        exact[i], valeur[i] = solution
+    return SolutionCritique(exact, valeur)
+
+def resoudre_alpha_critique_lot(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg=0, seuil_beta_corrige=10):
+    """resoudre_alpha_critique sur des tableaux (pas de 0.1°) ; NaN pour une ligne d'entrées non finies."""
+    tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        signe = signe_col(offset_mm, ccd_deg)
+    debut_brut, fin = _intervalles_lot(
+        np.pi - np.radians(ccd_deg) + np.radians(gamma_deg), np.radians(tf_deg), signe, seuil_beta_corrige - av_cotyle_deg)
+    exact, valeur, ambigu = _arrondi_lot(debut_brut, fin, GRILLE_ALPHA, 130, ALPHA_SANS_CONFLIT)
+    _invalider_lignes(exact, valeur, ambigu,
+                      _lignes_invalides(tf_deg, ccd_deg, offset_mm, av_cotyle_deg, gamma_deg, seuil_beta_corrige))
+    for i in map(tuple, np.argwhere(ambigu)):
+        solution = resoudre_alpha_critique(
+            tf_deg[i], ccd_deg[i], offset_mm[i], av_cotyle_deg[i], gamma_deg[i], seuil_beta_corrige[i])
+        exact[i], valeur[i] = solution
+    return SolutionCritique(exact, valeur)
@@ -0,0 +1,30 @@
+"""Balayage de γ : chaque valeur lue est celle des solveurs scalaires."""
+import numpy as np
+import pytest
+
+from reserve_flexion import calcul_alpha_critique, calcul_delta_critique
+from reserve_flexion.balayage import balayage_gamma, critiques_gamma
+
+
+def _parametres(n, graine):
+    rng = np.random.default_rng(graine)
+    return [(float(rng.uniform(-20, 50)), float(rng.uniform(110, 150)), float(rng.uniform(20, 60)),
+             float(rng.uniform(-20, 50))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("tf, ccd, offset, anteversion", [(20.0, 130.0, 40.0, 5.0), *_parametres(15, 0)])
+@pytest.mark.parametrize("seuil", [10, 7.5])
+def test_chaque_gamma_egal_aux_solveurs(tf, ccd, offset, anteversion, seuil):
+    balayage = balayage_gamma(tf, ccd, offset, anteversion, seuil)
+    assert len(balayage["gamma"]) == 91
+    for gamma in balayage["gamma"]:
+        attendu = (calcul_delta_critique(ccd, tf, gamma, offset, anteversion, seuil),
+                   calcul_alpha_critique(tf, ccd, offset, anteversion, gamma, seuil))
+        assert critiques_gamma(balayage, gamma) == attendu, gamma
+
+
+def test_gamma_hors_grille():
+    balayage = balayage_gamma(20.0, 130.0, 40.0, 5.0)
+    assert critiques_gamma(balayage, 2.5) is None
+    assert critiques_gamma(balayage, 46.0) is None
+    assert critiques_gamma(balayage, -45.0) is not None
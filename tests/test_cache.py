@@ -0,0 +1,50 @@
+"""Cache des angles critiques : compteurs de statistiques_cache et valeurs identiques aux solveurs."""
+import numpy as np
+import pytest
+
+from reserve_flexion import calcul_alpha_critique, calcul_delta_critique
+from reserve_flexion.cache import (
+    TAILLE_CACHE,
+    alpha_critique_cache,
+    delta_critique_cache,
+    statistiques_cache,
+    vider_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    vider_cache()
+    yield
+    vider_cache()
+
+
+def _compteurs():
+    return {nom: (s["succes"], s["echecs"], s["taille"]) for nom, s in statistiques_cache().items()}
+
+
+def test_compteurs():
+    assert _compteurs() == {"delta_critique": (0, 0, 0), "alpha_critique": (0, 0, 0)}
+    delta_critique_cache(130, 20, 5, 40, 20)
+    alpha_critique_cache(20, 130, 40, 20, 5)
+    assert _compteurs() == {"delta_critique": (0, 1, 1), "alpha_critique": (0, 1, 1)}
+    # Même appel, avec d'autres types numériques : succès
+    delta_critique_cache(130.0, np.float64(20), 5.0, 40, 20.0)
+    alpha_critique_cache(20.0, 130, np.int64(40), 20, 5.0)
+    assert _compteurs() == {"delta_critique": (1, 1, 1), "alpha_critique": (1, 1, 1)}
+    # Nouvel appel (offset différent) : échec
+    delta_critique_cache(130, 20, 5, 41, 20)
+    alpha_critique_cache(20, 130, 41, 20, 5)
+    assert _compteurs() == {"delta_critique": (1, 2, 2), "alpha_critique": (1, 2, 2)}
+    assert all(s["taille_max"] == TAILLE_CACHE for s in statistiques_cache().values())
+
+
+def test_valeurs_egales_aux_solveurs():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        tf, ccd, offset, av, gamma = (rng.uniform(-20, 50), rng.uniform(110, 150), rng.uniform(20, 60),
+                                      rng.uniform(-20, 50), rng.uniform(-45, 45))
+        for _ in range(2):  # échec puis succès
+            assert delta_critique_cache(ccd, tf, gamma, offset, av) == calcul_delta_critique(ccd, tf, gamma, offset, av)
+            assert alpha_critique_cache(tf, ccd, offset, av, gamma) == calcul_alpha_critique(tf, ccd, offset, av, gamma)
+    assert _compteurs() == {"delta_critique": (300, 300, 300), "alpha_critique": (300, 300, 300)}
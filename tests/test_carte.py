@@ -0,0 +1,31 @@
+"""Cartes des réserves sur la grille AV × γ."""
+import numpy as np
+
+import pytest
+
+from reserve_flexion import calcul_alpha_critique, calcul_delta_critique
+from reserve_flexion.carte import _critiques_grille, carte_reserve
+
+
+def test_mesures_hors_cache():
+    """Changer δ ou α mesuré réutilise les angles critiques en cache."""
+    _critiques_grille.cache_clear()
+    carte = carte_reserve(20.0, 130.0, 40.0, 20.0, 90.0)
+    autre = carte_reserve(20.0, 130.0, 40.0, 25.0, 80.0)
+    info = _critiques_grille.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert autre["delta_critique"] is carte["delta_critique"]
+    np.testing.assert_array_equal(autre["reserve_tronc"], carte["delta_critique"] - 25.0)
+    np.testing.assert_array_equal(autre["reserve_jambe"], carte["alpha_critique"] - 80.0)
+    assert not any(tableau.flags.writeable for tableau in autre.values())
+
+
+@pytest.mark.parametrize("tf, ccd, offset", [(20.0, 130.0, 40.0), (-15.0, 145.0, 25.0), (45.0, 115.0, 60.0)])
+def test_cellules_egales_aux_solveurs(tf, ccd, offset):
+    carte = carte_reserve(tf, ccd, offset, 20.0, 90.0)
+    for i, av in enumerate(carte["anteversion"]):
+        for j, gamma in enumerate(carte["gamma"]):
+            delta = calcul_delta_critique(ccd, tf, gamma, offset, av)
+            alpha = calcul_alpha_critique(tf, ccd, offset, av, gamma)
+            assert (carte["delta_critique"][i, j], carte["alpha_critique"][i, j]) == (delta, alpha), (av, gamma)
+            assert (carte["reserve_tronc"][i, j], carte["reserve_jambe"][i, j]) == (delta - 20.0, alpha - 90.0)
@@ -0,0 +1,50 @@
+"""Traitement CSV en ligne de commande : validation des blocs et des options."""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from reserve_flexion.cli import main, traiter_csv
+from reserve_flexion.cohorte import COLONNES_ENTREE
+from reserve_flexion.interpretation import LIBELLES
+
+PATIENT = dict(tf=20.0, ccd=130.0, offset=40.0, anteversion=20.0, version_debout=10.0, version_assis=25.0,
+               alpha_mesure=90.0, gamma_final=5.0)
+
+
+def _csv(tmp_path, n, modifier=None):
+    df = pd.DataFrame({nom: np.full(n, v) for nom, v in PATIENT.items()}).astype(object)
+    for (ligne, colonne), valeur in (modifier or {}).items():
+        df.loc[ligne, colonne] = valeur
+    chemin = tmp_path / "patients.csv"
+    df.to_csv(chemin, index=False)
+    return chemin
+
+
+def test_lignes_invalides_comptees_et_signalees(tmp_path):
+    entree = _csv(tmp_path, 7, {(1, "tf"): np.nan, (4, "gamma_final"): "abc", (5, "alpha_mesure"): np.inf})
+    journal = io.StringIO()
+    assert traiter_csv(entree, tmp_path / "r.csv", taille_lot=3, journal=journal) == 7
+    texte = journal.getvalue()
+    assert "ligne(s) 3" in texte and "ligne(s) 6, 7" in texte
+    assert "7 patients (3 entrées invalides)" in texte
+    sortie = pd.read_csv(tmp_path / "r.csv")
+    invalide = LIBELLES["Français"]["invalid_input"]
+    par_patient = sortie["Interprétation"].eq(invalide).to_numpy().reshape(-1, 4)
+    assert par_patient.all(axis=1).tolist() == [False, True, False, False, True, True, False]
+    assert not par_patient[[0, 2, 3, 6]].any()
+
+
+def test_colonne_absente(tmp_path):
+    entree = _csv(tmp_path, 2)
+    with pytest.raises(ValueError, match="ccd_femur"):
+        traiter_csv(entree, tmp_path / "r.csv", colonnes={"ccd": "ccd_femur"}, journal=None)
+
+
+@pytest.mark.parametrize("option", ["processus", "taille_lot", "taille_bloc"])
+def test_options_non_positives_refusees(tmp_path, option):
+    with pytest.raises(ValueError, match=option):
+        traiter_csv(_csv(tmp_path, 2), tmp_path / "r.csv", journal=None, **{option: 0})
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "patients.csv"), str(tmp_path / "r.csv"), f"--{option.replace('_', '-')}", "0"])
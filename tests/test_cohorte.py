@@ -0,0 +1,33 @@
+"""Calcul en lot : une entrée manquante ou non finie ne donne jamais « pas de conflit »."""
+import numpy as np
+import pytest
+
+from reserve_flexion import ENTREE_INVALIDE, analyser_lot, resoudre_alpha_critique_lot, resoudre_delta_critique_lot
+from reserve_flexion.cohorte import COLONNES_ENTREE, COLONNES_SORTIE
+
+PATIENT = dict(tf=20.0, ccd=130.0, offset=40.0, anteversion=20.0, version_debout=10.0, version_assis=25.0,
+               alpha_mesure=90.0, gamma_final=5.0)
+
+
+@pytest.mark.parametrize("colonne", COLONNES_ENTREE)
+@pytest.mark.parametrize("valeur", [np.nan, np.inf, -np.inf])
+def test_ligne_invalide(colonne, valeur):
+    entrees = {nom: np.full(3, v) for nom, v in PATIENT.items()}
+    entrees[colonne][1] = valeur
+    r = analyser_lot(**entrees)
+    for nom in COLONNES_SORTIE[1:]:
+        if nom.startswith("interpretation"):
+            assert r[nom][1] == ENTREE_INVALIDE, nom
+            assert r[nom][0] == r[nom][2] != ENTREE_INVALIDE, nom
+        else:
+            assert np.isnan(r[nom][1]), nom
+            assert r[nom][0] == r[nom][2] and np.isfinite(r[nom][0]), nom
+
+
+def test_solveurs_lot_invalides():
+    tf = np.array([20.0, np.nan])
+    delta = resoudre_delta_critique_lot(130.0, tf, 0.0, 40.0, 20.0)
+    alpha = resoudre_alpha_critique_lot(tf, 130.0, 40.0, 20.0, 0.0)
+    for solution in (delta, alpha):
+        assert np.isfinite(solution.arrondi[0]) and np.isnan(solution.arrondi[1])
+        assert np.isnan(solution.exact[1])
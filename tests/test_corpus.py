@@ -0,0 +1,23 @@
+"""Les moteurs de calcul reproduisent le corpus de référence (benchmarks/corpus_reference.npz)."""
+import numpy as np
+import pytest
+
+from benchmarks.corpus import CORPUS, ENTREES, MOTEURS, TOLERANCES, comparer
+
+
+@pytest.mark.parametrize("moteur", ["grille", "analytique", "lot", "cache"])
+def test_moteur_reproduit_le_corpus(moteur):
+    rapport = comparer(MOTEURS[moteur])
+    for sortie in TOLERANCES:
+        assert rapport[sortie]["differences"] == 0, (sortie, rapport[sortie])
+    assert rapport["interpretations_changees"] == 0
+    assert rapport["interpretations_alpha_changees"] == 0
+
+
+def test_reference_figee_reproduit_le_corpus():
+    """Les balayages d'origine figés (benchmarks/reference.py) redonnent le corpus (échantillon d'une ligne sur 20)."""
+    with np.load(CORPUS) as corpus:
+        ref = {nom: corpus[nom][::20] for nom in corpus.files}
+    sortie = MOTEURS["reference"](*(ref[nom] for nom in ENTREES))
+    for nom in TOLERANCES:
+        np.testing.assert_array_equal(sortie[nom], ref[nom])
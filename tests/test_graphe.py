@@ -0,0 +1,90 @@
+"""GrapheAnalyse : mêmes résultats que analyser_patient, en ne recalculant que l'aval d'une entrée modifiée."""
+from collections import Counter
+
+import pytest
+
+from reserve_flexion.graphe import GrapheAnalyse
+from reserve_flexion.resultat import ENTREES, SORTIES, analyser_patient
+
+PATIENT = dict(tf=20.0, ccd=130.0, offset=40.0, anteversion=20.0, version_debout=10.0, version_assis=25.0,
+               alpha_mesure=90.0, gamma_final=5.0, seuil_beta_corrige=10)
+
+TOUT = {"critiques_ref", "critiques_gamma"} | set(SORTIES) - {"delta_mesure"}
+TRONC = {"delta_mesure", "reserve_ref", "beta_corrige_ref", "interpretation_ref",
+         "reserve_gamma", "beta_corrige_gamma", "interpretation_gamma"}
+GAMMA = {"critiques_gamma", "delta_critique_gamma", "reserve_gamma", "beta_corrige_gamma", "interpretation_gamma",
+         "alpha_critique_avec_gamma", "reserve_alpha_avec_gamma", "interpretation_alpha_avec"}
+# Nœuds recalculés quand une seule entrée change
+AVAL = {
+    "tf": TOUT | {"balayage"}, "ccd": TOUT | {"balayage"}, "offset": TOUT | {"balayage"},
+    "anteversion": TOUT | {"balayage"},
+    "seuil_beta_corrige": TOUT - {"beta_corrige_ref", "beta_corrige_gamma"} | {"balayage"},
+    "version_debout": TRONC, "version_assis": TRONC,
+    "alpha_mesure": {"reserve_alpha_sans_gamma", "reserve_alpha_avec_gamma"},
+    "gamma_final": GAMMA,
+}
+MODIFICATIONS = [("tf", 5.0), ("ccd", 140.0), ("offset", 55.0), ("anteversion", 5.0), ("version_debout", 0.0),
+                 ("version_assis", 50.0), ("alpha_mesure", 120.0), ("gamma_final", -20.0),
+                 ("seuil_beta_corrige", 12)]
+
+
+def _meme_analyse(analyse, patient):
+    attendue = analyser_patient(**patient)
+    assert {nom: analyse[nom] for nom in ENTREES + SORTIES} == {nom: attendue[nom] for nom in ENTREES + SORTIES}
+
+
+@pytest.mark.parametrize("balayage", [False, True])
+def test_chaque_entree_modifiee(balayage):
+    graphe = GrapheAnalyse(balayage=balayage)
+    patient = dict(PATIENT)
+    _meme_analyse(graphe.analyser(**patient), patient)
+    for nom, valeur in MODIFICATIONS:
+        graphe.evaluations = Counter()
+        patient[nom] = valeur
+        _meme_analyse(graphe.analyser(**patient), patient)
+        assert set(graphe.evaluations) == AVAL[nom], nom
+        assert set(graphe.evaluations.values()) == {1}, nom
+
+
+def test_valeur_inchangee_ne_recalcule_rien():
+    graphe = GrapheAnalyse()
+    analyse = graphe.analyser(**PATIENT)
+    graphe.evaluations = Counter()
+    assert graphe.analyser(**PATIENT) is analyse
+    assert not graphe.evaluations
+
+
+def test_invalidation_arretee_aux_noeuds_deja_invalides():
+    """Deux entrées modifiées avant le calcul : chaque nœud aval n'est recalculé qu'une fois."""
+    graphe = GrapheAnalyse()
+    graphe.analyser(**PATIENT)
+    graphe.evaluations = Counter()
+    graphe.modifier(version_debout=0.0)
+    graphe.modifier(version_assis=50.0)
+    graphe.modifier(tf=5.0)
+    _meme_analyse(graphe.analyse(), dict(PATIENT, version_debout=0.0, version_assis=50.0, tf=5.0))
+    assert set(graphe.evaluations) == TOUT | TRONC | {"balayage"}
+    assert set(graphe.evaluations.values()) == {1}
+
+
+def test_gamma_nul_reprend_critiques_ref(monkeypatch):
+    graphe = GrapheAnalyse()
+    graphe.analyser(**PATIENT)
+    # À γ final nul, critiques_gamma ne doit appeler aucun solveur
+    monkeypatch.setattr("reserve_flexion.graphe._critiques", pytest.fail)
+    analyse = graphe.analyser(**dict(PATIENT, gamma_final=0.0))
+    assert graphe.valeur("critiques_gamma") is graphe.valeur("critiques_ref")
+    assert analyse.delta_critique_gamma == analyse.delta_critique_ref
+    assert analyse.alpha_critique_avec_gamma == analyse.alpha_critique_sans_gamma
+
+
+def test_balayage_recalcule_seulement_pour_le_femur_et_le_cotyle():
+    graphe = GrapheAnalyse(balayage=True)
+    graphe.analyser(**PATIENT)
+    balayage = graphe.valeur("balayage")
+    for gamma in (-45.0, 0.0, 12.0, 45.0):
+        graphe.analyser(**dict(PATIENT, gamma_final=gamma))
+        assert graphe.valeur("balayage") is balayage
+    graphe.analyser(**dict(PATIENT, ccd=135.0))
+    assert graphe.valeur("balayage") is not balayage
+    assert graphe.evaluations["balayage"] == 2
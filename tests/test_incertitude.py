@@ -0,0 +1,36 @@
+"""Propagation d'incertitude : tirages reproductibles, probabilités normalisées."""
+import numpy as np
+import pytest
+
+from reserve_flexion.incertitude import INTERPRETATIONS, RESERVES, propagation_incertitude
+
+PATIENT = (20.0, 130.0, 40.0, 20.0, 10.0, 25.0, 90.0, 5.0)
+
+
+def test_meme_graine_memes_resultats():
+    a = propagation_incertitude(*PATIENT, n=5_000, graine=3)
+    b = propagation_incertitude(*PATIENT, n=5_000, graine=3)
+    assert a["reserves"] == b["reserves"]
+    assert a["probabilites"] == b["probabilites"]
+    for nom, valeurs in a["echantillons"].items():
+        np.testing.assert_array_equal(valeurs, b["echantillons"][nom], err_msg=nom)
+    autre = propagation_incertitude(*PATIENT, n=5_000, graine=4)
+    assert autre["reserves"] != a["reserves"]
+
+
+@pytest.mark.parametrize("ecarts_types", [None, {"tf": 15.0, "offset": 5.0, "version_assis": 8.0}])
+def test_probabilites_somme_un(ecarts_types):
+    r = propagation_incertitude(*PATIENT, ecarts_types=ecarts_types, n=5_000, graine=0)
+    for nom in INTERPRETATIONS:
+        assert sum(r["probabilites"][nom].values()) == pytest.approx(1.0, abs=1e-12), nom
+        assert all(0.0 < p <= 1.0 for p in r["probabilites"][nom].values())
+    for nom in RESERVES:
+        q = r["reserves"][nom]
+        assert q["q2.5"] <= q["q25"] <= q["q50"] <= q["q75"] <= q["q97.5"]
+
+
+def test_sans_ecart_type_distribution_degeneree():
+    r = propagation_incertitude(*PATIENT, ecarts_types={"tf": 0, "ccd": 0, "anteversion": 0}, n=100, graine=0)
+    for nom in INTERPRETATIONS:
+        assert list(r["probabilites"][nom].values()) == [1.0]
+    assert all(r["reserves"][nom]["ecart_type"] == pytest.approx(0.0, abs=1e-9) for nom in RESERVES)
@@ -0,0 +1,65 @@
+"""Calcul en parallèle : même résultat que le calcul en série, quels que soient les découpages."""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from reserve_flexion import cli
+from reserve_flexion.cli import traiter_csv
+from reserve_flexion.cohorte import COLONNES_ENTREE, analyser_lot
+from reserve_flexion.parallele import analyser_lot_parallele
+
+N = 1_003  # premier avec toutes les tailles de blocs et de lots ci-dessous
+
+
+def _entrees(n=N, graine=0):
+    rng = np.random.default_rng(graine)
+    plages = {"tf": (-20, 50), "ccd": (110, 150), "offset": (20, 60), "anteversion": (-20, 50),
+              "version_debout": (-10, 30), "version_assis": (0, 60), "alpha_mesure": (40, 130),
+              "gamma_final": (-45, 45)}
+    entrees = {nom: rng.uniform(*plages[nom], n) for nom in COLONNES_ENTREE}
+    entrees["tf"][::97] = np.nan  # lignes invalides comprises
+    return entrees
+
+
+def _egaux(r, attendu):
+    assert r.keys() == attendu.keys()
+    for nom in attendu:
+        np.testing.assert_array_equal(r[nom], attendu[nom], err_msg=nom)
+
+
+@pytest.mark.parametrize("taille_bloc", [7, 64, 250])
+def test_lot_parallele_threads(taille_bloc):
+    entrees = _entrees()
+    with ThreadPoolExecutor(3) as executeur:
+        r = analyser_lot_parallele(**entrees, taille_bloc=taille_bloc, executeur=executeur)
+    _egaux(r, analyser_lot(**entrees))
+
+
+def test_lot_parallele_processus():
+    entrees = _entrees()
+    with ProcessPoolExecutor(2) as executeur:
+        r = analyser_lot_parallele(**entrees, taille_bloc=101, executeur=executeur)
+    _egaux(r, analyser_lot(**entrees))
+
+
+@pytest.mark.parametrize("taille_lot, taille_bloc", [(100, 33), (256, 60), (1000, 7)])
+def test_csv_parallele(tmp_path, monkeypatch, taille_lot, taille_bloc):
+    entree = tmp_path / "patients.csv"
+    pd.DataFrame(_entrees()).to_csv(entree, index=False)
+    traiter_csv(entree, tmp_path / "serie.csv", taille_lot=taille_lot, journal=None)
+    # Pool de fils à la place des processus : même chemin de code (soumission par blocs, blocs en vol)
+    monkeypatch.setattr(cli, "ProcessPoolExecutor", ThreadPoolExecutor)
+    traiter_csv(entree, tmp_path / "parallele.csv", taille_lot=taille_lot, journal=None, processus=3,
+                taille_bloc=taille_bloc)
+    assert (tmp_path / "parallele.csv").read_bytes() == (tmp_path / "serie.csv").read_bytes()
+
+
+def test_csv_processus(tmp_path):
+    entree = tmp_path / "patients.csv"
+    pd.DataFrame(_entrees(300)).to_csv(entree, index=False)
+    traiter_csv(entree, tmp_path / "serie.csv", taille_lot=70, journal=None)
+    assert traiter_csv(entree, tmp_path / "parallele.csv", taille_lot=70, journal=None, processus=2,
+                       taille_bloc=30) == 300
+    assert (tmp_path / "parallele.csv").read_bytes() == (tmp_path / "serie.csv").read_bytes()
@@ -0,0 +1,43 @@
+"""Rapport PDF : la mémorisation des polices ne change ni le document ni le module fpdf."""
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import fpdf.fpdf
+from fpdf.ttfonts import TTFontFile
+
+from reserve_flexion.interpretation import LIBELLES
+from reserve_flexion.rapport import POLICE_UNICODE, rapport_pdf
+from reserve_flexion.resultat import analyser_patient
+
+LABELS = dict(LIBELLES["Français"], title="Analyse", results_analysis="Résultats", results_flexion_leg="Jambe",
+              without_gamma="Sans γ", with_gamma="Avec γ = {gamma:.1f}°", alpha_measured="α mesuré",
+              alpha_crit="α critique")
+NOMS = ["Patient X", "Łukasz Żółć", "Ωmega γ"]
+
+
+def _sans_date(pdf):
+    return re.sub(rb"/CreationDate \(D:\d+\)", b"", pdf)
+
+
+def _rapport(nom):
+    return _sans_date(rapport_pdf(analyser_patient(20, 130, 40, 25, 15, 35, 90, 5), nom, LABELS, "Français",
+                                  police=POLICE_UNICODE))
+
+
+def test_rapport_identique_sans_memoire(monkeypatch):
+    from reserve_flexion import rapport
+
+    memorises = [_rapport(nom) for nom in NOMS]
+    # Classe FPDF d'origine, police relue à chaque document
+    monkeypatch.setattr(rapport, "_fpdf", lambda: fpdf.fpdf.FPDF)
+    monkeypatch.setattr(rapport, "_police", rapport._police.__wrapped__)
+    monkeypatch.setattr(fpdf.fpdf, "FPDF_CACHE_MODE", 1)
+    assert [_rapport(nom) for nom in NOMS] == memorises
+
+
+def test_rapports_en_parallele():
+    sequentiels = [_rapport(nom) for nom in NOMS]
+    with ThreadPoolExecutor(4) as executeur:
+        assert list(executeur.map(_rapport, NOMS * 8)) == sequentiels * 8
+    assert fpdf.fpdf.TTFontFile is TTFontFile
+    assert fpdf.fpdf.FPDF_CACHE_MODE == 0
@@ -0,0 +1,73 @@
+"""AV minimale recommandée : la réserve atteint la cible juste au-dessus de la borne, pas juste en dessous."""
+import math
+
+import numpy as np
+import pytest
+
+from reserve_flexion import calcul_alpha_critique, calcul_delta_critique
+from reserve_flexion.recommandation import av_minimale_jambe, av_minimale_tronc, recommander_anteversion
+from reserve_flexion.resultat import analyser_patient
+
+EPSILON = 0.01
+
+
+def _cas(n, graine, mesure):
+    rng = np.random.default_rng(graine)
+    return zip(rng.uniform(-20, 50, n), rng.uniform(110, 150, n), rng.uniform(20, 60, n), rng.uniform(-45, 45, n),
+               rng.uniform(*mesure, n), rng.uniform(0, 20, n))
+
+
+def _verifier(borne, reserve, cible):
+    if borne == math.inf:
+        assert reserve(180.0) < cible
+    elif borne == -math.inf:
+        assert reserve(-180.0) >= cible
+    else:
+        assert reserve(borne + EPSILON) >= cible
+        assert reserve(borne - EPSILON) < cible
+
+
+@pytest.mark.parametrize("graine", range(3))
+def test_borne_tronc(graine):
+    for tf, ccd, offset, gamma, mesure, cible in _cas(200, graine, (-10, 80)):
+        borne = av_minimale_tronc(ccd, tf, gamma, offset, mesure, cible)
+        _verifier(borne, lambda av: calcul_delta_critique(ccd, tf, gamma, offset, av) - mesure, cible)
+
+
+@pytest.mark.parametrize("graine", range(3))
+def test_borne_jambe(graine):
+    for tf, ccd, offset, gamma, mesure, cible in _cas(200, graine, (40, 125)):
+        borne = av_minimale_jambe(tf, ccd, offset, mesure, gamma, cible)
+        _verifier(borne, lambda av: calcul_alpha_critique(tf, ccd, offset, av, gamma) - mesure, cible)
+
+
+@pytest.mark.parametrize("mesure, cible, attendue", [
+    (80.0, 15.0, math.inf),     # 89.9 − 80 < 15 : aucune AV ne suffit
+    (-10.0, 5.0, -math.inf),    # δ critique >= 0 > mesure + cible : toute AV convient
+    (-10.0, 10.0, -math.inf),
+])
+def test_bornes_infinies_tronc(mesure, cible, attendue):
+    borne = av_minimale_tronc(130.0, 20.0, 0.0, 40.0, mesure, cible)
+    assert borne == attendue
+    _verifier(borne, lambda av: calcul_delta_critique(130.0, 20.0, 0.0, 40.0, av) - mesure, cible)
+
+
+def test_borne_infinie_jambe():
+    borne = av_minimale_jambe(20.0, 130.0, 40.0, 125.0, 0.0, 10.0)
+    assert borne == math.inf
+    _verifier(borne, lambda av: calcul_alpha_critique(20.0, 130.0, 40.0, av, 0.0) - 125.0, 10.0)
+
+
+def test_recommandation_satisfait_les_quatre_reserves():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        tf, ccd, offset = rng.uniform(-20, 50), rng.uniform(110, 150), rng.uniform(20, 60)
+        debout, assis, alpha, gamma = rng.uniform(0, 20), rng.uniform(10, 50), rng.uniform(40, 110), rng.uniform(-45, 45)
+        cible = rng.uniform(0, 10)
+        av = recommander_anteversion(tf, ccd, offset, assis - debout, alpha, gamma, cible)["anteversion_min"]
+        if not math.isfinite(av):
+            continue
+        a = analyser_patient(tf, ccd, offset, av + EPSILON, debout, assis, alpha, gamma)
+        assert min(a.reserve_ref, a.reserve_gamma, a.reserve_alpha_sans_gamma, a.reserve_alpha_avec_gamma) >= cible
+        a = analyser_patient(tf, ccd, offset, av - EPSILON, debout, assis, alpha, gamma)
+        assert min(a.reserve_ref, a.reserve_gamma, a.reserve_alpha_sans_gamma, a.reserve_alpha_avec_gamma) < cible
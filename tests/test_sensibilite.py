@@ -0,0 +1,54 @@
+"""Sensibilité des réserves : dérivées exactes pour les mesures, différences finies des solveurs pour le reste."""
+import math
+
+import numpy as np
+import pytest
+
+from reserve_flexion.sensibilite import PARAMETRES, analyse_sensibilite
+from reserve_flexion.solveurs import (
+    ALPHA_SANS_CONFLIT,
+    DELTA_SANS_CONFLIT,
+    resoudre_alpha_critique,
+    resoudre_delta_critique,
+)
+
+H = 1e-3
+
+
+def _patients(n=40, graine=0):
+    rng = np.random.default_rng(graine)
+    plages = {"tf": (-20, 50), "ccd": (110, 150), "offset": (20, 60), "anteversion": (-20, 40),
+              "version_debout": (0, 20), "version_assis": (10, 50), "alpha_mesure": (40, 120),
+              "gamma_final": (-45, 45)}
+    return [{nom: float(rng.uniform(*plages[nom])) for nom in PARAMETRES} for _ in range(n)]
+
+
+def _reserves_scalaires(p):
+    """(réserve du tronc, réserve de la jambe) avec les angles critiques exacts des solveurs scalaires."""
+    delta = resoudre_delta_critique(p["ccd"], p["tf"], p["gamma_final"], p["offset"], p["anteversion"]).exact
+    alpha = resoudre_alpha_critique(p["tf"], p["ccd"], p["offset"], p["anteversion"], p["gamma_final"]).exact
+    delta = delta if math.isfinite(delta) else DELTA_SANS_CONFLIT
+    alpha = alpha if math.isfinite(alpha) else ALPHA_SANS_CONFLIT
+    return delta - (p["version_assis"] - p["version_debout"]), alpha - p["alpha_mesure"]
+
+
+@pytest.mark.parametrize("patient", _patients())
+def test_derivees(patient):
+    r = analyse_sensibilite(**patient, pas_derivee=H)
+    tronc, jambe = r["reserve_tronc"]["derivees"], r["reserve_jambe"]["derivees"]
+    assert (tronc["version_assis"], tronc["version_debout"], tronc["alpha_mesure"]) == (-1.0, 1.0, 0.0)
+    assert (jambe["alpha_mesure"], jambe["version_assis"], jambe["version_debout"]) == (-1.0, 0.0, 0.0)
+    for nom in ("tf", "ccd", "offset", "anteversion", "gamma_final"):
+        moins = _reserves_scalaires(dict(patient, **{nom: patient[nom] - H}))
+        plus = _reserves_scalaires(dict(patient, **{nom: patient[nom] + H}))
+        assert tronc[nom] == pytest.approx((plus[0] - moins[0]) / (2 * H), rel=1e-6, abs=1e-6), nom
+        assert jambe[nom] == pytest.approx((plus[1] - moins[1]) / (2 * H), rel=1e-6, abs=1e-6), nom
+
+
+def test_sans_conflit_derivees_nulles():
+    # AV élevée : ni le tronc ni la jambe n'entrent en conflit
+    r = analyse_sensibilite(20.0, 130.0, 40.0, 45.0, 15.0, 35.0, 90.0, 0.0)
+    for reserve in ("reserve_tronc", "reserve_jambe"):
+        derivees = r[reserve]["derivees"]
+        assert all(derivees[nom] == 0.0 for nom in ("tf", "ccd", "offset", "anteversion", "gamma_final"))
+    assert r["reserve_tronc"]["base"] == round(DELTA_SANS_CONFLIT - 20.0, 1)